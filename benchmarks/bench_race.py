@@ -0,0 +1,182 @@
+"""
+Load test for the LAN race server.
+
+Starts a RaceServer in a child process on loopback and connects N
+simulated clients to it from one asyncio loop. Each client "types" the
+race passage at its own WPM and sends a progress message on every
+keystroke, which is the worst case the server's coalescing has to
+absorb. Reports how regularly standings arrived and how much CPU the
+server used.
+
+    python benchmarks/bench_race.py --clients 500 --duration 20 --output race.json
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import platform
+import random
+import resource
+import socket
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from typing_test.race import START_DELAY, RaceServer, encode
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+# ======================
+# SERVER PROCESS
+# ======================
+
+def run_server(port, duration, tick_rate, run_for, results):
+    async def serve():
+        server = RaceServer(
+            text_length="Long Text", duration=duration, lobby=1.0, tick_rate=tick_rate
+        )
+        listener = await server.start("127.0.0.1", port)
+        await asyncio.sleep(run_for)
+        listener.close()
+        return server.stats
+
+    stats = asyncio.run(serve())
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    stats["cpu_seconds"] = round(usage.ru_utime + usage.ru_stime, 3)
+    results.put(stats)
+
+
+# ======================
+# CLIENTS
+# ======================
+
+async def client(number, port, wpm, record):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port, limit=1 << 20)
+    writer.write(encode({"type": "join", "name": f"bot{number}"}))
+    sent = 0
+    arrivals = []
+    typing = None
+
+    async def type_passage(passage):
+        nonlocal sent
+        await asyncio.sleep(START_DELAY)
+        gap = 60 / (wpm * 5)
+        start = time.monotonic()
+        for position in range(1, len(passage) + 1):
+            await asyncio.sleep(max(0.0, start + position * gap - time.monotonic()))
+            elapsed = time.monotonic() - start
+            writer.write(encode({
+                "type": "progress",
+                "position": position,
+                "wpm": position / 5 / (elapsed / 60),
+                "finished": position == len(passage),
+            }))
+            sent += 1
+
+    while True:
+        line = await reader.readline()
+        if not line:
+            break
+        message = json.loads(line)
+        if message["type"] == "race" and typing is None:
+            typing = asyncio.ensure_future(type_passage(message["passage"]))
+        elif message["type"] == "standings":
+            arrivals.append(time.monotonic())
+        elif message["type"] == "results":
+            break
+    if typing is not None:
+        typing.cancel()
+    writer.close()
+    record.append((sent, arrivals))
+
+
+async def run_clients(port, clients, wpm_range, seed):
+    rng = random.Random(seed)
+    record = []
+    # Give the server process a moment to start listening
+    for _ in range(50):
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.1).close()
+            break
+        except OSError:
+            await asyncio.sleep(0.1)
+    await asyncio.gather(*(
+        client(i, port, rng.uniform(*wpm_range), record) for i in range(clients)
+    ))
+    return record
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--clients", type=int, default=200)
+    parser.add_argument("--duration", type=int, default=15, help="race length in seconds")
+    parser.add_argument("--tick-rate", type=float, default=5)
+    parser.add_argument("--min-wpm", type=float, default=40)
+    parser.add_argument("--max-wpm", type=float, default=140)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    args = parser.parse_args()
+
+    port = free_port()
+    results = multiprocessing.Queue()
+    run_for = 1.0 + START_DELAY + args.duration + 3.0
+    server = multiprocessing.Process(
+        target=run_server, args=(port, args.duration, args.tick_rate, run_for, results)
+    )
+    server.start()
+
+    wall = time.perf_counter()
+    record = asyncio.run(
+        run_clients(port, args.clients, (args.min_wpm, args.max_wpm), args.seed)
+    )
+    wall = time.perf_counter() - wall
+    server_stats = results.get()
+    server.join()
+
+    gaps = sorted(
+        (b - a) * 1000
+        for _, arrivals in record for a, b in zip(arrivals, arrivals[1:])
+    )
+    sent = sum(s for s, _ in record)
+    received = sum(len(a) for _, a in record)
+    race_seconds = args.duration + 1.0
+    report = {
+        "python": platform.python_version(),
+        "clients": args.clients,
+        "completed": len(record),
+        "tick_ms": round(1000 / args.tick_rate, 1),
+        "progress_messages": sent,
+        "progress_per_second": round(sent / race_seconds),
+        "standings_received": received,
+        "standings_per_client_second": round(received / max(1, len(record)) / race_seconds, 2),
+        "standings_gap_ms": {
+            "p50": round(percentile(gaps, 0.5), 1),
+            "p99": round(percentile(gaps, 0.99), 1),
+            "max": round(gaps[-1], 1) if gaps else 0.0,
+        },
+        "server": server_stats,
+        "server_cpu_share": round(server_stats["cpu_seconds"] / wall, 3),
+    }
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
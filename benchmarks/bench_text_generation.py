@@ -0,0 +1,64 @@
+"""
+Sentences per second for the template text generator.
+
+Compares the per-sentence generator that used to live in
+typing_speed_test.py against the batched TextGenerator.
+
+    python benchmarks/bench_text_generation.py [--sentences N]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from typing_test.text import SENTENCE_TEMPLATES, WORD_BANK, TextGenerator
+
+
+def legacy_generate_sentence():
+    """The original one-sentence-at-a-time generator, kept as the baseline."""
+    template = random.choice(SENTENCE_TEMPLATES)
+    sentence = template.format(
+        det=random.choice(WORD_BANK["articles_determiners"]),
+        adj=random.choice(WORD_BANK["adjectives"]),
+        noun=random.choice(WORD_BANK["nouns"]),
+        verb=random.choice(WORD_BANK["verbs"]),
+        adv=random.choice(WORD_BANK["adverbs"]),
+        conn=random.choice(WORD_BANK["connectors"]),
+        prep=random.choice(WORD_BANK["prepositions"]),
+    )
+    return sentence[0].upper() + sentence[1:]
+
+
+def best_rate(func, sentences, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(sentences)
+        best = min(best, time.perf_counter() - start)
+    return sentences / best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sentences", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    generator = TextGenerator()
+    before = best_rate(
+        lambda n: [legacy_generate_sentence() for _ in range(n)],
+        args.sentences, args.repeat,
+    )
+    after = best_rate(generator.sentences, args.sentences, args.repeat)
+
+    print(f"legacy generate_sentence : {before:12,.0f} sentences/s")
+    print(f"TextGenerator.sentences  : {after:12,.0f} sentences/s")
+    print(f"speedup                  : {after / before:12.2f}x")
+
+
+if __name__ == "__main__":
+    main()
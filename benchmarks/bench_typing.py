@@ -0,0 +1,152 @@
+"""
+Synthetic-typist benchmark for the keystroke hot path.
+
+Drives the same headless work that TypingSpeedTest does for every
+<KeyPress> (scorer sync, timeline append, retag range) and once a second
+(live WPM), over each text length mode. Runs without a display.
+
+    python benchmarks/bench_typing.py --wpm 120 --output results.json
+
+Results are written as JSON so runs can be diffed between versions.
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from typing_test.scoring import AlignedScorer, TypingScorer, calculate_wpm
+from typing_test.synthetic import SyntheticTypist
+from typing_test.text import generate_text
+from typing_test.timeline import CORRECT, INCORRECT, OTHER, KeystrokeTimeline
+
+MODES = ["Short Sentence", "Paragraph", "Long Text"]
+SCORERS = {"aligned": AlignedScorer, "positional": TypingScorer}
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def run_mode(mode, typist_args, passages, seed, scorer_class=AlignedScorer):
+    random.seed(seed)
+    latencies = []
+    wpm_latencies = []
+    chars = 0
+    cpu = 0.0
+
+    for n in range(passages):
+        passage = generate_text(mode)
+        chars += len(passage)
+        typist = SyntheticTypist(seed=seed + n, **typist_args)
+        events = list(typist.snapshots(passage))
+
+        scorer = scorer_class(passage)
+        timeline = KeystrokeTimeline(passage)
+        next_wpm_tick = 1.0
+
+        cpu_start = time.process_time()
+        for elapsed, keysym, text in events:
+            t0 = time.perf_counter_ns()
+
+            start, end = scorer.sync(text)
+            index = scorer.position
+            if keysym == "BackSpace":
+                outcome = OTHER
+            elif index > 0:
+                outcome = CORRECT if scorer.is_correct(index - 1) else INCORRECT
+            else:
+                outcome = INCORRECT
+            timeline.append(elapsed, keysym, scorer.cursor, outcome)
+            scorer.tag_runs(start, end)
+
+            latencies.append(time.perf_counter_ns() - t0)
+
+            if elapsed >= next_wpm_tick:
+                t0 = time.perf_counter_ns()
+                calculate_wpm(scorer.correct, elapsed)
+                wpm_latencies.append(time.perf_counter_ns() - t0)
+                next_wpm_tick += 1.0
+        cpu += time.process_time() - cpu_start
+
+    latencies.sort()
+    wpm_latencies.sort()
+    return {
+        "mode": mode,
+        "passages": passages,
+        "mean_passage_chars": round(chars / passages, 1),
+        "keystrokes": len(latencies),
+        "keystroke_us": {
+            "p50": round(percentile(latencies, 0.50) / 1000, 3),
+            "p99": round(percentile(latencies, 0.99) / 1000, 3),
+            "max": round(latencies[-1] / 1000, 3) if latencies else 0.0,
+        },
+        "live_wpm_us": {
+            "p50": round(percentile(wpm_latencies, 0.50) / 1000, 3),
+            "p99": round(percentile(wpm_latencies, 0.99) / 1000, 3),
+            "max": round(wpm_latencies[-1] / 1000, 3) if wpm_latencies else 0.0,
+        },
+        # Typist event generation is excluded
+        "cpu_seconds": round(cpu, 4),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--wpm", type=float, default=80)
+    parser.add_argument("--error-rate", type=float, default=0.03)
+    parser.add_argument("--backspace-rate", type=float, default=0.8)
+    parser.add_argument("--burstiness", type=float, default=0.5)
+    parser.add_argument("--passages", type=int, default=50,
+                        help="passages typed per mode")
+    parser.add_argument("--modes", nargs="+", default=MODES, choices=MODES)
+    parser.add_argument("--scorer", choices=list(SCORERS), default="aligned")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="write JSON here instead of stdout")
+    args = parser.parse_args()
+
+    typist_args = {
+        "wpm": args.wpm,
+        "error_rate": args.error_rate,
+        "backspace_rate": args.backspace_rate,
+        "burstiness": args.burstiness,
+    }
+    results = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "typist": typist_args,
+        "seed": args.seed,
+        "scorer": args.scorer,
+        "modes": [
+            run_mode(mode, typist_args, args.passages, args.seed, SCORERS[args.scorer])
+            for mode in args.modes
+        ],
+    }
+
+    for r in results["modes"]:
+        k = r["keystroke_us"]
+        print(
+            f"{r['mode']:<15} {r['keystrokes']:>7} keys  "
+            f"p50 {k['p50']:>7.2f}us  p99 {k['p99']:>7.2f}us  "
+            f"max {k['max']:>8.2f}us  cpu {r['cpu_seconds']:.3f}s",
+            file=sys.stderr,
+        )
+
+    blob = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(blob + "\n")
+    else:
+        print(blob)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,23 @@
+import json
+
+from typing_test.adaptive import AdaptiveTextSource
+
+
+def test_bigram_stats_are_kept_per_profile(tmp_path):
+    path = str(tmp_path / "bigram_stats.json")
+    ann = AdaptiveTextSource.load(path, profile="ann")
+    ann.stats["th"] = [10, 5]
+    ann.save(path)
+    bob = AdaptiveTextSource.load(path, profile="bob")
+    bob.stats["er"] = [4, 0]
+    bob.save(path)
+
+    assert dict(AdaptiveTextSource.load(path, profile="ann").stats) == {"th": [10, 5]}
+    assert dict(AdaptiveTextSource.load(path, profile="bob").stats) == {"er": [4, 0]}
+
+
+def test_single_user_file_goes_to_the_loading_profile(tmp_path):
+    path = tmp_path / "bigram_stats.json"
+    path.write_text(json.dumps({"th": [10, 5]}))
+    ann = AdaptiveTextSource.load(str(path), profile="ann")
+    assert dict(ann.stats) == {"th": [10, 5]}
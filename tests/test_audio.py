@@ -0,0 +1,69 @@
+import threading
+import time
+
+from typing_test import audio
+from typing_test.audio import QUEUE_SIZE, AudioFeedback, RecordingBackend
+
+
+class SlowBackend(RecordingBackend):
+    """Records beeps, holding up the first one until released."""
+
+    def __init__(self):
+        super().__init__()
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def __call__(self, freq, dur):
+        super().__call__(freq, dur)
+        self.started.set()
+        self.release.wait(5)
+
+
+def _wait_for(backend, count):
+    deadline = time.monotonic() + 5
+    while len(backend.calls) < count and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+def test_full_queue_drops_the_oldest_beeps():
+    backend = SlowBackend()
+    feedback = AudioFeedback(backend, stale_after=60)
+    feedback.beep(1, 10)
+    assert backend.started.wait(5)
+
+    for freq in range(2, QUEUE_SIZE + 4):
+        feedback.beep(freq, 10)
+    assert feedback.dropped == 2
+    backend.release.set()
+    _wait_for(backend, QUEUE_SIZE + 1)
+    feedback.close()
+
+    assert [freq for freq, _ in backend.calls] == [1, *range(4, QUEUE_SIZE + 4)]
+
+
+def test_stale_beeps_are_skipped():
+    backend = SlowBackend()
+    feedback = AudioFeedback(backend, stale_after=0.05)
+    feedback.beep(1, 10)
+    assert backend.started.wait(5)
+    feedback.beep(2, 10)
+    feedback.beep(3, 10)
+    time.sleep(0.1)
+    backend.release.set()
+    feedback.beep(4, 10)
+    _wait_for(backend, 2)
+    feedback.close()
+
+    assert [freq for freq, _ in backend.calls] == [1, 4]
+    assert feedback.dropped == 2
+
+
+def test_set_backend_routes_beep():
+    backend = RecordingBackend()
+    audio.set_backend(backend)
+    try:
+        audio.beep(440, 50)
+        assert backend.played.wait(5)
+        assert backend.calls == [(440, 50)]
+    finally:
+        audio.set_backend(None)
@@ -0,0 +1,29 @@
+import math
+
+from typing_test.charts import bucket_sums, lttb
+
+
+def test_lttb_keeps_the_ends_and_the_peaks():
+    n = 1000
+    xs = list(range(n))
+    ys = [math.sin(i / 50) for i in xs]
+    ys[400] = 10.0
+
+    kept = lttb(xs, ys, 100)
+
+    assert len(kept) == 100
+    assert kept[0] == 0 and kept[-1] == n - 1
+    assert kept == sorted(set(kept))
+    assert 400 in kept
+
+
+def test_lttb_returns_short_series_whole():
+    assert lttb([0, 1, 2], [5, 6, 7], 10) == [0, 1, 2]
+    assert lttb(list(range(5)), [0] * 5, 2) == list(range(5))
+
+
+def test_bucket_sums_keep_the_total():
+    values = list(range(1, 101))
+    sums = bucket_sums(values, 7)
+    assert len(sums) == 7
+    assert sum(sums) == sum(values)
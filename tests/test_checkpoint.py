@@ -0,0 +1,30 @@
+import random
+
+from typing_test.checkpoint import CheckpointWriter, load_checkpoint
+from typing_test.scoring import AlignedScorer
+from typing_test.text import extend_text, sentence_stream
+
+
+def test_extended_passage_reloads(tmp_path):
+    path = tmp_path / "checkpoint.jsonl"
+    random.seed(3)
+    stream = sentence_stream("Random Generated")
+    passage = extend_text("", stream, 200)
+    scorer = AlignedScorer(passage)
+    writer = CheckpointWriter(str(path), interval=0.01)
+    writer.begin(passage, text_source="Random Generated")
+
+    typed = ""
+    for _ in range(4):
+        # As the app's extend_stream() does once the cursor nears the end
+        typed = scorer.sentence[:len(scorer.sentence) - 20]
+        scorer.sync(typed)
+        writer.keystroke(1.0, "a", scorer.cursor, 1, typed)
+        more = extend_text(scorer.sentence, stream, scorer.cursor + 200)
+        scorer.extend_sentence(more)
+        writer.extend(more)
+    writer.close()
+
+    checkpoint = load_checkpoint(str(path))
+    assert checkpoint.passage == scorer.sentence
+    assert list(checkpoint.replay())[-1][4] == typed
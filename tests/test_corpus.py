@@ -0,0 +1,37 @@
+import random
+
+import pytest
+
+from typing_test.corpus import Corpus
+
+
+def _write_corpus(path):
+    paragraphs = [f"Paragraph number {i} has a few words to type in it." for i in range(20)]
+    path.write_text("\n\n".join(paragraphs))
+
+
+def test_unwritable_index_is_kept_in_memory(tmp_path, monkeypatch):
+    path = tmp_path / "corpus.txt"
+    _write_corpus(path)
+    corpus = Corpus(str(path), index_path=str(tmp_path / "missing" / "corpus.idx"))
+    scans = []
+    scan = corpus._scan
+    monkeypatch.setattr(corpus, "_scan", lambda: scans.append(1) or scan())
+
+    rng = random.Random(1)
+    for _ in range(3):
+        assert corpus.passage("Short Sentence", rng).startswith("Paragraph number")
+    assert corpus.counts()["Short Sentence"] == 20
+    assert len(scans) == 1
+
+
+def test_unreadable_corpus_is_not_retried(tmp_path, monkeypatch):
+    corpus = Corpus(str(tmp_path / "gone.txt"))
+    stats = []
+    stat = corpus._stat
+    monkeypatch.setattr(corpus, "_stat", lambda: stats.append(1) or stat())
+
+    for _ in range(3):
+        with pytest.raises(OSError):
+            corpus.passage("Short Sentence")
+    assert len(stats) == 1
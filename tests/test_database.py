@@ -0,0 +1,77 @@
+import json
+import random
+from datetime import datetime, timedelta
+
+from typing_test import rebuild
+from typing_test.database import StatsDatabase
+from typing_test.storage import _default_data, make_session
+
+
+def test_import_legacy_keeps_streaks_without_history(tmp_path):
+    data = dict(_default_data(), daily_streak=4, last_practice_date="2026-10-01",
+                best_wpm=88.5, last_wpm=70.0)
+    data_file = tmp_path / "streak_data.json"
+    data_file.write_text(json.dumps(data))
+    db = StatsDatabase(str(tmp_path / "stats.db"))
+
+    inserted = db.import_legacy(
+        "ann", history_file=str(tmp_path / "history.jsonl"), data_file=str(data_file)
+    )
+
+    assert inserted == 0
+    assert db.streaks("ann")["best_wpm"] == 88.5
+    assert db.streaks("ann")["daily_streak"] == 4
+    db.close()
+
+
+def test_rebuild_keeps_legacy_streaks(tmp_path):
+    data = dict(_default_data(), daily_streak=4, last_practice_date="2026-10-01",
+                best_wpm=88.5, last_wpm=70.0)
+    data_file = tmp_path / "streak_data.json"
+    data_file.write_text(json.dumps(data))
+    path = str(tmp_path / "stats.db")
+    db = StatsDatabase(path)
+    db.import_legacy(
+        "ann", history_file=str(tmp_path / "history.jsonl"), data_file=str(data_file)
+    )
+    db.record_session("ann", make_session(
+        50.0, 95.0, 60.0, "Random Generated", "Paragraph", profile="ann", test_duration=60,
+    ))
+    before = db.streaks("ann")
+    db.close()
+
+    rebuild.main(["--db", path])
+
+    db = StatsDatabase(path)
+    assert db.streaks("ann") == before
+    assert db.streaks("ann")["best_wpm"] == 88.5
+    db.close()
+
+
+def test_incremental_aggregates_match_a_rebuild(tmp_path):
+    rng = random.Random(3)
+    db = StatsDatabase(str(tmp_path / "stats.db"))
+    start = datetime(2026, 9, 25, 9, 0)
+    for i in range(60):
+        profile = rng.choice(["ann", "bob"])
+        session = make_session(
+            rng.uniform(20, 110), 95.0, 60.0, "Random Generated",
+            rng.choice(["Short Sentence", "Paragraph", None]),
+            when=start + timedelta(hours=7 * i, seconds=i), profile=profile,
+            test_duration=rng.choice([30, 60, None]),
+        )
+        db.record_session(profile, session)
+
+    query = "SELECT * FROM aggregates ORDER BY profile_id, period, period_start, " \
+            "text_length, test_duration"
+
+    def snapshot():
+        return [
+            tuple(round(v, 6) if isinstance(v, float) else v for v in row)
+            for row in db.conn.execute(query)
+        ]
+
+    incremental = snapshot()
+    db.rebuild_aggregates()
+    assert snapshot() == incremental
+    db.close()
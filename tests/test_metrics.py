@@ -0,0 +1,46 @@
+import random
+import statistics
+
+from typing_test.metrics import LiveMetrics, RunningStats
+from typing_test.timeline import CORRECT
+
+
+def test_steady_typing_is_fully_consistent():
+    metrics = LiveMetrics()
+    # begin_test refreshes the label right after starting the clock
+    assert metrics.sample(0.000004, 0) is None
+    for second in range(1, 61):
+        for _ in range(5):
+            metrics.keystroke(CORRECT)
+        assert metrics.sample(second, 5 * second) == 60.0
+    metrics.finish(60.0, 300)
+
+    summary = metrics.summary(60.0)
+    assert summary["consistency"] == 100.0
+    assert summary["wpm_stdev"] == 0.0
+    assert len(metrics.wpm_history) == 60
+
+
+def test_a_resumed_test_samples_whole_seconds():
+    metrics = LiveMetrics()
+    for second in range(1, 13):
+        metrics.sample(second, 5 * second)
+    # Resumed 12.4s in, then ticking on the next whole second
+    assert metrics.sample(12.4, 62) is None
+    assert metrics.sample(13.0, 65) == 60.0
+    assert len(metrics.wpm_history) == 13
+
+
+def test_running_stats_remove_matches_the_remaining_samples():
+    rng = random.Random(7)
+    values = [rng.uniform(20, 120) for _ in range(50)]
+    stats = RunningStats()
+    for x in values:
+        stats.add(x)
+    for x in values[:30]:
+        stats.remove(x)
+
+    rest = values[30:]
+    assert stats.count == len(rest)
+    assert abs(stats.mean - statistics.fmean(rest)) < 1e-9
+    assert abs(stats.variance - statistics.pvariance(rest)) < 1e-6
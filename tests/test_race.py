@@ -0,0 +1,35 @@
+import asyncio
+import json
+
+from typing_test.race import RaceServer, encode
+
+
+def test_bad_messages_are_dropped_not_the_player():
+    async def scenario():
+        server = RaceServer(lobby=60)
+        listener = await server.start("127.0.0.1", 0)
+        port = listener.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(encode({"type": "join", "name": "ann"}))
+        assert json.loads(await reader.readline())["type"] == "welcome"
+        (player,) = server.players
+        player.racing = True
+
+        for bad in ([1], "progress", {"type": "progress", "position": None},
+                    {"type": "progress", "position": 3, "wpm": "fast"}):
+            writer.write(encode(bad))
+        writer.write(encode({"type": "progress", "position": 7, "wpm": 42.0}))
+        await writer.drain()
+        for _ in range(100):
+            if player.position == 7:
+                break
+            await asyncio.sleep(0.01)
+
+        assert player in server.players
+        assert (player.position, player.wpm) == (7, 42.0)
+        writer.close()
+        server._races.cancel()
+        listener.close()
+        await listener.wait_closed()
+
+    asyncio.run(scenario())
@@ -0,0 +1,61 @@
+import random
+
+import pytest
+
+from typing_test.scoring import AlignedScorer, TypingScorer
+
+PASSAGE = "the quick brown fox jumps over the lazy dog and keeps on running "
+
+
+def _typo(rng, text, sentence):
+    """text after one random keystroke of someone typing sentence."""
+    roll = rng.random()
+    if roll < 0.15 and text:
+        return text[:-rng.randint(1, 3)]
+    if roll < 0.2 and text:
+        # Select and delete a run somewhere earlier
+        start = rng.randrange(len(text))
+        return text[:start] + text[start + rng.randint(1, 4):]
+    if roll < 0.25:
+        at = rng.randint(0, len(text))
+        return text[:at] + rng.choice("aeiou ") + text[at:]
+    if roll < 0.35:
+        return text + rng.choice("abcdefghijklmnopqrstuvwxyz ")
+    if roll < 0.4 and len(text) < len(sentence):
+        # Skip a character
+        return text + sentence[len(text) + 1:len(text) + 2]
+    return text + sentence[len(text):len(text) + 1]
+
+
+@pytest.mark.parametrize("scorer_class", [TypingScorer, AlignedScorer])
+@pytest.mark.parametrize("seed", range(10))
+def test_incremental_sync_matches_a_fresh_scorer(scorer_class, seed):
+    rng = random.Random(seed)
+    sentence = PASSAGE[:20]
+    scorer = scorer_class(sentence)
+    text = ""
+    for _ in range(300):
+        if rng.random() < 0.03 and len(sentence) < len(PASSAGE):
+            more = PASSAGE[len(sentence):len(sentence) + rng.randint(1, 12)]
+            sentence += more
+            scorer.extend_sentence(more)
+        else:
+            text = _typo(rng, text, sentence)
+            scorer.sync(text)
+
+        fresh = scorer_class(sentence)
+        fresh.sync(text)
+        assert scorer.correct == fresh.correct
+        assert scorer.cursor == fresh.cursor
+        assert scorer.complete == fresh.complete
+        assert scorer.tag_runs(0, len(sentence)) == fresh.tag_runs(0, len(sentence))
+
+
+@pytest.mark.parametrize("scorer_class", [TypingScorer, AlignedScorer])
+def test_extended_passage_typed_in_full_is_complete(scorer_class):
+    scorer = scorer_class(PASSAGE[:10])
+    scorer.sync(PASSAGE[:15])
+    scorer.extend_sentence(PASSAGE[10:])
+    assert not scorer.complete
+    scorer.sync(PASSAGE)
+    assert scorer.complete and scorer.cursor == len(PASSAGE)
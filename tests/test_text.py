@@ -0,0 +1,14 @@
+from typing_test.corpus import Corpus
+from typing_test.text import CORPUS_SOURCE, extend_text, sentence_stream
+
+
+def test_endless_stream_falls_back_for_empty_corpus(tmp_path):
+    path = tmp_path / "empty.txt"
+    path.write_text("")
+    stream = sentence_stream(CORPUS_SOURCE, corpus=Corpus(str(path)))
+    assert len(extend_text("", stream, 100)) >= 100
+
+
+def test_endless_stream_falls_back_for_missing_corpus(tmp_path):
+    stream = sentence_stream(CORPUS_SOURCE, corpus=Corpus(str(tmp_path / "gone.txt")))
+    assert next(stream)
@@ -0,0 +1,38 @@
+from typing_test.timeline import (
+    CORRECT, INCORRECT, NO_DWELL, NO_FLIGHT, OTHER, KeystrokeTimeline,
+)
+
+
+def test_round_trip_keeps_keystrokes_and_passage(tmp_path):
+    timeline = KeystrokeTimeline("héllo wörld")
+    for i, (keysym, outcome) in enumerate(
+        [("h", CORRECT), ("x", INCORRECT), ("BackSpace", OTHER), ("eacute", CORRECT)]
+    ):
+        timeline.append(0.12 * i, keysym, i, outcome)
+
+    path = tmp_path / "run.ktl"
+    timeline.save(str(path))
+    loaded = KeystrokeTimeline.load(str(path))
+
+    assert loaded.passage == timeline.passage
+    assert list(loaded) == list(timeline)
+    # The keysym table carries on where it left off
+    assert loaded.append(1.0, "x", 2, CORRECT) == 4
+    assert loaded.keysyms == ["h", "x", "BackSpace", "eacute"]
+
+
+def test_round_trip_keeps_dwell_and_flight():
+    timeline = KeystrokeTimeline("abc")
+    first = timeline.append(0.100, "a", 1, CORRECT)
+    timeline.release(first, 0.180)
+    # Rolled over: "c" goes down before "b" comes up
+    second = timeline.append(0.250, "b", 2, CORRECT)
+    timeline.append(0.300, "c", 3, CORRECT)
+    timeline.release(second, 0.340)
+    # The last key is never seen coming up
+
+    loaded = KeystrokeTimeline.from_bytes(timeline.to_bytes())
+
+    assert list(loaded.dwells) == [80, 90, NO_DWELL]
+    assert list(loaded.flights) == [NO_FLIGHT, 70, -40]
+    assert loaded.dwells == timeline.dwells and loaded.flights == timeline.flights
@@ -0,0 +1,63 @@
+"""
+Typing Speed Test.
+
+The text generators, scoring and persistence live here and import without
+customtkinter, so they can be scripted on headless machines. The GUI is
+only imported when it is asked for, by main() or by accessing
+TypingSpeedTest.
+"""
+
+from .adaptive import AdaptiveTextSource, AliasSampler
+from .audio import AudioFeedback, RecordingBackend, beep, set_backend
+from .corpus import Corpus, corpus_from_env
+from .database import DATABASE_FILE, StatsDatabase, default_profile
+from .scoring import AlignedScorer, TypingScorer, calculate_wpm, compute_tag_runs
+from .storage import (
+    DATA_FILE,
+    HISTORY_FILE,
+    TIMELINE_DIR,
+    append_session,
+    iter_sessions,
+    load_data,
+    load_timeline,
+    make_session,
+    rebuild_data,
+    record_session,
+    save_data,
+    save_timeline,
+    update_streaks,
+)
+from .text import (
+    ADAPTIVE_SOURCE,
+    CORPUS_SOURCE,
+    DEFAULT_DURATION,
+    DURATION_OPTIONS,
+    ENDLESS_MODE,
+    SENTENCE_TEMPLATES,
+    STATIC_TEXT_POOLS,
+    TEXT_LENGTH_OPTIONS,
+    TEXT_SOURCE_OPTIONS,
+    WORD_BANK,
+    TextGenerator,
+    generate_passages,
+    generate_sentence,
+    generate_text,
+    get_test_text,
+    sentence_stream,
+)
+from .timeline import KeystrokeTimeline
+
+
+def __getattr__(name):
+    if name == "TypingSpeedTest":
+        from .app import TypingSpeedTest
+        return TypingSpeedTest
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def main():
+    """Launch the GUI."""
+    from .app import TypingSpeedTest
+
+    app = TypingSpeedTest()
+    app.mainloop()
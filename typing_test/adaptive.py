@@ -0,0 +1,237 @@
+"""
+Adaptive practice text weighted towards the user's weak bigrams.
+
+Bigram error counts are kept per profile in BIGRAM_FILE and updated from
+each finished test's timeline. A word's weight is 1 plus how much worse than
+average the user does on each bigram in it. Words are then drawn from
+Walker/Vose alias tables, which take O(1) per draw. After a session only
+the words containing the bigrams typed in it are reweighted, and only the
+tables of the categories they belong to are rebuilt.
+"""
+
+import json
+import random
+from collections import defaultdict
+
+from .storage import atomic_write_json
+from .text import SLOT_CATEGORIES, SENTENCE_TEMPLATES, WORD_BANK, TextGenerator
+from .timeline import CORRECT, INCORRECT
+
+BIGRAM_FILE = "bigram_stats.json"
+# Key of the {profile: stats} table in BIGRAM_FILE; a file without it holds
+# one user's stats from before profiles
+PROFILES_KEY = "profiles"
+
+# Pseudo-counts pulling a rarely seen bigram's error rate towards the
+# overall rate, so one slip doesn't dominate practice
+PRIOR_COUNT = 20
+# Cap on how much more often a word can come up than an average one
+MAX_WEIGHT = 8.0
+# Weakness is measured against a reference error rate that only follows
+# the overall rate once it drifts this far, since moving it reweights all
+REFERENCE_DRIFT = 0.1
+
+
+class AliasSampler:
+    """Draws indices 0..n-1 with the given weights in O(1) per draw."""
+
+    __slots__ = ("prob", "alias")
+
+    def __init__(self, weights):
+        n = len(weights)
+        total = float(sum(weights))
+        if n == 0 or total <= 0:
+            raise ValueError("need at least one positive weight")
+        scaled = [w * n / total for w in weights]
+        self.prob = [1.0] * n
+        self.alias = list(range(n))
+        small = [i for i, w in enumerate(scaled) if w < 1.0]
+        large = [i for i, w in enumerate(scaled) if w >= 1.0]
+        while small and large:
+            s = small.pop()
+            g = large.pop()
+            self.prob[s] = scaled[s]
+            self.alias[s] = g
+            scaled[g] -= 1.0 - scaled[s]
+            (small if scaled[g] < 1.0 else large).append(g)
+        # Whatever is left over is 1 up to rounding error
+
+    def draw(self, rng=random):
+        i = int(rng.random() * len(self.prob))
+        return i if rng.random() < self.prob[i] else self.alias[i]
+
+    def sample(self, k, rng=random):
+        prob, alias = self.prob, self.alias
+        n = len(prob)
+        rand = rng.random
+        result = []
+        for _ in range(k):
+            i = int(rand() * n)
+            result.append(i if rand() < prob[i] else alias[i])
+        return result
+
+
+def _bigrams(text):
+    text = text.lower()
+    return {text[i:i + 2] for i in range(len(text) - 1) if " " not in text[i:i + 2]}
+
+
+def _template_text(template):
+    """The literal words of a template, with the placeholders removed."""
+    for slot in SLOT_CATEGORIES:
+        template = template.replace("{%s}" % slot, " ")
+    return template
+
+
+class AdaptiveTextSource:
+    """Keeps bigram stats and a TextGenerator whose draws follow them."""
+
+    def __init__(self, stats=None, rng=None, profile=None):
+        self.profile = profile
+        # bigram -> [typed, errors]
+        self.stats = defaultdict(lambda: [0, 0])
+        for bigram, (typed, errors) in (stats or {}).items():
+            self.stats[bigram] = [typed, errors]
+        self.generator = TextGenerator(rng=rng or random.Random())
+
+        # Items to weight: every category's words plus the templates, and
+        # which of them each bigram appears in
+        self.items = {
+            category: list(WORD_BANK[category])
+            for category in SLOT_CATEGORIES.values()
+        }
+        self.items[None] = [_template_text(t) for t in SENTENCE_TEMPLATES]
+        self.item_bigrams = {
+            group: [_bigrams(text) for text in texts]
+            for group, texts in self.items.items()
+        }
+        self.index = defaultdict(list)
+        for group, bigram_sets in self.item_bigrams.items():
+            for i, bigrams in enumerate(bigram_sets):
+                for bigram in bigrams:
+                    self.index[bigram].append((group, i))
+
+        self.weights = {group: [1.0] * len(texts) for group, texts in self.items.items()}
+        self._update_totals()
+        self.reference_rate = self._base_rate()
+        self._reweight_all()
+
+    # ======================
+    # WEIGHTS
+    # ======================
+
+    def _update_totals(self):
+        self.total_typed = sum(t for t, _ in self.stats.values())
+        self.total_errors = sum(e for _, e in self.stats.values())
+
+    def _base_rate(self):
+        if not self.total_typed:
+            return 0.0
+        return self.total_errors / self.total_typed
+
+    def weakness(self, bigram):
+        """How much worse than average the user does on a bigram, from 0 up."""
+        base = self.reference_rate
+        if base <= 0 or bigram not in self.stats:
+            return 0.0
+        typed, errors = self.stats[bigram]
+        rate = (errors + PRIOR_COUNT * base) / (typed + PRIOR_COUNT)
+        return max(0.0, rate / base - 1.0)
+
+    def _reweight_all(self):
+        self._reweight({group: range(len(texts)) for group, texts in self.items.items()})
+
+    def _reweight(self, groups):
+        """Recompute weights for {group: item indices} and rebuild those tables."""
+        for group, indices in groups.items():
+            weights = self.weights[group]
+            for i in indices:
+                weight = 1.0 + sum(self.weakness(b) for b in self.item_bigrams[group][i])
+                weights[i] = min(weight, MAX_WEIGHT)
+            self.generator.set_sampler(group, AliasSampler(weights))
+
+    # ======================
+    # LEARNING
+    # ======================
+
+    def update_from_timeline(self, timeline):
+        """Fold one finished test's keystrokes into the bigram stats."""
+        passage = timeline.passage.lower()
+        touched = set()
+        typed = errors = 0
+        for position, outcome in zip(timeline.positions, timeline.outcomes):
+            if outcome not in (CORRECT, INCORRECT) or not 2 <= position <= len(passage):
+                continue
+            bigram = passage[position - 2:position]
+            if " " in bigram:
+                continue
+            entry = self.stats[bigram]
+            entry[0] += 1
+            typed += 1
+            if outcome == INCORRECT:
+                entry[1] += 1
+                errors += 1
+            touched.add(bigram)
+        if not touched:
+            return
+
+        self.total_typed += typed
+        self.total_errors += errors
+        base = self._base_rate()
+        if abs(base - self.reference_rate) > REFERENCE_DRIFT * max(self.reference_rate, 1e-9):
+            # Every weakness is relative to the reference rate, so all move
+            self.reference_rate = base
+            self._reweight_all()
+            return
+
+        groups = defaultdict(set)
+        for bigram in touched:
+            for group, i in self.index.get(bigram, ()):
+                groups[group].add(i)
+        self._reweight(groups)
+
+    # ======================
+    # TEXT
+    # ======================
+
+    def text(self, mode):
+        return self.generator.passages(mode, 1)[0]
+
+    def weakest(self, limit=10):
+        """The bigrams currently pulling practice towards them the most."""
+        ranked = sorted(self.stats, key=self.weakness, reverse=True)
+        return [(b, self.weakness(b)) for b in ranked[:limit] if self.weakness(b) > 0]
+
+    # ======================
+    # PERSISTENCE
+    # ======================
+
+    @classmethod
+    def load(cls, path=None, profile=None):
+        """The stats of profile, or of a whole single-user file if profile is None."""
+        stats = _read_stats(path)
+        if profile is not None and PROFILES_KEY in stats:
+            stats = stats[PROFILES_KEY].get(profile, {})
+        # A file from before profiles goes to the profile that loads it
+        stats.pop(PROFILES_KEY, None)
+        return cls(stats, profile=profile)
+
+    def save(self, path=None):
+        path = path or BIGRAM_FILE
+        stats = {b: list(v) for b, v in self.stats.items()}
+        if self.profile is None:
+            atomic_write_json(path, stats)
+            return
+        # Keep the other profiles' stats
+        profiles = _read_stats(path).get(PROFILES_KEY, {})
+        profiles[self.profile] = stats
+        atomic_write_json(path, {PROFILES_KEY: profiles})
+
+
+def _read_stats(path):
+    try:
+        with open(path or BIGRAM_FILE, "r") as f:
+            stats = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return stats if isinstance(stats, dict) else {}
@@ -0,0 +1,295 @@
+"""
+Per-key and per-bigram analytics over recorded keystroke timelines.
+
+All sessions are flattened into a handful of NumPy columns and every
+statistic is computed with grouped array operations (unique, bincount,
+lexsort), so thousands of sessions take a fraction of a second.
+
+Needs NumPy; the rest of typing_test does not.
+"""
+
+import itertools
+
+import numpy as np
+
+from .storage import iter_sessions, load_timeline
+from .timeline import INCORRECT, NO_DWELL, NO_FLIGHT, OTHER
+
+# Gaps longer than this are pauses, not typing, and are left out of timings
+MAX_INTERVAL_MS = 2000
+# Ignore keys and bigrams seen fewer times than this when ranking
+MIN_SAMPLES = 5
+
+_SPACE = ord(" ")
+
+
+def load_timelines(history_file=None, timeline_dir=None, sessions=None):
+    """
+    Load the recorded timelines of sessions, by default every session in
+    the history log, oldest first.
+    """
+    if sessions is None:
+        sessions = iter_sessions(history_file)
+    timelines = []
+    for session in sessions:
+        timeline = load_timeline(session, timeline_dir)
+        if timeline is not None and timeline.passage:
+            timelines.append(timeline)
+    return timelines
+
+
+def _session_columns(timeline):
+    """
+    Flatten one timeline into per-keystroke columns for the character
+    keystrokes that landed inside the passage.
+    """
+    passage = np.frombuffer(timeline.passage.encode("utf-32-le"), dtype=np.uint32)
+    times = np.frombuffer(timeline.times, dtype=np.uint32).astype(np.int64)
+    positions = np.frombuffer(timeline.positions, dtype=np.uint32).astype(np.int64)
+    outcomes = np.frombuffer(timeline.outcomes, dtype=np.uint8)
+    dwells = np.frombuffer(timeline.dwells, dtype=np.uint16).astype(np.float64)
+    flights = np.frombuffer(timeline.flights, dtype=np.int16).astype(np.float64)
+
+    is_char = outcomes != OTHER
+    # Timings of older recordings, and of keys whose release was missed
+    dwells[dwells == NO_DWELL] = np.nan
+    flights[(flights == NO_FLIGHT) | (np.abs(flights) > MAX_INTERVAL_MS)] = np.nan
+    if len(flights):
+        flights[0] = np.nan
+        flights[1:][~is_char[:-1]] = np.nan
+    interval = np.full(len(times), np.nan)
+    if len(times) > 1:
+        gaps = np.diff(times).astype(np.float64)
+        # Only time a keystroke that follows another character keystroke
+        gaps[~is_char[:-1] | (gaps > MAX_INTERVAL_MS)] = np.nan
+        interval[1:] = gaps
+
+    keep = is_char & (positions >= 1) & (positions <= len(passage))
+    positions = positions[keep]
+    expected = passage[positions - 1]
+    previous = np.where(positions >= 2, passage[np.maximum(positions - 2, 0)], 0)
+    word_start = (positions == 1) | (previous == _SPACE)
+
+    # Word about to be typed at each word-start keystroke
+    word_ids = np.cumsum(passage == _SPACE)
+    words = timeline.passage.split(" ")
+
+    return {
+        "expected": expected,
+        "previous": previous,
+        "error": (outcomes[keep] == INCORRECT).astype(np.float64),
+        "interval": interval[keep],
+        "dwell": dwells[keep],
+        "flight": flights[keep],
+        "word_start": word_start,
+        "word": [words[i] for i in word_ids[positions[word_start] - 1]],
+    }
+
+
+def _group_stats(keys, error, interval):
+    """Count, error count, mean and p90 interval for each distinct key."""
+    unique, inverse = np.unique(keys, return_inverse=True)
+    groups = len(unique)
+    count = np.bincount(inverse, minlength=groups)
+    errors = np.bincount(inverse, weights=error, minlength=groups)
+
+    timed = ~np.isnan(interval)
+    timed_groups = inverse[timed]
+    timed_values = interval[timed]
+    timed_count = np.bincount(timed_groups, minlength=groups)
+    timed_sum = np.bincount(timed_groups, weights=timed_values, minlength=groups)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = np.where(timed_count > 0, timed_sum / timed_count, np.nan)
+
+    # p90 per group: sort by (group, interval) and index into each group's
+    # run. Intervals are whole milliseconds up to MAX_INTERVAL_MS, so one
+    # integer sort on a combined key does it, much faster than lexsort.
+    span = MAX_INTERVAL_MS + 1
+    ranked = np.sort(timed_groups * span + timed_values.astype(np.int64)) % span
+    starts = np.cumsum(timed_count) - timed_count
+    offset = np.floor(0.9 * np.maximum(timed_count - 1, 0)).astype(np.int64)
+    p90 = np.full(groups, np.nan)
+    has = timed_count > 0
+    p90[has] = ranked[starts[has] + offset[has]]
+
+    return unique, count, errors, mean, p90
+
+
+def _group_means(keys, values):
+    """Mean of the non-NaN values for each distinct key, in np.unique order."""
+    unique, inverse = np.unique(keys, return_inverse=True)
+    timed = ~np.isnan(values)
+    count = np.bincount(inverse[timed], minlength=len(unique))
+    total = np.bincount(inverse[timed], weights=values[timed], minlength=len(unique))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(count > 0, total / count, np.nan)
+
+
+def _ms(value):
+    return None if np.isnan(value) else round(float(value), 1)
+
+
+def _stats_dict(names, count, errors, mean, p90):
+    result = {}
+    for name, n, e, m, p in zip(names, count, errors, mean, p90):
+        result[name] = {
+            "count": int(n),
+            "errors": int(e),
+            "error_rate": float(e / n) if n else 0.0,
+            "mean_interval_ms": _ms(m),
+            "p90_interval_ms": _ms(p),
+        }
+    return result
+
+
+def analyze(timelines):
+    """
+    Aggregate timelines into a report:
+    - keys: per expected character, with mean dwell (press to release)
+      and flight (previous release to press)
+    - timing: mean dwell and flight over all keystrokes
+    - bigrams: per (previous, expected) character pair
+    - hesitation: interval before the first letter of a word versus
+      inside words, and per word
+    """
+    sessions = [_session_columns(t) for t in timelines]
+    sessions = [s for s in sessions if len(s["expected"])]
+    report = {
+        "sessions": len(timelines),
+        "keystrokes": 0,
+        "keys": {},
+        "bigrams": {},
+        "timing": {"mean_dwell_ms": None, "mean_flight_ms": None},
+        "hesitation": {
+            "word_start_mean_ms": None,
+            "in_word_mean_ms": None,
+            "words": {},
+        },
+    }
+    if not sessions:
+        return report
+
+    expected = np.concatenate([s["expected"] for s in sessions])
+    previous = np.concatenate([s["previous"] for s in sessions])
+    error = np.concatenate([s["error"] for s in sessions])
+    interval = np.concatenate([s["interval"] for s in sessions])
+    dwell = np.concatenate([s["dwell"] for s in sessions])
+    flight = np.concatenate([s["flight"] for s in sessions])
+    word_start = np.concatenate([s["word_start"] for s in sessions])
+    report["keystrokes"] = int(len(expected))
+
+    unique, *stats = _group_stats(expected, error, interval)
+    report["keys"] = _stats_dict([chr(c) for c in unique], *stats)
+    for c, d, f in zip(unique, _group_means(expected, dwell), _group_means(expected, flight)):
+        report["keys"][chr(c)]["mean_dwell_ms"] = _ms(d)
+        report["keys"][chr(c)]["mean_flight_ms"] = _ms(f)
+    if not np.isnan(dwell).all():
+        report["timing"]["mean_dwell_ms"] = _ms(np.nanmean(dwell))
+    if not np.isnan(flight).all():
+        report["timing"]["mean_flight_ms"] = _ms(np.nanmean(flight))
+
+    has_previous = previous > 0
+    pairs = (previous[has_previous].astype(np.uint64) << np.uint64(21)) | expected[
+        has_previous
+    ].astype(np.uint64)
+    unique, *stats = _group_stats(pairs, error[has_previous], interval[has_previous])
+    names = [
+        chr(int(p >> np.uint64(21))) + chr(int(p & np.uint64(0x1FFFFF)))
+        for p in unique
+    ]
+    report["bigrams"] = _stats_dict(names, *stats)
+
+    timed = ~np.isnan(interval)
+    hesitation = report["hesitation"]
+    if (timed & word_start).any():
+        hesitation["word_start_mean_ms"] = round(
+            float(interval[timed & word_start].mean()), 1
+        )
+    if (timed & ~word_start).any():
+        hesitation["in_word_mean_ms"] = round(
+            float(interval[timed & ~word_start].mean()), 1
+        )
+
+    words = np.array(
+        list(itertools.chain.from_iterable(s["word"] for s in sessions)),
+        dtype=object,
+    )
+    if len(words):
+        unique, inverse = np.unique(words, return_inverse=True)
+        start_interval = interval[word_start]
+        start_timed = ~np.isnan(start_interval)
+        count = np.bincount(inverse[start_timed], minlength=len(unique))
+        total = np.bincount(
+            inverse[start_timed], weights=start_interval[start_timed],
+            minlength=len(unique),
+        )
+        hesitation["words"] = {
+            word: {"count": int(n), "mean_ms": round(float(t / n), 1)}
+            for word, n, t in zip(unique, count, total)
+            if n
+        }
+
+    return report
+
+
+def ranked(stats, key, min_samples=MIN_SAMPLES, limit=10):
+    """The entries of a keys/bigrams/words table with the highest key value."""
+    rows = [
+        (name, s) for name, s in stats.items()
+        if s.get(key) is not None and s.get("count", 0) >= min_samples
+    ]
+    rows.sort(key=lambda row: row[1][key], reverse=True)
+    return rows[:limit]
+
+
+def format_report(report, limit=8):
+    """Plain-text summary of an analyze() report for the stats view."""
+    if not report["keystrokes"]:
+        return "No recorded keystrokes yet. Finish a test to see your stats."
+
+    def show(name):
+        return repr(name)[1:-1].replace(" ", "␣")
+
+    lines = [
+        f"{report['sessions']} sessions, {report['keystrokes']} keystrokes",
+        "",
+        "Most error-prone keys:",
+    ]
+    for name, s in ranked(report["keys"], "error_rate", limit=limit):
+        lines.append(f"  {show(name):>4}  {s['error_rate']:6.1%}  ({s['count']} typed)")
+
+    lines += ["", "Most error-prone bigrams:"]
+    for name, s in ranked(report["bigrams"], "error_rate", limit=limit):
+        lines.append(f"  {show(name):>4}  {s['error_rate']:6.1%}  ({s['count']} typed)")
+
+    lines += ["", "Slowest bigrams (p90 interval):"]
+    for name, s in ranked(report["bigrams"], "p90_interval_ms", limit=limit):
+        lines.append(
+            f"  {show(name):>4}  p90 {s['p90_interval_ms']:6.0f} ms"
+            f"  mean {s['mean_interval_ms']:6.0f} ms"
+        )
+
+    timing = report["timing"]
+    if timing["mean_dwell_ms"] is not None:
+        lines += [
+            "",
+            f"Keys held {timing['mean_dwell_ms']:.0f} ms on average,"
+            f" {timing['mean_flight_ms'] or 0:.0f} ms from release to next press",
+            "Longest-held keys (mean dwell):",
+        ]
+        for name, s in ranked(report["keys"], "mean_dwell_ms", limit=limit):
+            lines.append(f"  {show(name):>4}  {s['mean_dwell_ms']:6.0f} ms")
+
+    hesitation = report["hesitation"]
+    if hesitation["word_start_mean_ms"] is not None:
+        lines += [
+            "",
+            f"Before a word: {hesitation['word_start_mean_ms']:.0f} ms"
+            f"   inside a word: {hesitation['in_word_mean_ms'] or 0:.0f} ms",
+            "Longest hesitations before:",
+        ]
+        for word, s in ranked(hesitation["words"], "mean_ms", min_samples=2, limit=limit):
+            lines.append(f"  {word:<14} {s['mean_ms']:6.0f} ms")
+
+    return "\n".join(lines)
@@ -0,0 +1,1165 @@
+"""The customtkinter front end. Importing this module needs a display."""
+
+import os
+import threading
+import tkinter.font
+import tkinter.messagebox
+
+import customtkinter as ctk
+
+from .adaptive import AdaptiveTextSource
+from .audio import beep
+from .charts import CHART_POINTS, LineChart
+from .checkpoint import CheckpointWriter, load_checkpoint
+from .corpus import corpus_from_env
+from .database import (
+    ALL_TIME,
+    DAY,
+    WEEK,
+    StatsDatabase,
+    default_profile,
+    format_leaderboard,
+)
+from .ghost import FRAME_INTERVAL, GhostReplay
+from .instrument import Instrumentation, LoopLagProbe, enabled_from_env
+from .metrics import LiveMetrics
+from .race import DEFAULT_PORT, TICK_RATE, RaceClient, format_standings
+from .scheduler import EventClock, TickScheduler
+from .scoring import AlignedScorer, calculate_wpm
+from .storage import (
+    load_timeline,
+    make_session,
+    save_timeline,
+)
+from .text import (
+    CORPUS_SOURCE,
+    DEFAULT_DURATION,
+    DURATION_OPTIONS,
+    ENDLESS_MODE,
+    TEXT_LENGTH_OPTIONS,
+    TEXT_SOURCE_OPTIONS,
+    extend_text,
+    get_test_text,
+    sentence_stream,
+)
+from .timeline import CORRECT, INCORRECT, OTHER, KeystrokeTimeline
+from .viewport import PassageViewport
+
+ctk.set_appearance_mode("light")
+ctk.set_default_color_theme("blue")
+
+# Characters of passage kept ahead of the cursor in the endless mode
+STREAM_LOOKAHEAD = 200
+
+# Bind tag of the input box's handler that runs after a key is applied
+TYPED_TAG = "TypedKey"
+
+INSTRUMENTATION_DIR = "instrumentation"
+
+SENTENCE_FONT = ("Helvetica", 20, "bold")
+# Unscaled pixels of the sentence box a display line may fill, with some
+# slack so the widget's own word wrap never kicks in
+SENTENCE_WRAP_WIDTH = 630
+
+CHART_WIDTH = 680
+CHART_HEIGHT = 60
+# Sessions drawn in the stats view's history chart
+HISTORY_POINTS = 200
+
+
+class TypingSpeedTest(ctk.CTk):
+
+    def __init__(self):
+        super().__init__()
+
+        self.title("Typing Speed Test")
+        self.geometry("780x820")
+
+        self.current_sentence = ""
+        self.text_stream = None
+        self.test_duration = DEFAULT_DURATION
+        self.time_left = self.test_duration
+        self.timer_running = False
+        self.paused = False
+        self.countdown = 3
+        self.scheduler = TickScheduler(self)
+        # Keystrokes are timed by their events' own timestamps
+        self.event_clock = EventClock(self.scheduler.clock)
+        # Timeline index of the keystroke each held-down key made, by keycode
+        self.keys_down = {}
+        self.scorer = AlignedScorer()
+        self.timeline = KeystrokeTimeline()
+        self.metrics = LiveMetrics()
+        self.ghost = None
+        self.race = None
+        self.race_job = None
+        self.race_passage = None
+        self.race_duration = DEFAULT_DURATION
+        self.race_settings = None
+        # Text source and length of the test in progress, as recorded
+        self.test_settings = None
+
+        self.db = StatsDatabase()
+        self.profile = default_profile()
+        if not self.db.has_sessions():
+            # First run with the database: bring the existing history and
+            # streaks over
+            self.db.import_legacy(self.profile)
+        self.data = self.db.streaks(self.profile)
+        # The test in progress, logged so it survives a crash
+        self.checkpoint = CheckpointWriter()
+        self.resume_from = None
+        self.adaptive = AdaptiveTextSource.load(profile=self.profile)
+
+        # Map the corpus (building its index on first use) off the Tk thread
+        self.corpus = corpus_from_env()
+        text_sources = list(TEXT_SOURCE_OPTIONS)
+        if self.corpus:
+            text_sources.append(CORPUS_SOURCE)
+            threading.Thread(target=self.open_corpus, daemon=True).start()
+
+        self.instrumentation = None
+        if enabled_from_env():
+            self.instrumentation = Instrumentation()
+            # Wrapped before anything binds or schedules these handlers
+            self.handle_typing = self.instrumentation.wrap(
+                "handle_typing", self.handle_typing, event_handler=True
+            )
+            for name in (
+                "update_sentence_display", "update_timer", "update_live_wpm",
+                "advance_ghost", "poll_race",
+            ):
+                setattr(self, name, self.instrumentation.wrap(name, getattr(self, name)))
+
+        # ── TITLE ──────────────────────────────────────────────
+        self.title_label = ctk.CTkLabel(
+            self,
+            text="Typing Speed Test",
+            font=("Helvetica", 30, "bold"),
+        )
+        self.title_label.pack(pady=15)
+
+        # ── SETTINGS FRAME (duration + text length + source) ──
+        self.settings_frame = ctk.CTkFrame(self)
+        self.settings_frame.pack(pady=(0, 5))
+
+        # Row 0: Duration + Text Length
+        self.duration_label = ctk.CTkLabel(
+            self.settings_frame,
+            text="Duration:",
+            font=("Helvetica", 14),
+        )
+        self.duration_label.grid(row=0, column=0, padx=(10, 5), pady=5)
+
+        self.duration_var = ctk.StringVar(value="60 seconds")
+        self.duration_menu = ctk.CTkOptionMenu(
+            self.settings_frame,
+            variable=self.duration_var,
+            values=list(DURATION_OPTIONS.keys()),
+            command=self.on_duration_change,
+            width=140,
+        )
+        self.duration_menu.grid(row=0, column=1, padx=(0, 20), pady=5)
+
+        self.text_length_label = ctk.CTkLabel(
+            self.settings_frame,
+            text="Text Length:",
+            font=("Helvetica", 14),
+        )
+        self.text_length_label.grid(row=0, column=2, padx=(10, 5), pady=5)
+
+        self.text_length_var = ctk.StringVar(value="Short Sentence")
+        self.text_length_menu = ctk.CTkOptionMenu(
+            self.settings_frame,
+            variable=self.text_length_var,
+            values=TEXT_LENGTH_OPTIONS,
+            width=160,
+            command=self.on_text_length_change,
+        )
+        self.text_length_menu.grid(row=0, column=3, padx=(0, 10), pady=5)
+
+        # Row 1: Text Source selector
+        self.text_source_label = ctk.CTkLabel(
+            self.settings_frame,
+            text="Text Source:",
+            font=("Helvetica", 14),
+        )
+        self.text_source_label.grid(row=1, column=0, padx=(10, 5), pady=5)
+
+        self.text_source_var = ctk.StringVar(value="Random Generated")
+        self.text_source_menu = ctk.CTkOptionMenu(
+            self.settings_frame,
+            variable=self.text_source_var,
+            values=text_sources,
+            width=180,
+        )
+        self.text_source_menu.grid(row=1, column=1, columnspan=2, padx=(0, 20), pady=5)
+
+        # Row 2: Profile selector (type a new name to add a profile)
+        self.profile_label = ctk.CTkLabel(
+            self.settings_frame,
+            text="Profile:",
+            font=("Helvetica", 14),
+        )
+        self.profile_label.grid(row=2, column=0, padx=(10, 5), pady=5)
+
+        self.profile_var = ctk.StringVar(value=self.profile)
+        self.profile_menu = ctk.CTkComboBox(
+            self.settings_frame,
+            variable=self.profile_var,
+            values=sorted(set(self.db.profiles()) | {self.profile}),
+            command=self.on_profile_change,
+            width=180,
+        )
+        self.profile_menu.grid(row=2, column=1, columnspan=2, padx=(0, 20), pady=5)
+        self.profile_menu.bind("<Return>", self.on_profile_entry)
+        self.profile_menu.bind("<FocusOut>", self.on_profile_entry)
+
+        self.ghost_var = ctk.BooleanVar(value=False)
+        self.ghost_checkbox = ctk.CTkCheckBox(
+            self.settings_frame,
+            text="Race my best run",
+            variable=self.ghost_var,
+        )
+        self.ghost_checkbox.grid(row=2, column=3, padx=(0, 10), pady=5)
+
+        # ── STATS FRAME (timer + live WPM side by side) ───────
+        self.stats_frame = ctk.CTkFrame(self, fg_color="transparent")
+        self.stats_frame.pack(pady=(5, 0))
+
+        self.timer_label = ctk.CTkLabel(
+            self.stats_frame,
+            text=f"⏱ Time Remaining: {self.test_duration}s",
+            font=("Helvetica", 18, "bold"),
+        )
+        self.timer_label.grid(row=0, column=0, padx=(20, 40))
+
+        self.live_wpm_label = ctk.CTkLabel(
+            self.stats_frame,
+            text="⌨ Live WPM: 0.00",
+            font=("Helvetica", 18, "bold"),
+            text_color="#555555",
+        )
+        self.live_wpm_label.grid(row=0, column=1, padx=(40, 20))
+
+        # WPM per second while typing; WPM and errors per second afterwards
+        self.chart_canvas = ctk.CTkCanvas(
+            self, width=CHART_WIDTH, height=CHART_HEIGHT,
+            bg="gray92", highlightthickness=0,
+        )
+        self.chart_canvas.pack(pady=(5, 0))
+        self.wpm_chart = LineChart(self.chart_canvas, CHART_WIDTH, CHART_HEIGHT)
+
+        # ── SENTENCE FRAME ─────────────────────────────────────
+        self.sentence_frame = ctk.CTkFrame(self, width=700, height=130)
+        self.sentence_frame.pack(pady=15)
+        self.sentence_frame.pack_propagate(False)
+
+        self.sentence_textbox = ctk.CTkTextbox(
+            self.sentence_frame,
+            wrap="word",
+            font=SENTENCE_FONT,
+            border_width=0,
+            fg_color="transparent",
+        )
+        self.sentence_textbox.pack(padx=10, pady=10, fill="both", expand=True)
+        self.sentence_textbox.insert("1.0", "Press Enter or click Start to begin")
+        self.sentence_textbox.configure(state="disabled")
+
+        self.sentence_textbox.tag_config("correct", foreground="green")
+        self.sentence_textbox.tag_config("incorrect", foreground="red")
+        # The ghost's cursor: the next character the recorded run typed
+        self.sentence_textbox.tag_config("ghost", background="#C8D8FF")
+
+        # Only the lines around the cursor are ever in the sentence box
+        # customtkinter draws the box's font in pixels, scaled with the widget
+        # (-round(size * scaling)), and its width scaled the same way, so
+        # measure with exactly that font against the scaled width
+        family, size, weight = SENTENCE_FONT
+        scaling = self.sentence_textbox._get_widget_scaling()
+        sentence_font = tkinter.font.Font(
+            self, family=family, size=-round(size * scaling), weight=weight
+        )
+        self.viewport = PassageViewport(
+            sentence_font.measure, round(SENTENCE_WRAP_WIDTH * scaling)
+        )
+
+        # ── INPUT BOX ──────────────────────────────────────────
+        self.input_textbox = ctk.CTkTextbox(
+            self,
+            width=680,
+            height=120,
+            font=("Helvetica", 16),
+        )
+        self.input_textbox.pack(pady=10)
+        self.input_textbox.configure(state="disabled")
+
+        # A widget's own bindings run before its class's, which insert the
+        # character, so handle_typing goes on a tag after the class's to
+        # see the text with the key already applied
+        text_widget = self.input_textbox._textbox
+        tags = text_widget.bindtags()
+        text_widget.bindtags(tags[:2] + (TYPED_TAG,) + tags[2:])
+        text_widget.bind_class(TYPED_TAG, "<KeyPress>", self.handle_typing)
+        self.input_textbox.bind("<KeyRelease>", self.handle_key_release)
+        self.input_textbox.bind("<Return>", lambda e: "break")
+
+        # ── RESULT LABEL ───────────────────────────────────────
+        self.result_label = ctk.CTkLabel(
+            self, text="", font=("Helvetica", 18, "bold")
+        )
+        self.result_label.pack(pady=10)
+
+        # ── STREAK LABEL ───────────────────────────────────────
+        self.streak_label = ctk.CTkLabel(
+            self, text=self.get_streak_text(), font=("Helvetica", 16)
+        )
+        self.streak_label.pack(pady=5)
+
+        # ── RACE STANDINGS (shown while connected to a race) ───
+        self.race_label = ctk.CTkLabel(
+            self, text="", font=("Courier", 13), justify="left"
+        )
+
+        # ── BUTTON FRAME ───────────────────────────────────────
+        self.button_frame = ctk.CTkFrame(self)
+        self.button_frame.pack(pady=10)
+
+        self.start_button = ctk.CTkButton(
+            self.button_frame,
+            text="Start Test",
+            command=self.start_test,
+        )
+        self.start_button.grid(row=0, column=0, padx=10)
+
+        self.pause_button = ctk.CTkButton(
+            self.button_frame,
+            text="Pause",
+            command=self.toggle_pause,
+            state="disabled",
+        )
+        self.pause_button.grid(row=0, column=1, padx=10)
+
+        self.stats_button = ctk.CTkButton(
+            self.button_frame,
+            text="Stats",
+            command=self.open_stats_view,
+        )
+        self.stats_button.grid(row=0, column=2, padx=10)
+
+        self.leaderboard_button = ctk.CTkButton(
+            self.button_frame,
+            text="Leaderboard",
+            command=self.open_leaderboard_view,
+        )
+        self.leaderboard_button.grid(row=0, column=3, padx=10)
+
+        self.race_button = ctk.CTkButton(
+            self.button_frame,
+            text="Join Race",
+            command=self.toggle_race,
+        )
+        self.race_button.grid(row=0, column=4, padx=10)
+
+        self.bind("<Return>", self.handle_enter)
+
+        # ── DEBUG OVERLAY (instrumentation only, F12 toggles) ──
+        if self.instrumentation:
+            self.debug_label = ctk.CTkLabel(
+                self,
+                text="",
+                font=("Courier", 11),
+                justify="left",
+                text_color="#777777",
+            )
+            self.debug_label.pack(pady=(0, 5))
+            self.bind("<F12>", self.toggle_debug_overlay)
+            self.debug_ticks = 0
+            self.lag_probe = LoopLagProbe(
+                self, self.instrumentation, on_tick=self.refresh_debug_overlay
+            )
+            self.lag_probe.start()
+
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
+        self.after(300, self.offer_resume)
+
+    # ======================
+    # CHECKPOINT RESUME
+    # ======================
+
+    def offer_resume(self):
+        """Offer to pick up a test that was cut short by a crash or close."""
+        checkpoint = load_checkpoint()
+        if checkpoint is None:
+            return
+        if not tkinter.messagebox.askyesno(
+            "Resume test",
+            f"A test was left unfinished {checkpoint.elapsed:.0f}s in. Resume it?",
+        ):
+            self.checkpoint.clear()
+            return
+
+        settings = checkpoint.settings
+        self.text_source_var.set(settings["text_source"])
+        self.text_length_var.set(settings["text_length"])
+        self.duration_var.set(settings["duration"])
+        self.ghost_var.set(settings["ghost"])
+        if settings["profile"] != self.profile:
+            self.profile_var.set(settings["profile"])
+            self.on_profile_change(settings["profile"])
+        self.resume_from = checkpoint
+        self.start_test()
+
+    def replay_checkpoint(self, checkpoint):
+        """Type the checkpoint's keystrokes back in, logging them to the new one."""
+        text = ""
+        second = 1
+        for seconds, keysym, position, outcome, text in checkpoint.replay():
+            # The live samples that would have been taken along the way
+            while second <= seconds:
+                self.wpm_chart.append(self.metrics.sample(second, self.scorer.correct))
+                second += 1
+            self.scorer.sync(text)
+            self.timeline.append(seconds, keysym, position, outcome)
+            self.metrics.keystroke(outcome)
+            self.checkpoint.keystroke(seconds, keysym, position, outcome, text)
+        for index, seconds in checkpoint.releases:
+            if index < len(self.timeline):
+                self.timeline.release(index, seconds)
+                self.checkpoint.release(index, seconds)
+        while second <= checkpoint.elapsed:
+            self.wpm_chart.append(self.metrics.sample(second, self.scorer.correct))
+            second += 1
+
+        self.input_textbox.insert("1.0", text)
+        self.viewport.follow(self.scorer.cursor)
+        self.render_window()
+
+    def open_corpus(self):
+        """Map the corpus in the background; a test start falls back if it can't be."""
+        try:
+            self.corpus.open()
+        except OSError:
+            pass
+
+    def on_close(self):
+        """Flush the checkpoint before exiting, so an unfinished test can be resumed."""
+        if self.timer_running:
+            self.checkpoint.clock(self.scheduler.elapsed(), self.paused)
+        self.checkpoint.close()
+        self.destroy()
+
+    # ======================
+    # SETTINGS CALLBACKS
+    # ======================
+
+    def on_duration_change(self, choice: str):
+        """Update the displayed timer immediately when the user picks a new duration."""
+        self.test_duration = DURATION_OPTIONS.get(choice, DEFAULT_DURATION)
+        if not self.timer_running:
+            self.timer_label.configure(
+                text=f"⏱ Time Remaining: {self.test_duration}s"
+            )
+        self.streak_label.configure(text=self.get_streak_text())
+
+    def on_text_length_change(self, choice: str):
+        """Show the best WPM for the newly picked text length."""
+        self.streak_label.configure(text=self.get_streak_text())
+
+    def on_profile_change(self, choice: str):
+        """Switch to another profile, creating it if it is new."""
+        choice = choice.strip()
+        if not choice or self.timer_running:
+            self.profile_var.set(self.profile)
+            return
+        if choice == self.profile:
+            return
+        self.profile = choice
+        self.data = self.db.streaks(choice)
+        self.adaptive = AdaptiveTextSource.load(profile=choice)
+        self.profile_menu.configure(values=sorted(set(self.db.profiles())))
+        self.streak_label.configure(text=self.get_streak_text())
+
+    def on_profile_entry(self, event=None):
+        self.on_profile_change(self.profile_var.get())
+        # Keep Enter in the profile box from also starting a test
+        return "break"
+
+    # ======================
+    # HANDLE ENTER KEY
+    # ======================
+
+    def handle_enter(self, event=None):
+        if self.start_button.cget("state") == "normal":
+            self.start_test()
+
+    # ======================
+    # DEBUG OVERLAY
+    # ======================
+
+    def refresh_debug_overlay(self):
+        """Redraw the overlay about once a second from the lag probe's ticks."""
+        self.debug_ticks += 1
+        if self.debug_ticks % 10 == 0 and self.debug_label.winfo_ismapped():
+            self.debug_label.configure(text=self.instrumentation.overlay_text())
+
+    def toggle_debug_overlay(self, event=None):
+        if self.debug_label.winfo_ismapped():
+            self.debug_label.pack_forget()
+        else:
+            self.debug_label.pack(pady=(0, 5))
+
+    # ======================
+    # STATS VIEW
+    # ======================
+
+    def open_stats_view(self):
+        """Show per-key, per-bigram and hesitation stats over the profile's recorded tests."""
+        try:
+            from .analytics import analyze, format_report, load_timelines
+        except ImportError:
+            report = "Per-key stats need NumPy: pip install numpy"
+        else:
+            sessions = self.db.timeline_sessions(self.profile)
+            report = format_report(analyze(load_timelines(sessions=sessions)))
+
+        window = ctk.CTkToplevel(self)
+        window.title("Typing Stats")
+        window.geometry("520x680")
+
+        # WPM of every session so far, downsampled for the chart
+        canvas = ctk.CTkCanvas(
+            window, width=500, height=CHART_HEIGHT, bg="gray92", highlightthickness=0
+        )
+        canvas.pack(padx=10, pady=(10, 0))
+        LineChart(canvas, 500, CHART_HEIGHT).plot(
+            self.db.wpm_history(self.profile), points=HISTORY_POINTS
+        )
+
+        textbox = ctk.CTkTextbox(window, font=("Courier", 14), wrap="none")
+        textbox.pack(padx=10, pady=10, fill="both", expand=True)
+        textbox.insert("1.0", report)
+        textbox.configure(state="disabled")
+        window.after(100, window.lift)
+
+    # ======================
+    # LEADERBOARD VIEW
+    # ======================
+
+    def open_leaderboard_view(self):
+        """Show today's leaderboard for the selected settings and the profile's bests."""
+        test_duration = DURATION_OPTIONS.get(self.duration_var.get(), DEFAULT_DURATION)
+        report = format_leaderboard(
+            self.db, self.profile, self.text_length_var.get(), test_duration
+        )
+
+        window = ctk.CTkToplevel(self)
+        window.title("Leaderboard")
+        window.geometry("520x500")
+        textbox = ctk.CTkTextbox(window, font=("Courier", 14), wrap="none")
+        textbox.pack(padx=10, pady=10, fill="both", expand=True)
+        textbox.insert("1.0", report)
+        textbox.configure(state="disabled")
+        window.after(100, window.lift)
+
+    # ======================
+    # STREAK TEXT
+    # ======================
+
+    def get_streak_text(self):
+        # Read from the aggregates, not the sessions
+        today = self.db.aggregate(self.profile, DAY)
+        week = self.db.aggregate(self.profile, WEEK)
+        mode = self.db.aggregate(
+            self.profile,
+            ALL_TIME,
+            self.text_length_var.get(),
+            DURATION_OPTIONS.get(self.duration_var.get(), DEFAULT_DURATION),
+        )
+        return (
+            f"🔥 Daily Streak: {self.data.get('daily_streak', 0)} days\n"
+            f"📈 Improvement Streak: {self.data.get('improvement_streak', 0)}\n"
+            f"🏆 Personal Best Streak: {self.data.get('personal_best_streak', 0)}\n"
+            f"⭐ Best WPM: {self.data.get('best_wpm', 0)}   "
+            f"🎯 This mode: {mode['best']:.2f}\n"
+            f"📅 Today: {today['sessions']} tests, avg {today['average']:.1f}   "
+            f"This week: {week['sessions']} tests, avg {week['average']:.1f}"
+        )
+
+    # ======================
+    # TEXT GENERATION
+    # ======================
+
+    def get_test_text(self) -> str:
+        """Return the test text for the selected source and length mode."""
+        try:
+            return get_test_text(
+                self.text_source_var.get(),
+                self.text_length_var.get(),
+                generator=self.adaptive.generator,
+                corpus=self.corpus,
+            )
+        except (OSError, ValueError):
+            # Unreadable or empty corpus: fall back to generated text
+            return get_test_text("Random Generated", self.text_length_var.get())
+
+    # ======================
+    # CALCULATE CURRENT WPM
+    # ======================
+
+    def calculate_current_wpm(self):
+        """Return the current WPM based on correct characters typed so far."""
+        if not self.scheduler.started:
+            return 0.0
+
+        return calculate_wpm(self.scorer.correct, self.scheduler.elapsed())
+
+    # ======================
+    # LIVE WPM UPDATE LOOP
+    # ======================
+
+    def update_live_wpm(self):
+        """Scheduler job that refreshes the live WPM label every second."""
+        if not self.timer_running or self.paused:
+            return
+
+        elapsed = self.scheduler.elapsed()
+        sample = self.metrics.sample(elapsed, self.scorer.correct)
+        if sample is not None:
+            self.wpm_chart.append(sample)
+        current_wpm = self.calculate_current_wpm()
+        self.live_wpm_label.configure(
+            text=f"⌨ Live WPM: {current_wpm:.2f}  "
+            f"(raw {self.metrics.raw_wpm(elapsed):.0f}, {self.metrics.accuracy:.0f}% acc, "
+            f"{self.metrics.rolling.consistency():.0f}% cons)"
+        )
+
+        if current_wpm >= 60:
+            self.live_wpm_label.configure(text_color="#00AA00")
+        elif current_wpm >= 30:
+            self.live_wpm_label.configure(text_color="#CC8800")
+        else:
+            self.live_wpm_label.configure(text_color="#CC0000")
+
+    # ======================
+    # START TEST
+    # ======================
+
+    def start_test(self):
+        if self.timer_running:
+            return
+
+        if self.race_passage is not None:
+            self.test_duration = self.race_duration
+        else:
+            self.test_duration = DURATION_OPTIONS.get(
+                self.duration_var.get(), DEFAULT_DURATION
+            )
+        self.timer_label.configure(
+            text=f"⏱ Time Remaining: {self.test_duration}s"
+        )
+
+        self.live_wpm_label.configure(
+            text="⌨ Live WPM: 0.00", text_color="#555555"
+        )
+
+        self.result_label.configure(text="")
+        self.countdown = 3
+        self.input_textbox.configure(state="disabled")
+        self.start_button.configure(state="disabled")
+        self.pause_button.configure(text="Pause")
+
+        # Disable all settings while test is in progress
+        self.duration_menu.configure(state="disabled")
+        self.text_length_menu.configure(state="disabled")
+        self.text_source_menu.configure(state="disabled")
+        self.profile_menu.configure(state="disabled")
+        self.ghost_checkbox.configure(state="disabled")
+
+        self.sentence_textbox.configure(state="normal")
+        self.sentence_textbox.delete("1.0", "end")
+        self.sentence_textbox.configure(state="disabled")
+
+        self.show_countdown()
+
+    # ======================
+    # COUNTDOWN
+    # ======================
+
+    def show_countdown(self):
+        if self.countdown > 0:
+            self.sentence_textbox.configure(state="normal")
+            self.sentence_textbox.delete("1.0", "end")
+            self.sentence_textbox.insert("1.0", f"Starting in {self.countdown}...")
+            self.sentence_textbox.configure(state="disabled")
+            self.countdown -= 1
+            self.scheduler.call_later(1.0, self.show_countdown)
+        else:
+            self.sentence_textbox.configure(state="normal")
+            self.sentence_textbox.delete("1.0", "end")
+            self.sentence_textbox.insert("1.0", "GO!")
+            self.sentence_textbox.configure(state="disabled")
+            self.scheduler.call_later(0.8, self.begin_test)
+
+    # ======================
+    # BEGIN TEST
+    # ======================
+
+    def begin_test(self):
+        resume, self.resume_from = self.resume_from, None
+        racing = self.race_passage is not None
+        if racing:
+            self.test_settings = self.race_settings
+        else:
+            self.test_settings = (self.text_source_var.get(), self.text_length_var.get())
+        ghost_wanted = self.ghost_var.get() and not racing
+        self.ghost = self.load_ghost() if ghost_wanted else None
+        if ghost_wanted and self.ghost is None:
+            self.result_label.configure(
+                text="No recorded run with these settings yet, racing the clock"
+            )
+
+        # Generate text based on selected source and length
+        endless = self.text_length_var.get() == ENDLESS_MODE
+        if resume is not None:
+            # Carry on with the checkpointed passage, streaming more if endless
+            self.text_stream = sentence_stream(
+                self.text_source_var.get(),
+                generator=self.adaptive.generator,
+                corpus=self.corpus,
+            ) if endless and self.ghost is None else None
+            self.current_sentence = resume.passage
+        elif racing:
+            # Everyone in the race types the passage the server sent
+            self.text_stream = None
+            self.current_sentence = self.race_passage
+        elif self.ghost is not None:
+            # Race over the ghost's own passage, which ends the test
+            self.text_stream = None
+            self.current_sentence = self.ghost.passage
+        elif endless:
+            self.text_stream = sentence_stream(
+                self.text_source_var.get(),
+                generator=self.adaptive.generator,
+                corpus=self.corpus,
+            )
+            self.current_sentence = extend_text(
+                "", self.text_stream, STREAM_LOOKAHEAD
+            )
+        else:
+            self.text_stream = None
+            self.current_sentence = self.get_test_text()
+
+        self.input_textbox.configure(state="normal")
+        self.input_textbox.delete("1.0", "end")
+
+        self.scorer.reset(self.current_sentence)
+        self.timeline = KeystrokeTimeline(self.current_sentence)
+        self.event_clock.reset()
+        self.keys_down.clear()
+        self.metrics.reset()
+        self.wpm_chart.reset(min(self.test_duration, CHART_POINTS))
+        if self.instrumentation:
+            self.instrumentation.reset()
+        self.render_sentence()
+        self.input_textbox.focus()
+
+        if racing:
+            # A race can't be resumed, so there's nothing to checkpoint
+            self.checkpoint.clear()
+        else:
+            self.checkpoint.begin(
+                self.current_sentence,
+                text_source=self.text_source_var.get(),
+                text_length=self.text_length_var.get(),
+                duration=self.duration_var.get(),
+                ghost=self.ghost is not None,
+                profile=self.profile,
+            )
+        elapsed = 0.0
+        if resume is not None:
+            self.replay_checkpoint(resume)
+            elapsed = resume.elapsed
+
+        self.scheduler.start_clock(elapsed)
+        self.time_left = self.test_duration
+        self.timer_running = True
+        self.paused = False
+
+        # The server's clock keeps running, so a race can't be paused
+        self.pause_button.configure(state="disabled" if racing else "normal")
+
+        # Both labels tick together on whole seconds of test time
+        self.update_timer()
+        self.update_live_wpm()
+        first = 1.0 - elapsed % 1.0
+        self.scheduler.call_every(1.0, self.update_timer, first=first)
+        self.scheduler.call_every(1.0, self.update_live_wpm, first=first)
+        if resume is not None and resume.paused:
+            self.toggle_pause()
+        if self.ghost is not None:
+            self.scheduler.call_every(FRAME_INTERVAL, self.advance_ghost, first=0)
+
+    # ======================
+    # GHOST
+    # ======================
+
+    def load_ghost(self):
+        """The profile's best recorded run with the selected settings, or None."""
+        session = self.db.best_session(
+            self.profile, self.text_length_var.get(), self.test_duration
+        )
+        timeline = load_timeline(session) if session else None
+        if timeline is None or not timeline.passage or not len(timeline):
+            return None
+        return GhostReplay(timeline, wpm=session["wpm"])
+
+    def advance_ghost(self):
+        """Scheduler job, once a frame: move the ghost tag to the replay's cursor."""
+        if not self.timer_running or self.paused:
+            return
+
+        if self.ghost.advance(self.scheduler.elapsed()) is not None:
+            self.show_ghost()
+
+    def show_ghost(self):
+        """Move the ghost tag to the ghost's cursor, if it is in the window."""
+        self.sentence_textbox.tag_remove("ghost", "1.0", "end")
+        position = self.ghost.position
+        start, end = self.viewport.span
+        if start <= position < min(end, len(self.current_sentence)):
+            index = self.viewport.index(position)
+            self.sentence_textbox.tag_add("ghost", index, f"{index}+1c")
+
+    # ======================
+    # LAN RACE
+    # ======================
+
+    def toggle_race(self):
+        if self.race is not None:
+            self.leave_race()
+            return
+
+        dialog = ctk.CTkInputDialog(
+            text=f"Race server address (host or host:port, default port {DEFAULT_PORT}):",
+            title="Join Race",
+        )
+        address = (dialog.get_input() or "").strip()
+        if not address:
+            return
+        host, _, port = address.partition(":")
+        try:
+            self.race = RaceClient(host, int(port or DEFAULT_PORT), name=self.profile)
+        except (OSError, ValueError) as e:
+            self.result_label.configure(text=f"Couldn't join the race: {e}")
+            return
+
+        self.race_button.configure(text="Leave Race")
+        self.race_label.configure(text="Waiting for the next race...")
+        self.race_label.pack(after=self.streak_label, pady=5)
+        self.race_job = self.scheduler.call_every(1 / TICK_RATE, self.poll_race, first=0)
+
+    def leave_race(self):
+        self.scheduler.cancel(self.race_job)
+        self.race_job = None
+        if self.race is not None:
+            self.race.close()
+            self.race = None
+        self.race_button.configure(text="Join Race")
+        self.race_label.pack_forget()
+
+    def poll_race(self):
+        """
+        Scheduler job, TICK_RATE times a second: handle what the server sent
+        and report progress. Progress goes out at most once per tick, not
+        once per keystroke.
+        """
+        if self.race is None:
+            return
+
+        for message in self.race.poll():
+            kind = message.get("type")
+            if kind == "race":
+                # Only join races that start while no test is running
+                if self.start_button.cget("state") == "normal":
+                    self.race_passage = message["passage"]
+                    self.race_duration = message["duration"]
+                    # The server's settings, not ours, describe the race
+                    self.race_settings = (
+                        message.get("text_source", self.text_source_var.get()),
+                        message.get("text_length", self.text_length_var.get()),
+                    )
+                    self.start_test()
+            elif kind in ("standings", "results"):
+                self.race_label.configure(text=format_standings(message, self.profile))
+            elif kind == "closed":
+                self.leave_race()
+                self.result_label.configure(text="Disconnected from the race server")
+                return
+
+        if self.timer_running and self.race_passage is not None:
+            self.race.send_progress(
+                self.scorer.correct, self.calculate_current_wpm(), self.scorer.complete
+            )
+
+    # ======================
+    # TIMER (monotonic test clock, immune to wall-clock changes)
+    # ======================
+
+    def update_timer(self):
+        if not self.timer_running or self.paused:
+            return
+
+        # Round so a tick that lands a hair early still counts its second
+        self.checkpoint.clock(self.scheduler.elapsed(), False)
+        elapsed = int(round(self.scheduler.elapsed(), 2))
+        remaining = max(0, self.test_duration - elapsed)
+        self.time_left = remaining
+        self.timer_label.configure(text=f"⏱ Time Remaining: {remaining}s")
+
+        if remaining == 0:
+            self.check_result()
+
+    # ======================
+    # PAUSE
+    # ======================
+
+    def toggle_pause(self):
+        if not self.timer_running or self.race_passage is not None:
+            return
+
+        self.paused = not self.paused
+        if self.paused:
+            self.pause_button.configure(text="Resume")
+            self.scheduler.pause()
+        else:
+            self.pause_button.configure(text="Pause")
+            self.scheduler.resume()
+        self.checkpoint.clock(self.scheduler.elapsed(), self.paused)
+
+    # ======================
+    # HANDLE TYPING + SOUND
+    # ======================
+
+    def handle_typing(self, event):
+        if not self.timer_running or self.paused:
+            return
+
+        typed = self.input_textbox.get("1.0", "end-1c")
+        start, end = self.scorer.sync(typed)
+        if self.text_stream is not None:
+            start, end = self.extend_stream(start, end)
+        index = self.scorer.position
+        outcome = OTHER
+
+        if event.keysym == "BackSpace":
+            beep(500, 40)
+        elif event.keysym not in (
+            "Return", "Shift_L", "Shift_R",
+            "Control_L", "Control_R", "Alt_L", "Alt_R",
+        ):
+            if index > 0:
+                if self.scorer.is_correct(index - 1):
+                    outcome = CORRECT
+                    beep(800, 30)
+                else:
+                    outcome = INCORRECT
+                    beep(300, 80)
+
+        # When the key went down, and where the typing has got to in the
+        # passage, past any skips
+        elapsed = self.scheduler.elapsed_at(self.event_clock(event.time))
+        row = self.timeline.append(elapsed, event.keysym, self.scorer.cursor, outcome)
+        self.keys_down[event.keycode] = row
+        self.metrics.keystroke(outcome)
+        self.checkpoint.keystroke(elapsed, event.keysym, self.scorer.cursor, outcome, typed)
+
+        self.update_sentence_display(start, end)
+
+        # An endless test only ends when the timer runs out
+        if self.text_stream is None and self.scorer.complete:
+            self.check_result()
+
+    def handle_key_release(self, event):
+        """Fill in the dwell of the keystroke whose key just came up."""
+        if not self.timer_running:
+            return
+        row = self.keys_down.pop(event.keycode, None)
+        if row is None:
+            return
+        elapsed = self.scheduler.elapsed_at(self.event_clock(event.time))
+        self.timeline.release(row, elapsed)
+        self.checkpoint.release(row, elapsed)
+
+    # ======================
+    # UPDATE SENTENCE DISPLAY
+    # ======================
+
+    def render_sentence(self):
+        """Wrap the passage into display lines at the start of a test and show the first."""
+        self.viewport.set_passage(self.current_sentence)
+        self.render_window()
+
+    def render_window(self):
+        """Replace the sentence box contents with the viewport's window, tagged."""
+        self.sentence_textbox.configure(state="normal")
+        self.sentence_textbox.delete("1.0", "end")
+        self.sentence_textbox.insert("1.0", self.viewport.text())
+        self.sentence_textbox.configure(state="disabled")
+        if self.scorer.text:
+            self.retag(*self.viewport.span)
+        if self.ghost is not None:
+            self.show_ghost()
+
+    def extend_stream(self, start, end):
+        """
+        Append more streamed sentences once the cursor is within
+        STREAM_LOOKAHEAD characters of the end, and return the retag range
+        widened to cover anything rescored.
+        """
+        position = self.scorer.cursor
+        if len(self.current_sentence) - position >= STREAM_LOOKAHEAD:
+            return start, end
+
+        more = extend_text(
+            self.current_sentence, self.text_stream, position + STREAM_LOOKAHEAD
+        )
+        more_start, more_end = self.scorer.extend_sentence(more)
+        self.checkpoint.extend(more)
+        self.current_sentence = self.scorer.sentence
+
+        window = self.viewport.first, self.viewport.span
+        self.viewport.extend(self.current_sentence)
+        if (self.viewport.first, self.viewport.span) != window:
+            # The new text reaches into the window
+            self.render_window()
+        if more_start < more_end:
+            return min(start, more_start), max(end, more_end)
+        return start, end
+
+    def update_sentence_display(self, start, end):
+        """
+        Retag the [start, end) range of the passage that changed, or redraw
+        the window if the cursor has moved to another line.
+        """
+        if self.viewport.follow(self.scorer.cursor):
+            self.render_window()
+        else:
+            self.retag(start, end)
+
+    def retag(self, start, end):
+        """Retag the part of [start, end) inside the window."""
+        window_start, window_end = self.viewport.span
+        start = max(start, window_start)
+        end = min(end, window_end)
+        if start >= min(end, len(self.current_sentence)):
+            return
+
+        runs = self.scorer.tag_runs(start, end)
+        index = self.viewport.index
+        first, last = index(start), index(runs[-1][2])
+
+        # Tag changes don't need the widget to be editable
+        self.sentence_textbox.tag_remove("correct", first, last)
+        self.sentence_textbox.tag_remove("incorrect", first, last)
+        for tag, run_start, run_end in runs:
+            if tag:
+                self.sentence_textbox.tag_add(tag, index(run_start), index(run_end))
+
+    # ======================
+    # UPDATE STREAKS
+    # ======================
+
+    def update_streaks(self, wpm, metrics=None):
+        text_source, text_length = self.test_settings
+        session = make_session(
+            wpm,
+            self.scorer.accuracy,
+            self.scheduler.elapsed(),
+            text_source,
+            text_length,
+            profile=self.profile,
+            test_duration=self.test_duration,
+            metrics=metrics,
+        )
+        # The endless mode may have grown the passage since the start
+        self.timeline.passage = self.current_sentence
+        save_timeline(session, self.timeline)
+        self.adaptive.update_from_timeline(self.timeline)
+        self.adaptive.save()
+        self.data = self.db.record_session(self.profile, session)
+        return session
+
+    # ======================
+    # RESULT
+    # ======================
+
+    def check_result(self):
+        if not self.timer_running:
+            return
+
+        self.scheduler.cancel_all()
+        self.checkpoint.clear()
+
+        self.timer_running = False
+        beep(1200, 300)
+
+        final_wpm = self.calculate_current_wpm()
+        elapsed = self.scheduler.elapsed()
+        self.metrics.finish(elapsed, self.scorer.correct)
+        metrics = self.metrics.summary(elapsed)
+        self.wpm_chart.plot(
+            list(self.metrics.wpm_history), list(self.metrics.error_history)
+        )
+
+        if self.race_passage is not None and self.race is not None:
+            self.race.send_progress(
+                self.scorer.correct, final_wpm, finished=self.scorer.complete
+            )
+        self.race_passage = None
+        if self.race is not None:
+            # cancel_all stopped the race poller too; keep listening
+            self.race_job = self.scheduler.call_every(1 / TICK_RATE, self.poll_race)
+
+        self.live_wpm_label.configure(
+            text=f"⌨ Final WPM: {final_wpm:.2f}",
+            text_color="#0055CC",
+        )
+
+        session = self.update_streaks(final_wpm, metrics)
+        if self.instrumentation:
+            self.instrumentation.dump(
+                os.path.join(INSTRUMENTATION_DIR, f"{session['id']}.json"),
+                session=session["id"],
+            )
+
+        result = (
+            f"Typing Speed: {final_wpm:.2f} WPM (raw {metrics['raw_wpm']:.2f})\n"
+            f"Accuracy {metrics['keystroke_accuracy']:.1f}%   "
+            f"Errors {metrics['errors']}   "
+            f"Consistency {metrics['consistency']:.0f}%"
+        )
+        if self.ghost is not None:
+            if final_wpm > self.ghost.wpm:
+                result += f"\nYou beat your ghost ({self.ghost.wpm:.2f} WPM)!"
+            else:
+                result += f"\nYour ghost wins ({self.ghost.wpm:.2f} WPM)"
+        self.result_label.configure(text=result)
+        self.streak_label.configure(text=self.get_streak_text())
+
+        self.input_textbox.configure(state="disabled")
+        self.pause_button.configure(state="disabled")
+        self.start_button.configure(state="normal")
+
+        # Re-enable all settings selectors
+        self.duration_menu.configure(state="normal")
+        self.text_length_menu.configure(state="normal")
+        self.text_source_menu.configure(state="normal")
+        self.profile_menu.configure(state="normal")
+        self.ghost_checkbox.configure(state="normal")
+
+        self.sentence_textbox.configure(state="normal")
+        self.sentence_textbox.delete("1.0", "end")
+        self.sentence_textbox.insert("1.0", "Press Enter or click Start to begin")
+        self.sentence_textbox.configure(state="disabled")
+
@@ -0,0 +1,126 @@
+"""
+Keystroke feedback sounds.
+
+Beeps are played by a background worker so the Tk event loop never waits
+on the sound card. A backend is any callable taking (freq, dur); swap it
+with set_backend(), e.g. for a RecordingBackend in tests.
+"""
+
+import threading
+import time
+from collections import deque
+
+# winsound is Windows-only; fail gracefully on other platforms
+try:
+    import winsound
+    def _winsound_backend(freq, dur):
+        winsound.Beep(freq, dur)
+except ImportError:
+    _winsound_backend = None  # Silent fallback on macOS / Linux
+
+# Beeps still queued after this long are no longer worth playing
+STALE_AFTER = 0.25
+QUEUE_SIZE = 4
+
+
+class RecordingBackend:
+    """Backend that records (freq, dur) calls instead of making a sound."""
+
+    def __init__(self):
+        self.calls = []
+        self.played = threading.Event()
+
+    def __call__(self, freq, dur):
+        self.calls.append((freq, dur))
+        self.played.set()
+
+
+class AudioFeedback:
+    """
+    Plays beeps on a daemon thread from a bounded queue.
+
+    When the typist is faster than the sound, the oldest queued beeps are
+    dropped as new ones arrive, and anything that waited longer than
+    stale_after seconds is skipped rather than played late.
+    """
+
+    def __init__(self, backend, maxsize=QUEUE_SIZE, stale_after=STALE_AFTER):
+        self.backend = backend
+        self.stale_after = stale_after
+        self.dropped = 0
+        self._queue = deque(maxlen=maxsize)
+        self._ready = threading.Condition()
+        self._closed = False
+        self._thread = threading.Thread(
+            target=self._run, name="audio-feedback", daemon=True
+        )
+        self._thread.start()
+
+    def beep(self, freq, dur):
+        """Queue a beep and return immediately."""
+        with self._ready:
+            if self._closed:
+                return
+            if len(self._queue) == self._queue.maxlen:
+                self.dropped += 1
+            self._queue.append((time.monotonic(), freq, dur))
+            self._ready.notify()
+
+    def close(self, timeout=1.0):
+        """Stop the worker, discarding anything still queued."""
+        with self._ready:
+            self._closed = True
+            self._queue.clear()
+            self._ready.notify()
+        self._thread.join(timeout)
+
+    def _run(self):
+        while True:
+            with self._ready:
+                while not self._queue and not self._closed:
+                    self._ready.wait()
+                if self._closed:
+                    return
+                queued_at, freq, dur = self._queue.popleft()
+
+            if time.monotonic() - queued_at > self.stale_after:
+                self.dropped += 1
+                continue
+            try:
+                self.backend(freq, dur)
+            except Exception:
+                # A broken sound device must not take typing down with it
+                pass
+
+
+_feedback = None
+_configured = False
+_lock = threading.Lock()
+
+
+def set_backend(backend):
+    """
+    Replace the sound backend used by beep(). Passing None silences it.
+    Returns the new AudioFeedback, or None when silenced.
+    """
+    global _feedback, _configured
+    with _lock:
+        if _feedback is not None:
+            _feedback.close()
+        _feedback = AudioFeedback(backend) if backend is not None else None
+        _configured = True
+        return _feedback
+
+
+def beep(freq, dur):
+    """Queue a beep on the shared worker, starting it on first use."""
+    global _feedback, _configured
+    if not _configured:
+        with _lock:
+            if not _configured:
+                if _winsound_backend is not None:
+                    _feedback = AudioFeedback(_winsound_backend)
+                _configured = True
+    feedback = _feedback
+    if feedback is not None:
+        feedback.beep(freq, dur)
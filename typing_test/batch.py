@@ -0,0 +1,214 @@
+"""
+Score typed-text submissions in bulk, without the GUI.
+
+    python -m typing_test.batch submissions.jsonl -o results.csv
+    python -m typing_test.batch submissions/ --format jsonl --workers 8
+
+Input is a JSONL file, or a directory of .json (one record each) and
+.jsonl files, read in name order. Each record has "reference", "typed"
+and "elapsed" (seconds), and optionally an "id". Scoring is the GUI's:
+AlignedScorer over the typed text, then calculate_wpm on the correct
+characters. --positional compares character by character instead.
+
+Records are read lazily and sent to a process pool in chunks, with at
+most CHUNKS_PER_WORKER chunks in flight per worker. Results are written
+in input order as each chunk comes back, so only those chunks are ever
+held in memory.
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from .scoring import AlignedScorer, TypingScorer, calculate_wpm
+
+FIELDS = [
+    "id", "wpm", "accuracy", "correct", "errors", "typed_chars",
+    "reference_chars", "elapsed", "complete", "error",
+]
+
+# Records sent to a worker at a time, and chunks in flight per worker
+CHUNK_SIZE = 256
+CHUNKS_PER_WORKER = 4
+
+
+# ======================
+# INPUT
+# ======================
+
+def _iter_jsonl(path, source):
+    with open(path, "r", encoding="utf-8") as f:
+        for number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError as e:
+                record = {"error": f"invalid JSON: {e}"}
+            yield f"{source}:{number}", record
+
+
+def iter_records(path):
+    """Yield (default id, record) for every submission under path."""
+    if not os.path.isdir(path):
+        yield from _iter_jsonl(path, os.path.basename(path))
+        return
+    for name in sorted(os.listdir(path)):
+        full = os.path.join(path, name)
+        if name.endswith(".jsonl"):
+            yield from _iter_jsonl(full, name)
+        elif name.endswith(".json"):
+            try:
+                with open(full, "r", encoding="utf-8") as f:
+                    record = json.load(f)
+            except (OSError, ValueError) as e:
+                record = {"error": f"unreadable: {e}"}
+            yield os.path.splitext(name)[0], record
+
+
+# ======================
+# SCORING
+# ======================
+
+def score_record(default_id, record, positional=False):
+    """Score one submission. Bad records come back with an "error"."""
+    if not isinstance(record, dict):
+        record = {"error": "record is not a JSON object"}
+    result = dict.fromkeys(FIELDS)
+    result["id"] = record.get("id", default_id)
+    if "error" in record:
+        result["error"] = record["error"]
+        return result
+    try:
+        reference = record["reference"]
+        typed = record["typed"]
+        elapsed = float(record["elapsed"])
+    except (KeyError, TypeError, ValueError) as e:
+        result["error"] = f"bad record: {e!r}"
+        return result
+    if not isinstance(reference, str) or not isinstance(typed, str):
+        result["error"] = "reference and typed must be strings"
+        return result
+
+    scorer = (TypingScorer if positional else AlignedScorer)(reference)
+    scorer.sync(typed)
+    result.update(
+        wpm=round(calculate_wpm(scorer.correct, elapsed), 2),
+        accuracy=round(scorer.accuracy, 2),
+        correct=scorer.correct,
+        errors=scorer.errors,
+        typed_chars=len(typed),
+        reference_chars=len(reference),
+        elapsed=elapsed,
+        complete=scorer.complete,
+    )
+    return result
+
+
+def _score_chunk(chunk, positional=False):
+    return [score_record(default_id, record, positional) for default_id, record in chunk]
+
+
+def _chunks(records, size):
+    chunk = []
+    for item in records:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def score_records(records, workers=None, chunk_size=CHUNK_SIZE, positional=False):
+    """
+    Yield the score of every (default id, record), in input order. With
+    workers=1 everything runs in this process.
+    """
+    if workers == 1:
+        for chunk in _chunks(records, chunk_size):
+            yield from _score_chunk(chunk, positional)
+        return
+
+    workers = workers or os.cpu_count() or 1
+    limit = CHUNKS_PER_WORKER * workers
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for chunk in _chunks(records, chunk_size):
+            pending.append(pool.submit(_score_chunk, chunk, positional))
+            # Wait on the oldest chunk before reading further ahead
+            if len(pending) >= limit:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+# ======================
+# OUTPUT
+# ======================
+
+class _CsvWriter:
+    def __init__(self, out):
+        self.writer = csv.DictWriter(out, fieldnames=FIELDS)
+        self.writer.writeheader()
+
+    def write(self, result):
+        self.writer.writerow(result)
+
+
+class _JsonlWriter:
+    def __init__(self, out):
+        self.out = out
+
+    def write(self, result):
+        self.out.write(json.dumps(result, separators=(",", ":")) + "\n")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m typing_test.batch",
+        description="Score typed-text submissions across a process pool.",
+    )
+    parser.add_argument("input", help="JSONL file, or directory of .json/.jsonl files")
+    parser.add_argument("-o", "--output", default="-", help="output file (default: stdout)")
+    parser.add_argument(
+        "--format", choices=["csv", "jsonl"],
+        help="output format (default: from the output file name, else csv)",
+    )
+    parser.add_argument("--workers", type=int, default=None, help="worker processes")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    parser.add_argument(
+        "--positional", action="store_true",
+        help="compare characters by position instead of aligning them",
+    )
+    args = parser.parse_args(argv)
+
+    fmt = args.format or ("jsonl" if args.output.endswith(".jsonl") else "csv")
+    out = sys.stdout if args.output == "-" else open(
+        args.output, "w", encoding="utf-8", newline=""
+    )
+    try:
+        writer = (_JsonlWriter if fmt == "jsonl" else _CsvWriter)(out)
+        scored = failed = 0
+        for result in score_records(
+            iter_records(args.input), workers=args.workers,
+            chunk_size=args.chunk_size, positional=args.positional,
+        ):
+            writer.write(result)
+            scored += 1
+            if result["error"]:
+                failed += 1
+        out.flush()
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    print(f"scored {scored} records, {failed} with errors", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,167 @@
+"""
+WPM charts on a Tk canvas.
+
+LineChart draws the live chart one segment per tick. Once the chart is
+full, new segments push the line left with a single canvas move, and the
+oldest segment is deleted. A sample above the current scale rescales the
+line with a single canvas scale. Neither redraws anything.
+
+Whole series, such as a finished test or the session history, are
+reduced to a fixed number of points with LTTB
+(Largest-Triangle-Three-Buckets) before being drawn.
+
+Nothing here imports tkinter; the canvas is passed in.
+"""
+
+from collections import deque
+
+# Points drawn for a whole series
+CHART_POINTS = 120
+# Smallest top of the WPM scale
+MIN_SCALE = 60.0
+
+
+def lttb(xs, ys, threshold):
+    """
+    Indices of at most threshold points of (xs, ys) that keep its shape,
+    by Largest-Triangle-Three-Buckets. The first and last points are kept.
+    """
+    n = len(xs)
+    if threshold >= n or threshold < 3:
+        return list(range(n))
+
+    every = (n - 2) / (threshold - 2)
+    kept = [0]
+    a = 0
+    for bucket in range(threshold - 2):
+        start = int(bucket * every) + 1
+        end = int((bucket + 1) * every) + 1
+        # Average of the next bucket, the third corner of each triangle
+        next_start = end
+        next_end = min(int((bucket + 2) * every) + 1, n)
+        if next_start >= n - 1:
+            avg_x, avg_y = xs[n - 1], ys[n - 1]
+        else:
+            count = next_end - next_start
+            avg_x = sum(xs[next_start:next_end]) / count
+            avg_y = sum(ys[next_start:next_end]) / count
+
+        ax, ay = xs[a], ys[a]
+        best, best_area = start, -1.0
+        for i in range(start, min(end, n - 1)):
+            area = abs((ax - avg_x) * (ys[i] - ay) - (ax - xs[i]) * (avg_y - ay))
+            if area > best_area:
+                best, best_area = i, area
+        kept.append(best)
+        a = best
+    kept.append(n - 1)
+    return kept
+
+
+def bucket_sums(values, buckets):
+    """Sum values into at most buckets equal runs, for bar charts."""
+    n = len(values)
+    if n <= buckets:
+        return list(values)
+    every = n / buckets
+    return [
+        sum(values[int(b * every):int((b + 1) * every)]) for b in range(buckets)
+    ]
+
+
+class LineChart:
+    """A WPM line on a canvas, with room for capacity samples across."""
+
+    TAG = "series"
+
+    def __init__(self, canvas, width, height, capacity=CHART_POINTS, pad=4,
+                 color="#1F6AA5"):
+        self.canvas = canvas
+        self.width = width
+        self.height = height
+        self.pad = pad
+        self.color = color
+        self.reset(capacity)
+
+    def reset(self, capacity=None):
+        if capacity is not None:
+            self.capacity = max(2, capacity)
+        self.canvas.delete("all")
+        self.scale = MIN_SCALE
+        self.segments = deque()
+        self.count = 0
+        self._last = None
+
+    @property
+    def _dx(self):
+        return (self.width - 2 * self.pad) / (self.capacity - 1)
+
+    def _y(self, value):
+        bottom = self.height - self.pad
+        return bottom - min(value, self.scale) / self.scale * (bottom - self.pad)
+
+    def _rescale(self, value):
+        """Raise the top of the scale to fit value, squashing what is drawn."""
+        new = max(value * 1.25, MIN_SCALE)
+        self.canvas.scale(self.TAG, 0, self.height - self.pad, 1, self.scale / new)
+        self.scale = new
+        if self._last is not None:
+            self._last = (self._last[0], self._y(self._last[2]), self._last[2])
+
+    # ======================
+    # LIVE
+    # ======================
+
+    def append(self, value):
+        """Add one sample, drawing just the segment that reaches it."""
+        if value > self.scale:
+            self._rescale(value)
+        if self.count >= self.capacity:
+            # Full: slide everything left one step and drop the oldest
+            self.canvas.move(self.TAG, -self._dx, 0)
+            self.canvas.delete(self.segments.popleft())
+            x = self.pad + (self.capacity - 1) * self._dx
+            self._last = (self._last[0] - self._dx, self._last[1], self._last[2])
+        else:
+            x = self.pad + self.count * self._dx
+        y = self._y(value)
+        if self._last is not None:
+            self.segments.append(self.canvas.create_line(
+                self._last[0], self._last[1], x, y,
+                fill=self.color, width=2, tags=self.TAG,
+            ))
+        self._last = (x, y, value)
+        self.count += 1
+
+    # ======================
+    # WHOLE SERIES
+    # ======================
+
+    def plot(self, values, errors=None, points=CHART_POINTS):
+        """Draw a whole series at once, downsampled to points, with error bars."""
+        self.reset()
+        n = len(values)
+        if n < 2:
+            return
+        xs = list(range(n))
+        kept = lttb(xs, values, points)
+        self.scale = max(MIN_SCALE, max(values) * 1.25)
+        span = (self.width - 2 * self.pad) / (n - 1)
+
+        if errors:
+            sums = bucket_sums(errors, points)
+            worst = max(sums) or 1
+            bar = (self.width - 2 * self.pad) / len(sums)
+            bottom = self.height - self.pad
+            for b, total in enumerate(sums):
+                if total:
+                    x = self.pad + b * bar
+                    self.canvas.create_rectangle(
+                        x, bottom - total / worst * (self.height / 3), x + max(1, bar - 1),
+                        bottom, fill="#E8A0A0", outline="", tags=self.TAG,
+                    )
+
+        coords = []
+        for i in kept:
+            coords += [self.pad + xs[i] * span, self._y(values[i])]
+        self.canvas.create_line(*coords, fill=self.color, width=2, tags=self.TAG)
@@ -0,0 +1,208 @@
+"""
+Crash-safe checkpoint of the test in progress.
+
+The checkpoint is an append-only log of JSON lines. A "begin" line holds
+the passage and settings, and is followed by one line per keystroke, key
+release, passage extension or clock change:
+
+    {"begin": {"passage": ..., "text_source": ..., "test_duration": ...}}
+    {"k": [ms, keysym, position, outcome, offset, removed, inserted]}
+    {"r": [index, ms]}
+    {"more": "text appended to the passage"}
+    {"clock": [ms, paused]}
+
+A keystroke line carries the change it made to the typed text. Replaying
+the lines rebuilds the text, the timeline and the clock.
+
+The Tk thread only encodes a line and queues it. A background thread
+appends what is queued and fsyncs it FLUSH_INTERVAL seconds later, so
+the Tk loop never waits on the disk. A crash loses at most that much
+typing. A torn last line is ignored on load.
+"""
+
+import json
+import os
+import threading
+
+from .scoring import _common_prefix_length
+
+CHECKPOINT_FILE = "checkpoint.jsonl"
+# Seconds between flushes to disk
+FLUSH_INTERVAL = 0.25
+
+
+class CheckpointWriter:
+    """
+    Write-behind checkpoint log, fed from the Tk thread.
+
+    - begin() starts a new test, replacing the previous checkpoint
+    - keystroke(), release(), extend() and clock() add to it
+    - clear() deletes it once the test has ended
+    - close() flushes what is left and stops the thread
+    """
+
+    def __init__(self, path=None, interval=FLUSH_INTERVAL):
+        self.path = path or CHECKPOINT_FILE
+        self.interval = interval
+        self.active = False
+        self._text = ""
+        self._pending = []
+        self._truncate = False
+        self._remove = False
+        self._lock = threading.Lock()
+        self._closed = threading.Event()
+        self._file = None
+        self._thread = threading.Thread(target=self._run, name="checkpoint", daemon=True)
+        self._thread.start()
+
+    # ======================
+    # TK THREAD
+    # ======================
+
+    def _queue(self, entry):
+        line = json.dumps(entry, separators=(",", ":")) + "\n"
+        with self._lock:
+            self._pending.append(line)
+
+    def begin(self, passage, **settings):
+        self.active = True
+        self._text = ""
+        line = json.dumps({"begin": dict(settings, passage=passage)}) + "\n"
+        with self._lock:
+            # Anything still queued belongs to the previous test
+            self._pending = [line]
+            self._truncate = True
+            self._remove = False
+
+    def keystroke(self, elapsed, keysym, position, outcome, text):
+        """Log one keystroke and how it changed the typed text, now text."""
+        if not self.active:
+            return
+        old = self._text
+        offset = _common_prefix_length(old, text)
+        self._text = text
+        self._queue({"k": [
+            int(elapsed * 1000), keysym, position, outcome,
+            offset, len(old) - offset, text[offset:],
+        ]})
+
+    def release(self, index, elapsed):
+        """Log that keystroke number index's key came up."""
+        if self.active:
+            self._queue({"r": [index, int(elapsed * 1000)]})
+
+    def extend(self, more):
+        if self.active and more:
+            self._queue({"more": more})
+
+    def clock(self, elapsed, paused):
+        if self.active:
+            self._queue({"clock": [int(elapsed * 1000), paused]})
+
+    def clear(self):
+        self.active = False
+        with self._lock:
+            self._pending = []
+            self._truncate = False
+            self._remove = True
+
+    def close(self):
+        self._closed.set()
+        self._thread.join()
+
+    # ======================
+    # WRITER THREAD
+    # ======================
+
+    def _run(self):
+        while True:
+            closing = self._closed.wait(self.interval)
+            try:
+                self._flush()
+            except OSError:
+                # A full or read-only disk costs the checkpoint, not the test
+                self._close_file()
+            if closing:
+                self._close_file()
+                return
+
+    def _flush(self):
+        with self._lock:
+            lines, self._pending = self._pending, []
+            truncate, self._truncate = self._truncate, False
+            remove, self._remove = self._remove, False
+
+        if remove:
+            self._close_file()
+            try:
+                os.remove(self.path)
+            except FileNotFoundError:
+                pass
+        if truncate:
+            self._close_file()
+            self._file = open(self.path, "w", encoding="utf-8")
+        if lines and self._file is not None:
+            self._file.writelines(lines)
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    def _close_file(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class Checkpoint:
+    """A test read back from a checkpoint log."""
+
+    def __init__(self, settings, passage):
+        self.settings = settings
+        self.passage = passage
+        # (seconds, keysym, position, outcome, offset, removed, inserted)
+        self.keystrokes = []
+        # (keystroke index, seconds)
+        self.releases = []
+        self.elapsed = 0.0
+        self.paused = False
+
+    def replay(self):
+        """(seconds, keysym, position, outcome, typed text) after each keystroke."""
+        text = ""
+        for seconds, keysym, position, outcome, offset, removed, inserted in self.keystrokes:
+            text = text[:offset] + inserted + text[offset + removed:]
+            yield seconds, keysym, position, outcome, text
+
+
+def load_checkpoint(path=None):
+    """The test in an unfinished checkpoint, or None if there isn't one."""
+    try:
+        f = open(path or CHECKPOINT_FILE, encoding="utf-8")
+    except OSError:
+        return None
+
+    checkpoint = None
+    with f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                # Torn by a crash mid-write; nothing after it was flushed
+                break
+            if "begin" in entry:
+                settings = dict(entry["begin"])
+                checkpoint = Checkpoint(settings, settings.pop("passage"))
+            elif checkpoint is None:
+                break
+            elif "k" in entry:
+                seconds = entry["k"][0] / 1000
+                checkpoint.keystrokes.append((seconds, *entry["k"][1:]))
+                checkpoint.elapsed = max(checkpoint.elapsed, seconds)
+            elif "r" in entry:
+                index, ms = entry["r"]
+                checkpoint.releases.append((index, ms / 1000))
+            elif "more" in entry:
+                checkpoint.passage += entry["more"]
+            elif "clock" in entry:
+                ms, checkpoint.paused = entry["clock"]
+                checkpoint.elapsed = max(checkpoint.elapsed, ms / 1000)
+    return checkpoint
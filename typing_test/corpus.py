@@ -0,0 +1,200 @@
+"""
+External text corpus as a test text source.
+
+The corpus file is memory-mapped, never read into memory. The first time
+it is used, one pass over it finds the paragraphs (runs of text between
+blank lines) and buckets them by length into the text length modes. The
+(offset, length) of each goes into a persistent index file next to the
+corpus. That index is memory-mapped too, so fetching a random passage is
+one index lookup and one slice of the corpus.
+Where the index can't be written, such as next to a read-only corpus,
+it is kept in memory for the session instead.
+"""
+
+import mmap
+import os
+import random
+import re
+import struct
+import sys
+import threading
+from array import array
+
+from .storage import atomic_write_bytes
+
+ENV_VAR = "TYPING_TEST_CORPUS"
+
+# Passage lengths, in bytes, for each text length mode
+LENGTH_CLASSES = {
+    "Short Sentence": (20, 200),
+    "Paragraph": (200, 800),
+    "Long Text": (800, 3000),
+}
+_MODES = list(LENGTH_CLASSES)
+
+_MAGIC = b"TCI1"
+# magic, corpus size, corpus mtime_ns, then a passage count per mode
+_HEADER = struct.Struct("<4sQQ" + "Q" * len(_MODES))
+# After the header, per mode: every passage's offset (u64), then every
+# passage's length (u32), little-endian
+_OFFSET = struct.Struct("<Q")
+_LENGTH = struct.Struct("<I")
+_SWAP = sys.byteorder == "big"
+_BLANK_LINE = re.compile(rb"\n[ \t\r\f\v]*\n")
+
+
+def corpus_from_env():
+    """The Corpus named by TYPING_TEST_CORPUS, or None if it isn't set."""
+    path = os.environ.get(ENV_VAR)
+    if path and os.path.isfile(path):
+        return Corpus(path)
+    return None
+
+
+def _classify(length):
+    for i, mode in enumerate(_MODES):
+        low, high = LENGTH_CLASSES[mode]
+        if low <= length < high:
+            return i
+    return None
+
+
+class Corpus:
+    """A memory-mapped corpus file with a persistent passage index."""
+
+    def __init__(self, path, index_path=None):
+        self.path = path
+        self.index_path = index_path or path + ".idx"
+        self._lock = threading.Lock()
+        self._corpus = None
+        self._index = None
+        self._counts = None
+        # Why the corpus couldn't be opened, so it isn't retried every time
+        self._error = None
+
+    # ======================
+    # INDEX
+    # ======================
+
+    def _stat(self):
+        st = os.stat(self.path)
+        return st.st_size, st.st_mtime_ns
+
+    def _index_is_current(self):
+        try:
+            with open(self.index_path, "rb") as f:
+                header = f.read(_HEADER.size)
+        except OSError:
+            return False
+        if len(header) != _HEADER.size:
+            return False
+        magic, size, mtime_ns, *_ = _HEADER.unpack(header)
+        return magic == _MAGIC and (size, mtime_ns) == self._stat()
+
+    def build_index(self):
+        """Scan the corpus once and write the passage index."""
+        atomic_write_bytes(self.index_path, self._scan())
+
+    def _scan(self):
+        """The passage index of the corpus as it is now."""
+        size, mtime_ns = self._stat()
+        offsets = [array("Q") for _ in _MODES]
+        lengths = [array("I") for _ in _MODES]
+
+        if size:
+            with open(self.path, "rb") as f, \
+                    mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                start = 0
+                for match in _BLANK_LINE.finditer(mm):
+                    self._add(mm, start, match.start(), offsets, lengths)
+                    start = match.end()
+                self._add(mm, start, size, offsets, lengths)
+
+        parts = [_HEADER.pack(_MAGIC, size, mtime_ns, *(len(o) for o in offsets))]
+        for column in (c for pair in zip(offsets, lengths) for c in pair):
+            if _SWAP:
+                column.byteswap()
+            parts.append(column.tobytes())
+        return b"".join(parts)
+
+    @staticmethod
+    def _add(mm, start, end, offsets, lengths):
+        # Trim surrounding whitespace without copying the paragraph
+        while start < end and mm[start] in b" \t\r\n\f\v":
+            start += 1
+        while end > start and mm[end - 1] in b" \t\r\n\f\v":
+            end -= 1
+        bucket = _classify(end - start)
+        if bucket is not None:
+            offsets[bucket].append(start)
+            lengths[bucket].append(end - start)
+
+    def open(self):
+        """Map the corpus and its index, building the index if needed."""
+        with self._lock:
+            if self._index is not None:
+                return
+            if self._error is not None:
+                raise self._error
+            try:
+                self._open()
+            except OSError as e:
+                self._error = e
+                raise
+
+    def _open(self):
+        if self._index_is_current():
+            with open(self.index_path, "rb") as f:
+                index = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            index = self._scan()
+            try:
+                atomic_write_bytes(self.index_path, index)
+            except OSError:
+                # Such as a read-only corpus directory; the copy in memory
+                # serves this session
+                pass
+        with open(self.path, "rb") as f:
+            self._corpus = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) \
+                if os.fstat(f.fileno()).st_size else b""
+        self._counts = list(_HEADER.unpack_from(index)[3:])
+        self._index = index
+
+    def close(self):
+        with self._lock:
+            for m in (self._corpus, self._index):
+                if isinstance(m, mmap.mmap):
+                    m.close()
+            self._corpus = self._index = self._counts = None
+
+    def counts(self):
+        """Number of indexed passages per text length mode."""
+        self.open()
+        return dict(zip(_MODES, self._counts))
+
+    # ======================
+    # PASSAGES
+    # ======================
+
+    def passage(self, mode, rng=random):
+        """A random passage for the mode, with its whitespace collapsed."""
+        self.open()
+        bucket = _MODES.index(mode) if mode in LENGTH_CLASSES else 0
+        # Fall back to the nearest length class that has passages
+        candidates = sorted(range(len(_MODES)), key=lambda b: abs(b - bucket))
+        for b in candidates:
+            if self._counts[b]:
+                bucket = b
+                break
+        else:
+            raise ValueError(f"{self.path} has no usable passages")
+
+        entry_size = _OFFSET.size + _LENGTH.size
+        base = _HEADER.size + entry_size * sum(self._counts[:bucket])
+        i = rng.randrange(self._counts[bucket])
+        (offset,) = _OFFSET.unpack_from(self._index, base + _OFFSET.size * i)
+        (length,) = _LENGTH.unpack_from(
+            self._index, base + _OFFSET.size * self._counts[bucket] + _LENGTH.size * i
+        )
+        raw = self._corpus[offset:offset + length]
+        return " ".join(raw.decode("utf-8", errors="replace").split())
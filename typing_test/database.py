@@ -0,0 +1,512 @@
+"""
+Multi-profile stats database.
+
+Sessions from every profile go into one SQLite file, with indexes for the
+queries the app runs:
+- a profile's sessions in time order (streak replays)
+- a profile's best run per text length and test duration (ghosts)
+
+Each profile's streak fields are kept in their own row, folded forward by
+update_streaks() in the same transaction that inserts the session. Bulk
+writes go through executemany() in transactions of BATCH_SIZE rows.
+
+Session counts, WPM totals and bests are also kept per profile, per day,
+per week and overall, both per (text length, test duration) and across
+all of them. record_session() upserts these in the same transaction, so
+the streak panel, personal bests and leaderboard read a few rows instead
+of scanning history. If they ever drift, rebuild them from the sessions
+with:
+
+    python -m typing_test.rebuild
+"""
+
+import getpass
+import os
+import sqlite3
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+
+from .storage import (
+    DATA_FILE,
+    HISTORY_FILE,
+    _default_data,
+    iter_sessions,
+    load_data,
+    update_streaks,
+)
+
+DATABASE_FILE = "typing_stats.db"
+PROFILE_ENV_VAR = "TYPING_TEST_PROFILE"
+
+# Sessions written per transaction by bulk imports
+BATCH_SIZE = 5000
+
+# Aggregate periods; a week is keyed by the date of its Monday
+DAY, WEEK, ALL_TIME = "day", "week", "all"
+# The (text length, test duration) of aggregates over every mode
+ALL_MODES = ("*", 0)
+
+_STREAK_FIELDS = tuple(_default_data())
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS profiles (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    created TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS sessions (
+    id TEXT PRIMARY KEY,
+    profile_id INTEGER NOT NULL REFERENCES profiles(id),
+    timestamp TEXT NOT NULL,
+    day TEXT NOT NULL,
+    wpm REAL NOT NULL,
+    accuracy REAL,
+    duration REAL,
+    test_duration INTEGER,
+    text_source TEXT,
+    text_length TEXT,
+    timeline TEXT,
+    raw_wpm REAL,
+    consistency REAL,
+    errors INTEGER
+);
+CREATE INDEX IF NOT EXISTS sessions_by_profile
+    ON sessions(profile_id, timestamp);
+CREATE INDEX IF NOT EXISTS sessions_best
+    ON sessions(profile_id, text_length, test_duration, wpm);
+CREATE TABLE IF NOT EXISTS streaks (
+    profile_id INTEGER PRIMARY KEY REFERENCES profiles(id),
+    daily_streak INTEGER NOT NULL,
+    last_practice_date TEXT NOT NULL,
+    improvement_streak INTEGER NOT NULL,
+    personal_best_streak INTEGER NOT NULL,
+    best_wpm REAL NOT NULL,
+    last_wpm REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS aggregates (
+    profile_id INTEGER NOT NULL REFERENCES profiles(id),
+    period TEXT NOT NULL,
+    period_start TEXT NOT NULL,
+    text_length TEXT NOT NULL,
+    test_duration INTEGER NOT NULL,
+    sessions INTEGER NOT NULL,
+    wpm_total REAL NOT NULL,
+    best_wpm REAL NOT NULL,
+    PRIMARY KEY (profile_id, period, period_start, text_length, test_duration)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS aggregates_board
+    ON aggregates(period, period_start, text_length, test_duration, best_wpm);
+"""
+
+_UPSERT_AGGREGATE = """
+INSERT INTO aggregates VALUES (?, ?, ?, ?, ?, 1, ?, ?)
+ON CONFLICT DO UPDATE SET
+    sessions = sessions + 1,
+    wpm_total = wpm_total + excluded.wpm_total,
+    best_wpm = MAX(best_wpm, excluded.best_wpm)
+"""
+
+# The same grouping as _aggregate_rows(), over stored sessions; {where}
+# is empty or picks one profile
+_REBUILD_AGGREGATES = """
+INSERT INTO aggregates
+SELECT profile_id, period, period_start, text_length, test_duration,
+       COUNT(*), SUM(wpm), MAX(wpm)
+FROM (
+    SELECT profile_id, wpm, periods.period,
+           CASE periods.period
+               WHEN 'day' THEN day
+               WHEN 'week' THEN date(day, '-' || ((strftime('%w', day) + 6) % 7) || ' days')
+               ELSE ''
+           END AS period_start,
+           CASE WHEN modes.every THEN '*' ELSE COALESCE(text_length, '') END AS text_length,
+           CASE WHEN modes.every THEN 0 ELSE COALESCE(test_duration, 0) END AS test_duration
+    FROM sessions,
+         (SELECT 'day' AS period UNION ALL SELECT 'week' UNION ALL SELECT 'all') AS periods,
+         (SELECT 0 AS every UNION ALL SELECT 1) AS modes
+    {where}
+)
+GROUP BY profile_id, period, period_start, text_length, test_duration
+"""
+
+
+_PLACEHOLDERS = ", ".join("?" * 14)
+
+
+def default_profile():
+    """TYPING_TEST_PROFILE if set, else the login name, else "default"."""
+    name = os.environ.get(PROFILE_ENV_VAR)
+    if name:
+        return name
+    try:
+        return getpass.getuser() or "default"
+    except Exception:
+        return "default"
+
+
+def _week_start(day):
+    """The Monday of day's week, as YYYY-MM-DD."""
+    return (day - timedelta(days=day.weekday())).isoformat()
+
+
+def _mode(text_length, test_duration):
+    return text_length or "", test_duration or 0
+
+
+def _aggregate_rows(profile_id, session, day):
+    """One upsert row per aggregate that session counts towards."""
+    wpm = session["wpm"]
+    periods = (
+        (DAY, day.isoformat()),
+        (WEEK, _week_start(day)),
+        (ALL_TIME, ""),
+    )
+    modes = (_mode(session.get("text_length"), session.get("test_duration")), ALL_MODES)
+    return [
+        (profile_id, period, start, text_length, test_duration, wpm, wpm)
+        for period, start in periods
+        for text_length, test_duration in modes
+    ]
+
+
+def _session_row(profile_id, session):
+    timestamp = session["timestamp"]
+    return (
+        session["id"],
+        profile_id,
+        timestamp,
+        timestamp[:10],
+        session["wpm"],
+        session.get("accuracy"),
+        session.get("duration"),
+        session.get("test_duration"),
+        session.get("text_source"),
+        session.get("text_length"),
+        session.get("timeline"),
+        session.get("raw_wpm"),
+        session.get("consistency"),
+        session.get("errors"),
+    )
+
+
+class StatsDatabase:
+    """Profiles, their sessions and streaks in one SQLite database."""
+
+    def __init__(self, path=None):
+        self.path = path or DATABASE_FILE
+        # Several processes may share the file, so wait out each other's
+        # writes. Autocommit mode: transaction() opens every write itself.
+        self.conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA foreign_keys=ON")
+        self.conn.executescript(_SCHEMA)
+        self._profile_ids = {}
+
+    def close(self):
+        self.conn.close()
+
+    @contextmanager
+    def transaction(self):
+        """Run the block as one write transaction, rolled back on error."""
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield self.conn
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+        self.conn.execute("COMMIT")
+
+    # ======================
+    # PROFILES
+    # ======================
+
+    def profiles(self):
+        rows = self.conn.execute("SELECT name FROM profiles ORDER BY name")
+        return [row["name"] for row in rows]
+
+    def profile_id(self, name):
+        """The id of the named profile, creating it if needed."""
+        profile_id = self._profile_ids.get(name)
+        if profile_id is not None:
+            return profile_id
+        row = self.conn.execute(
+            "SELECT id FROM profiles WHERE name = ?", (name,)
+        ).fetchone()
+        if row is None:
+            with self.transaction() as conn:
+                conn.execute(
+                    "INSERT OR IGNORE INTO profiles (name, created) VALUES (?, ?)",
+                    (name, datetime.now().isoformat(timespec="seconds")),
+                )
+            row = self.conn.execute(
+                "SELECT id FROM profiles WHERE name = ?", (name,)
+            ).fetchone()
+        profile_id = self._profile_ids[name] = row["id"]
+        return profile_id
+
+    # ======================
+    # STREAKS
+    # ======================
+
+    def streaks(self, profile):
+        """The profile's streak fields, in the same shape as load_data()."""
+        return self._load_streaks(self.conn, self.profile_id(profile))
+
+    def _load_streaks(self, conn, profile_id):
+        row = conn.execute(
+            "SELECT * FROM streaks WHERE profile_id = ?", (profile_id,)
+        ).fetchone()
+        if row is None:
+            return _default_data()
+        return {field: row[field] for field in _STREAK_FIELDS}
+
+    def _save_streaks(self, conn, profile_id, data):
+        conn.execute(
+            "INSERT OR REPLACE INTO streaks (profile_id, %s) VALUES (?%s)"
+            % (", ".join(_STREAK_FIELDS), ", ?" * len(_STREAK_FIELDS)),
+            (profile_id, *(data[field] for field in _STREAK_FIELDS)),
+        )
+
+    def rebuild_streaks(self, profile):
+        """Recompute a profile's streak fields by replaying its sessions."""
+        profile_id = self.profile_id(profile)
+        data = _default_data()
+        with self.transaction() as conn:
+            rows = conn.execute(
+                "SELECT day, wpm FROM sessions WHERE profile_id = ? ORDER BY timestamp",
+                (profile_id,),
+            )
+            for row in rows:
+                update_streaks(data, row["wpm"], today=date.fromisoformat(row["day"]))
+            self._save_streaks(conn, profile_id, data)
+        return data
+
+    # ======================
+    # SESSIONS
+    # ======================
+
+    def record_session(self, profile, session):
+        """
+        Insert one finished session and fold it into the profile's streaks,
+        in a single transaction. Returns the updated streak fields.
+        """
+        profile_id = self.profile_id(profile)
+        when = datetime.fromisoformat(session["timestamp"]).date()
+        with self.transaction() as conn:
+            data = self._load_streaks(conn, profile_id)
+            update_streaks(data, session["wpm"], today=when)
+            conn.execute(
+                "INSERT INTO sessions VALUES (%s)" % _PLACEHOLDERS,
+                _session_row(profile_id, session),
+            )
+            conn.executemany(
+                _UPSERT_AGGREGATE, _aggregate_rows(profile_id, session, when)
+            )
+            self._save_streaks(conn, profile_id, data)
+        return data
+
+    def record_sessions(self, sessions, profile=None):
+        """
+        Bulk-insert session records, BATCH_SIZE per transaction. Records
+        carrying a "profile" go to it, the rest to profile. Sessions already
+        stored are skipped. Streaks and aggregates of the touched profiles
+        are rebuilt once at the end. Returns the number of sessions inserted.
+        """
+        profile = profile or default_profile()
+        touched = set()
+        inserted = 0
+        batch = []
+
+        def flush():
+            nonlocal inserted
+            with self.transaction() as conn:
+                before = conn.total_changes
+                conn.executemany(
+                    "INSERT OR IGNORE INTO sessions VALUES (%s)" % _PLACEHOLDERS,
+                    batch,
+                )
+                inserted += conn.total_changes - before
+            batch.clear()
+
+        for session in sessions:
+            name = session.get("profile") or profile
+            touched.add(name)
+            batch.append(_session_row(self.profile_id(name), session))
+            if len(batch) >= BATCH_SIZE:
+                flush()
+        if batch:
+            flush()
+
+        for name in touched:
+            self.rebuild_streaks(name)
+            self.rebuild_aggregates(name)
+        return inserted
+
+    def import_history(self, history_file=None, profile=None):
+        """Copy a session history log into the database."""
+        return self.record_sessions(iter_sessions(history_file), profile)
+
+    def import_legacy(self, profile, history_file=None, data_file=None):
+        """
+        Bring the files of an install from before the database into
+        profile: the session history log, then the streak file. The streak
+        file can predate the log and so know more than it, which is why it
+        wins. Returns the number of sessions imported.
+        """
+        history_file = history_file or HISTORY_FILE
+        data_file = data_file or DATA_FILE
+        inserted = 0
+        if os.path.exists(history_file):
+            inserted = self.import_history(history_file, profile)
+        if os.path.exists(data_file):
+            legacy = load_data(data_file, history_file)
+            data = _default_data()
+            data.update((field, legacy[field]) for field in _STREAK_FIELDS if field in legacy)
+            profile_id = self.profile_id(profile)
+            with self.transaction() as conn:
+                self._save_streaks(conn, profile_id, data)
+        return inserted
+
+    def session_count(self):
+        return self.conn.execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+
+    def has_sessions(self):
+        return self.conn.execute("SELECT 1 FROM sessions LIMIT 1").fetchone() is not None
+
+    # ======================
+    # AGGREGATES
+    # ======================
+
+    def rebuild_aggregates(self, profile=None):
+        """Recompute the aggregates of profile, or of every profile, from its sessions."""
+        profile_id = None if profile is None else self.profile_id(profile)
+        with self.transaction() as conn:
+            if profile_id is None:
+                conn.execute("DELETE FROM aggregates")
+                conn.execute(_REBUILD_AGGREGATES.format(where=""))
+            else:
+                conn.execute("DELETE FROM aggregates WHERE profile_id = ?", (profile_id,))
+                conn.execute(
+                    _REBUILD_AGGREGATES.format(where="WHERE profile_id = ?"), (profile_id,)
+                )
+
+    def aggregate(self, profile, period, text_length=None, test_duration=None, when=None):
+        """
+        Sessions, average and best WPM of profile over the period (DAY, WEEK
+        or ALL_TIME) containing when, for one mode or, by default, all modes.
+        """
+        when = when or date.today()
+        start = {DAY: when.isoformat(), WEEK: _week_start(when), ALL_TIME: ""}[period]
+        mode = ALL_MODES if text_length is None else _mode(text_length, test_duration)
+        row = self.conn.execute(
+            """
+            SELECT sessions, wpm_total, best_wpm FROM aggregates
+            WHERE profile_id = ? AND period = ? AND period_start = ?
+                  AND text_length = ? AND test_duration = ?
+            """,
+            (self.profile_id(profile), period, start, *mode),
+        ).fetchone()
+        if row is None:
+            return {"sessions": 0, "average": 0.0, "best": 0.0}
+        return {
+            "sessions": row["sessions"],
+            "average": row["wpm_total"] / row["sessions"],
+            "best": row["best_wpm"],
+        }
+
+    # ======================
+    # QUERIES
+    # ======================
+
+    def personal_bests(self, profile):
+        """The profile's best WPM per (text length, test duration)."""
+        rows = self.conn.execute(
+            """
+            SELECT text_length, test_duration, best_wpm AS wpm, sessions
+            FROM aggregates
+            WHERE profile_id = ? AND period = 'all' AND text_length != '*'
+            ORDER BY text_length, test_duration
+            """,
+            (self.profile_id(profile),),
+        )
+        return [dict(row) for row in rows]
+
+    def wpm_history(self, profile):
+        """The profile's WPM per session, oldest first."""
+        rows = self.conn.execute(
+            "SELECT wpm FROM sessions WHERE profile_id = ? ORDER BY timestamp",
+            (self.profile_id(profile),),
+        )
+        return [row[0] for row in rows]
+
+    def timeline_sessions(self, profile):
+        """The profile's sessions that recorded a timeline, oldest first."""
+        rows = self.conn.execute(
+            """
+            SELECT id, timeline FROM sessions
+            WHERE profile_id = ? AND timeline IS NOT NULL
+            ORDER BY timestamp
+            """,
+            (self.profile_id(profile),),
+        )
+        return [dict(row) for row in rows]
+
+    def best_session(self, profile, text_length, test_duration):
+        """The profile's fastest session with a recorded timeline, or None."""
+        row = self.conn.execute(
+            """
+            SELECT * FROM sessions
+            WHERE profile_id = ? AND text_length = ? AND test_duration IS ?
+                  AND timeline IS NOT NULL
+            ORDER BY wpm DESC
+            LIMIT 1
+            """,
+            (self.profile_id(profile), text_length, test_duration),
+        ).fetchone()
+        return None if row is None else dict(row)
+
+    def daily_leaderboard(self, text_length, test_duration, day=None, limit=10):
+        """Each profile's best WPM on day for one text length and duration."""
+        day = day or datetime.now().strftime("%Y-%m-%d")
+        rows = self.conn.execute(
+            """
+            SELECT profiles.name AS profile, aggregates.best_wpm AS wpm,
+                   aggregates.sessions
+            FROM aggregates JOIN profiles ON profiles.id = aggregates.profile_id
+            WHERE period = 'day' AND period_start = ?
+                  AND text_length = ? AND test_duration = ?
+            ORDER BY wpm DESC
+            LIMIT ?
+            """,
+            (day, *_mode(text_length, test_duration), limit),
+        )
+        return [dict(row) for row in rows]
+
+
+def format_leaderboard(db, profile, text_length, test_duration, limit=10):
+    """Plain-text leaderboard and personal bests for the leaderboard view."""
+    lines = [f"Today's leaderboard: {text_length}, {test_duration}s", ""]
+    board = db.daily_leaderboard(text_length, test_duration, limit=limit)
+    if not board:
+        lines.append("  No tests yet today.")
+    for rank, row in enumerate(board, 1):
+        marker = "*" if row["profile"] == profile else " "
+        lines.append(
+            f"{marker}{rank:>3}. {row['profile']:<20} {row['wpm']:7.2f} WPM"
+            f"  ({row['sessions']} tests)"
+        )
+
+    lines += ["", f"Personal bests for {profile}:", ""]
+    bests = db.personal_bests(profile)
+    if not bests:
+        lines.append("  No tests recorded yet.")
+    for row in bests:
+        duration = f"{row['test_duration']}s" if row["test_duration"] else "-"
+        lines.append(
+            f"  {row['text_length'] or '-':<16} {duration:>5}  {row['wpm']:7.2f} WPM"
+            f"  ({row['sessions']} tests)"
+        )
+    return "\n".join(lines)
+
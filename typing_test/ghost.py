@@ -0,0 +1,60 @@
+"""
+Replay of a recorded test as a ghost to race against.
+
+The recorded timeline is reduced once to the keystrokes that moved the
+cursor, as two parallel arrays of times and positions. The GUI then
+calls advance() once per frame from a single periodic job. Each call
+jumps over every event that has come due since the last frame with one
+bisect, so a fast ghost costs no more per frame than a slow one.
+"""
+
+from array import array
+from bisect import bisect_right
+
+# Frame interval of the replay job, in seconds
+FRAME_INTERVAL = 1 / 60
+
+
+class GhostReplay:
+    """Where a recorded run's cursor was at any moment of the test."""
+
+    __slots__ = ("passage", "wpm", "times", "positions", "_index", "position")
+
+    def __init__(self, timeline, wpm=None):
+        self.passage = timeline.passage
+        self.wpm = wpm
+        self.times = array("I")      # milliseconds since the test started
+        self.positions = array("I")  # cursor position from that time on
+        last = 0
+        for t, p in zip(timeline.times, timeline.positions):
+            p = min(p, len(self.passage))
+            if p != last:
+                self.times.append(t)
+                self.positions.append(p)
+                last = p
+        self.reset()
+
+    def __len__(self):
+        return len(self.times)
+
+    def reset(self):
+        self._index = 0
+        self.position = 0
+
+    @property
+    def finished(self):
+        return self._index >= len(self.times)
+
+    def advance(self, elapsed):
+        """
+        Move to elapsed seconds into the test. Returns (old, new) cursor
+        positions if the ghost moved, else None.
+        """
+        index = bisect_right(self.times, int(elapsed * 1000), self._index)
+        if index == self._index:
+            return None
+        self._index = index
+        old, self.position = self.position, self.positions[index - 1]
+        if old == self.position:
+            return None
+        return old, self.position
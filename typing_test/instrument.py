@@ -0,0 +1,203 @@
+"""
+Opt-in timing instrumentation for the GUI.
+
+Set TYPING_TEST_INSTRUMENT=1 to turn it on. It then records:
+- how late the Tk event loop runs a callback scheduled with after()
+- how long each wrapped handler takes
+- the gap between a key event's own timestamp and its handler starting
+
+Durations go into fixed-size log-bucketed histograms: recording one is
+a bucket increment, and nothing grows with the session.
+"""
+
+import functools
+import json
+import math
+import os
+import time
+from array import array
+
+ENV_VAR = "TYPING_TEST_INSTRUMENT"
+
+# Four buckets per power of two, from 1 microsecond up to about 70 seconds
+_BUCKETS_PER_OCTAVE = 4
+_MIN_NS = 1000
+_BUCKET_COUNT = 26 * _BUCKETS_PER_OCTAVE + 1
+
+
+def enabled_from_env():
+    return os.environ.get(ENV_VAR, "").lower() not in ("", "0", "false", "no")
+
+
+class Histogram:
+    """Log-bucketed histogram of durations in nanoseconds."""
+
+    __slots__ = ("counts", "count", "total", "max")
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        self.counts = array("Q", bytes(8 * _BUCKET_COUNT))
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    def record(self, ns):
+        ns = max(0, int(ns))
+        if ns <= _MIN_NS:
+            bucket = 0
+        else:
+            bucket = min(
+                _BUCKET_COUNT - 1,
+                int(math.log2(ns / _MIN_NS) * _BUCKETS_PER_OCTAVE) + 1,
+            )
+        self.counts[bucket] += 1
+        self.count += 1
+        self.total += ns
+        if ns > self.max:
+            self.max = ns
+
+    def percentile(self, fraction):
+        """Upper bound, in nanoseconds, of the bucket holding the percentile."""
+        if not self.count:
+            return 0
+        target = max(1, math.ceil(fraction * self.count))
+        seen = 0
+        for bucket, n in enumerate(self.counts):
+            seen += n
+            if seen >= target:
+                upper = _MIN_NS * 2 ** (bucket / _BUCKETS_PER_OCTAVE)
+                return min(int(upper), self.max)
+        return self.max
+
+    def summary(self):
+        """Milliseconds: count, mean, p50, p90, p99 and max."""
+        ms = 1e-6
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total / self.count * ms, 3) if self.count else 0.0,
+            "p50_ms": round(self.percentile(0.50) * ms, 3),
+            "p90_ms": round(self.percentile(0.90) * ms, 3),
+            "p99_ms": round(self.percentile(0.99) * ms, 3),
+            "max_ms": round(self.max * ms, 3),
+        }
+
+
+class Instrumentation:
+    """Collects the histograms for one session."""
+
+    LOOP_LAG = "event_loop_lag"
+    EVENT_GAP = "event_to_handler"
+
+    def __init__(self):
+        self.histograms = {}
+        self.reset()
+
+    def reset(self):
+        """Clear the recorded data, keeping histograms already handed out."""
+        for hist in self.histograms.values():
+            hist.clear()
+        # Smallest (monotonic ms - event.time) seen, standing in for zero delay
+        self._event_offset = None
+
+    def histogram(self, name):
+        hist = self.histograms.get(name)
+        if hist is None:
+            hist = self.histograms[name] = Histogram()
+        return hist
+
+    def record_event(self, event, now_ns):
+        """Record how long ago, by the event's own clock, the event happened."""
+        event_time = getattr(event, "time", None)
+        if not isinstance(event_time, int) or event_time <= 0:
+            return
+        offset = now_ns // 1_000_000 - event_time
+        if self._event_offset is None or offset < self._event_offset:
+            self._event_offset = offset
+        self.histogram(self.EVENT_GAP).record(
+            (offset - self._event_offset) * 1_000_000
+        )
+
+    def wrap(self, name, func, event_handler=False):
+        """
+        Return func wrapped to time every call into the named histogram.
+        For an event_handler, the first argument is the Tk event and its
+        delivery delay is recorded too.
+        """
+        hist = self.histogram(name)
+
+        @functools.wraps(func)
+        def timed(*args, **kwargs):
+            start = time.perf_counter_ns()
+            if event_handler and args:
+                self.record_event(args[0], time.monotonic_ns())
+            try:
+                return func(*args, **kwargs)
+            finally:
+                hist.record(time.perf_counter_ns() - start)
+
+        return timed
+
+    def summary(self):
+        return {name: h.summary() for name, h in sorted(self.histograms.items())}
+
+    def overlay_text(self):
+        lines = []
+        for name, s in self.summary().items():
+            lines.append(
+                f"{name}: n={s['count']} p50={s['p50_ms']:.2f} "
+                f"p99={s['p99_ms']:.2f} max={s['max_ms']:.2f} ms"
+            )
+        return "\n".join(lines)
+
+    def dump(self, path, **extra):
+        """Write the summaries and raw bucket counts to a JSON file."""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        payload = dict(extra)
+        payload["summary"] = self.summary()
+        payload["buckets"] = {
+            "min_ns": _MIN_NS,
+            "per_octave": _BUCKETS_PER_OCTAVE,
+            "counts": {
+                name: list(h.counts) for name, h in sorted(self.histograms.items())
+            },
+        }
+        with open(path, "w") as f:
+            json.dump(payload, f, indent=2)
+
+
+class LoopLagProbe:
+    """
+    Schedules itself with widget.after(interval) and records how much later
+    than asked the callback actually ran.
+    """
+
+    def __init__(self, widget, instrumentation, interval_ms=100, on_tick=None):
+        self.widget = widget
+        self.hist = instrumentation.histogram(Instrumentation.LOOP_LAG)
+        self.interval_ms = interval_ms
+        self.on_tick = on_tick
+        self._after_id = None
+        self._expected = None
+
+    def start(self):
+        self.stop()
+        self._schedule()
+
+    def stop(self):
+        if self._after_id is not None:
+            self.widget.after_cancel(self._after_id)
+            self._after_id = None
+
+    def _schedule(self):
+        self._expected = time.monotonic_ns() + self.interval_ms * 1_000_000
+        self._after_id = self.widget.after(self.interval_ms, self._tick)
+
+    def _tick(self):
+        self.hist.record(time.monotonic_ns() - self._expected)
+        if self.on_tick is not None:
+            self.on_tick()
+        self._schedule()
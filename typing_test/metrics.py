@@ -0,0 +1,191 @@
+"""
+Live typing metrics, updated as the test runs.
+
+Every keystroke bumps a few counters. Once a second the WPM over that
+second is sampled into a fixed-size ring buffer. The mean and variance of
+the samples are kept with Welford's algorithm: one set for the whole test
+and one for the samples still in the ring, which are removed again as
+they are overwritten. Either consistency is then O(1) to read.
+
+The WPM and error count of every second also go into two longer rings,
+which the charts draw from.
+"""
+
+import math
+from array import array
+
+from .scoring import calculate_wpm
+from .timeline import CORRECT, INCORRECT
+
+# Per-second WPM samples kept for the rolling figures
+SAMPLE_WINDOW = 30
+# Per-second samples kept for the charts, enough for the longest test
+HISTORY_SECONDS = 600
+# Slack for a tick that lands a hair short of the second in floating point
+_TICK_SLACK = 1e-6
+
+
+class RunningStats:
+    """Mean and variance by Welford's algorithm, with removal."""
+
+    __slots__ = ("count", "mean", "_m2")
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+
+    def add(self, x):
+        self.count += 1
+        delta = x - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (x - self.mean)
+
+    def remove(self, x):
+        if self.count <= 1:
+            self.count = 0
+            self.mean = self._m2 = 0.0
+            return
+        self.count -= 1
+        delta = x - self.mean
+        self.mean -= delta / self.count
+        self._m2 -= delta * (x - self.mean)
+
+    @property
+    def variance(self):
+        # Rounding in remove() can leave M2 a hair below zero
+        return max(0.0, self._m2 / self.count) if self.count > 1 else 0.0
+
+    @property
+    def stdev(self):
+        return math.sqrt(self.variance)
+
+    def consistency(self):
+        """100 minus the coefficient of variation as a percentage, floored at 0."""
+        if self.count < 2 or self.mean <= 0:
+            return 0.0
+        return max(0.0, 100.0 * (1.0 - self.stdev / self.mean))
+
+
+class SampleRing:
+    """The last capacity samples, oldest overwritten first."""
+
+    __slots__ = ("values", "capacity", "count", "_next")
+
+    def __init__(self, capacity=SAMPLE_WINDOW):
+        self.capacity = capacity
+        self.values = array("d", bytes(8 * capacity))
+        self.count = 0
+        self._next = 0
+
+    def __len__(self):
+        return self.count
+
+    def push(self, x):
+        """Store x and return the sample it overwrote, or None."""
+        evicted = self.values[self._next] if self.count == self.capacity else None
+        self.values[self._next] = x
+        self._next = (self._next + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+        return evicted
+
+    def __iter__(self):
+        """Samples oldest first."""
+        start = (self._next - self.count) % self.capacity
+        for i in range(self.count):
+            yield self.values[(start + i) % self.capacity]
+
+
+class LiveMetrics:
+    """
+    Net and raw WPM, keystroke accuracy, error count and consistency for
+    one test.
+
+    - keystroke(outcome) on every key event
+    - sample(elapsed, correct) once a second, correct being the
+      positionally correct characters so far
+    """
+
+    def __init__(self, window=SAMPLE_WINDOW, history=HISTORY_SECONDS):
+        self.window = window
+        self.history = history
+        self.reset()
+
+    def reset(self):
+        self.correct_keystrokes = 0
+        self.errors = 0
+        self.samples = SampleRing(self.window)
+        self.overall = RunningStats()
+        self.rolling = RunningStats()
+        self.wpm_history = SampleRing(self.history)
+        self.error_history = SampleRing(self.history)
+        self._last_elapsed = 0.0
+        self._last_correct = 0
+        self._last_errors = 0
+
+    # ======================
+    # UPDATES
+    # ======================
+
+    def keystroke(self, outcome):
+        if outcome == CORRECT:
+            self.correct_keystrokes += 1
+        elif outcome == INCORRECT:
+            self.errors += 1
+
+    def sample(self, elapsed, correct):
+        """
+        Record the WPM and errors since the previous sample and return the
+        WPM, or None if a whole second hasn't passed since it.
+        """
+        if elapsed - self._last_elapsed < 1.0 - _TICK_SLACK:
+            return None
+        return self._record(elapsed, correct)
+
+    def _record(self, elapsed, correct):
+        interval = elapsed - self._last_elapsed
+        wpm = calculate_wpm(max(0, correct - self._last_correct), interval)
+        self._last_elapsed = elapsed
+        self._last_correct = correct
+        self.wpm_history.push(wpm)
+        self.error_history.push(self.errors - self._last_errors)
+        self._last_errors = self.errors
+
+        self.overall.add(wpm)
+        self.rolling.add(wpm)
+        evicted = self.samples.push(wpm)
+        if evicted is not None:
+            self.rolling.remove(evicted)
+        return wpm
+
+    def finish(self, elapsed, correct):
+        """Sample the last, partial second, unless it is too short to mean much."""
+        if elapsed - self._last_elapsed >= 0.5:
+            self._record(elapsed, correct)
+
+    # ======================
+    # READINGS
+    # ======================
+
+    @property
+    def typed(self):
+        """Character keystrokes, right or wrong, including ones later erased."""
+        return self.correct_keystrokes + self.errors
+
+    def raw_wpm(self, elapsed):
+        return calculate_wpm(self.typed, elapsed)
+
+    @property
+    def accuracy(self):
+        """Percentage of character keystrokes that were right when typed."""
+        return 100.0 * self.correct_keystrokes / self.typed if self.typed else 0.0
+
+    def summary(self, elapsed):
+        """The figures stored with a finished session."""
+        return {
+            "raw_wpm": round(self.raw_wpm(elapsed), 2),
+            "keystroke_accuracy": round(self.accuracy, 2),
+            "errors": self.errors,
+            "consistency": round(self.overall.consistency(), 2),
+            "wpm_stdev": round(self.overall.stdev, 2),
+        }
@@ -0,0 +1,330 @@
+"""
+Typing races over the LAN.
+
+    python -m typing_test.race --host 0.0.0.0 --length Paragraph
+
+The server is a single asyncio process. Server and clients exchange
+newline-delimited JSON over TCP:
+
+- client to server: join {name}, progress {position, wpm, finished}
+- server to client: welcome,
+  race {passage, text_source, text_length, duration, start_in},
+  standings {elapsed, players, leaders} and results {leaders}
+
+A progress message only overwrites its sender's latest state. Once per
+tick the server sorts out the leaders, encodes the standings once and
+writes that buffer to every client. A keystroke never triggers a send,
+so traffic depends on the tick rate and the number of clients. A client
+that stops reading is dropped once its send buffer fills, rather than
+holding everyone else up.
+
+RaceClient is the GUI's side of this. It is a plain socket with a reader
+thread, polled from the Tk thread.
+"""
+
+import argparse
+import asyncio
+import heapq
+import json
+import queue
+import socket
+import threading
+
+from .text import DEFAULT_DURATION, STATIC_TEXT_POOLS, TEXT_SOURCE_OPTIONS, get_test_text
+
+DEFAULT_PORT = 47474
+# Standings broadcasts per second
+TICK_RATE = 5
+# Seconds from the first player joining to the race starting
+LOBBY_SECONDS = 10
+# Seconds between announcing a race and its start, to match the GUI countdown
+START_DELAY = 3.8
+# Players listed in each standings message
+LEADERS = 10
+# Bytes queued for a client before it is considered stuck and dropped
+MAX_BUFFER = 256 * 1024
+MAX_LINE = 64 * 1024
+
+
+def encode(message):
+    return (json.dumps(message, separators=(",", ":")) + "\n").encode("utf-8")
+
+
+# ======================
+# SERVER
+# ======================
+
+class Player:
+    __slots__ = ("name", "writer", "position", "wpm", "finished", "racing")
+
+    def __init__(self, name, writer):
+        self.name = name
+        self.writer = writer
+        self.position = 0
+        self.wpm = 0.0
+        self.finished = False
+        self.racing = False
+
+    def entry(self):
+        return [self.name, self.position, round(self.wpm, 1), self.finished]
+
+
+class RaceServer:
+    """Runs one race after another for whoever is connected."""
+
+    def __init__(self, text_source="Random Generated", text_length="Paragraph",
+                 duration=DEFAULT_DURATION, lobby=LOBBY_SECONDS, tick_rate=TICK_RATE):
+        self.text_source = text_source
+        self.text_length = text_length
+        self.duration = duration
+        self.lobby = lobby
+        self.tick = 1.0 / tick_rate
+        self.players = set()
+        self.race_number = 0
+        self.dirty = False
+        self._joined = None
+        self._races = None
+        self.stats = {"received": 0, "broadcasts": 0, "bytes_sent": 0, "dropped": 0}
+
+    async def start(self, host="127.0.0.1", port=DEFAULT_PORT):
+        """Start listening and running races; returns the asyncio server."""
+        self._joined = asyncio.Event()
+        server = await asyncio.start_server(self._handle, host, port, limit=MAX_LINE)
+        self._races = asyncio.ensure_future(self._run_races())
+        return server
+
+    async def serve(self, host="0.0.0.0", port=DEFAULT_PORT):
+        server = await self.start(host, port)
+        async with server:
+            await asyncio.gather(server.serve_forever(), self._races)
+
+    # ── connections ───────────────────────────────────────
+
+    async def _handle(self, reader, writer):
+        player = None
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    message = json.loads(line)
+                except ValueError:
+                    continue
+                if not isinstance(message, dict):
+                    continue
+                self.stats["received"] += 1
+                kind = message.get("type")
+                if kind == "progress" and player is not None:
+                    if player.racing:
+                        try:
+                            position = int(message.get("position", 0))
+                            wpm = float(message.get("wpm", 0.0))
+                        except (TypeError, ValueError, OverflowError):
+                            # A malformed update costs the message, not the player
+                            continue
+                        # Overwrite only; the next tick sends it on
+                        player.position = position
+                        player.wpm = wpm
+                        player.finished = bool(message.get("finished", False))
+                        self.dirty = True
+                elif kind == "join" and player is None:
+                    name = str(message.get("name") or "player")[:24]
+                    player = Player(name, writer)
+                    self.players.add(player)
+                    self._send(player, encode({"type": "welcome", "players": len(self.players)}))
+                    self._joined.set()
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            if player is not None:
+                self.players.discard(player)
+                self.dirty = True
+            writer.close()
+
+    def _send(self, player, data):
+        transport = player.writer.transport
+        if transport.is_closing():
+            return
+        if transport.get_write_buffer_size() > MAX_BUFFER:
+            # Not reading; don't let it buffer without bound
+            self.stats["dropped"] += 1
+            self.players.discard(player)
+            transport.abort()
+            return
+        player.writer.write(data)
+        self.stats["bytes_sent"] += len(data)
+
+    def _broadcast(self, players, message):
+        data = encode(message)
+        self.stats["broadcasts"] += 1
+        for player in list(players):
+            self._send(player, data)
+
+    # ── races ─────────────────────────────────────────────
+
+    def standings(self, racers, elapsed):
+        live = [p for p in racers if p in self.players]
+        leaders = heapq.nlargest(
+            LEADERS, live, key=lambda p: (p.finished, p.position, p.wpm)
+        )
+        return {
+            "type": "standings",
+            "race": self.race_number,
+            "elapsed": round(elapsed, 2),
+            "players": len(live),
+            "finished": sum(p.finished for p in live),
+            "leaders": [p.entry() for p in leaders],
+        }
+
+    async def _run_races(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            if not self.players:
+                self._joined.clear()
+                await self._joined.wait()
+            await asyncio.sleep(self.lobby)
+            if not self.players:
+                continue
+
+            self.race_number += 1
+            racers = list(self.players)
+            for player in racers:
+                player.position, player.wpm, player.finished = 0, 0.0, False
+                player.racing = True
+            passage = get_test_text(self.text_source, self.text_length)
+            self._broadcast(racers, {
+                "type": "race",
+                "race": self.race_number,
+                "passage": passage,
+                "text_source": self.text_source,
+                "text_length": self.text_length,
+                "duration": self.duration,
+                "start_in": START_DELAY,
+            })
+
+            start = loop.time() + START_DELAY
+            deadline = start + self.duration + 1.0
+            next_tick = loop.time() + self.tick
+            while True:
+                await asyncio.sleep(max(0.0, next_tick - loop.time()))
+                # Absolute tick times, so a slow tick doesn't shift the rest
+                next_tick += self.tick
+                now = loop.time()
+                live = [p for p in racers if p in self.players]
+                if self.dirty:
+                    self.dirty = False
+                    self._broadcast(live, self.standings(racers, max(0.0, now - start)))
+                if now >= deadline or not live or all(p.finished for p in live):
+                    break
+
+            final = self.standings(racers, max(0.0, loop.time() - start))
+            final["type"] = "results"
+            for player in racers:
+                player.racing = False
+            self._broadcast([p for p in racers if p in self.players], final)
+
+
+# ======================
+# CLIENT
+# ======================
+
+class RaceClient:
+    """
+    A connection to a RaceServer for the GUI. A reader thread puts the
+    server's messages on a queue, and the Tk thread drains it with poll().
+    Progress is sent from the Tk thread, and only when it has changed.
+    """
+
+    def __init__(self, host, port=DEFAULT_PORT, name="player", timeout=5.0):
+        self.sock = socket.create_connection((host, port), timeout=timeout)
+        self.sock.settimeout(None)
+        self.messages = queue.SimpleQueue()
+        self.connected = True
+        self._last_progress = None
+        self._send({"type": "join", "name": name})
+        threading.Thread(target=self._read, daemon=True).start()
+
+    def _send(self, message):
+        try:
+            self.sock.sendall(encode(message))
+        except OSError:
+            self.close()
+
+    def _read(self):
+        try:
+            with self.sock.makefile("rb") as f:
+                for line in f:
+                    try:
+                        self.messages.put(json.loads(line))
+                    except ValueError:
+                        continue
+        except OSError:
+            pass
+        self.connected = False
+        self.messages.put({"type": "closed"})
+
+    def send_progress(self, position, wpm, finished=False):
+        progress = (position, round(wpm, 1), finished)
+        if progress == self._last_progress or not self.connected:
+            return
+        self._last_progress = progress
+        self._send({
+            "type": "progress", "position": position, "wpm": progress[1],
+            "finished": finished,
+        })
+
+    def poll(self):
+        """Every message received since the last poll."""
+        messages = []
+        while True:
+            try:
+                messages.append(self.messages.get_nowait())
+            except queue.Empty:
+                return messages
+
+    def close(self):
+        self.connected = False
+        try:
+            self.sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self.sock.close()
+
+
+def format_standings(message, me=None):
+    """A few lines of leaders for the GUI's race label."""
+    lines = [
+        f"Race {message['race']}: {message['finished']}/{message['players']} finished"
+    ]
+    for rank, (name, position, wpm, finished) in enumerate(message["leaders"], 1):
+        marker = "*" if name == me else " "
+        flag = " ✓" if finished else ""
+        lines.append(f"{marker}{rank}. {name}  {position} chars  {wpm:.1f} WPM{flag}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m typing_test.race", description="Host a LAN typing race."
+    )
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--source", default="Random Generated", choices=TEXT_SOURCE_OPTIONS)
+    parser.add_argument("--length", default="Paragraph", choices=list(STATIC_TEXT_POOLS))
+    parser.add_argument("--duration", type=int, default=DEFAULT_DURATION)
+    parser.add_argument("--lobby", type=float, default=LOBBY_SECONDS,
+                        help="seconds to wait for players before each race")
+    parser.add_argument("--tick-rate", type=float, default=TICK_RATE)
+    args = parser.parse_args(argv)
+
+    server = RaceServer(args.source, args.length, args.duration, args.lobby, args.tick_rate)
+    print(f"Race server on {args.host}:{args.port}")
+    try:
+        asyncio.run(server.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
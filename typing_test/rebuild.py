@@ -0,0 +1,34 @@
+"""
+Recompute the aggregates from the stored sessions.
+
+    python -m typing_test.rebuild [--db typing_stats.db] [--profile NAME]
+
+Streaks are left alone: a profile's streak row may carry what an older
+install's streak file knew, which its sessions can't reproduce.
+"""
+
+import argparse
+
+from .database import DATABASE_FILE, StatsDatabase
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m typing_test.rebuild",
+        description="Recompute the aggregates from the stored sessions.",
+    )
+    parser.add_argument("--db", default=DATABASE_FILE, help="database file")
+    parser.add_argument("--profile", help="only this profile (default: all)")
+    args = parser.parse_args(argv)
+
+    db = StatsDatabase(args.db)
+    try:
+        profiles = [args.profile] if args.profile else db.profiles()
+        db.rebuild_aggregates(args.profile)
+        print(f"Rebuilt {len(profiles)} profile(s) from {db.session_count()} sessions")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,229 @@
+"""
+One after() chain for all the periodic UI work of a test.
+
+Jobs are kept on absolute deadlines from a monotonic clock, so they don't
+drift however late Tk runs them, and jobs due at the same moment share a
+single wakeup. The scheduler also owns the test clock: elapsed() leaves
+out paused time, and changes to the wall clock don't affect it.
+
+EventClock puts Tk event timestamps on the same monotonic clock, so a
+keystroke can be timed by when it happened rather than when its handler
+got to run.
+"""
+
+import heapq
+import itertools
+import math
+import time
+
+# Event delivery delay, in seconds, beyond which the event clock re-anchors
+MAX_EVENT_DELAY = 1.0
+
+
+class Job:
+    __slots__ = ("callback", "interval", "deadline", "cancelled")
+
+    def __init__(self, callback, interval, deadline):
+        self.callback = callback
+        self.interval = interval
+        self.deadline = deadline
+        self.cancelled = False
+
+
+class TickScheduler:
+    """
+    Runs one-shot and periodic callbacks through widget.after().
+
+    - call_later / call_every add jobs; cancel / cancel_all remove them
+    - start_clock starts the test clock that elapsed() reads
+    - pause freezes both the clock and every job; resume picks up where
+      they left off
+    """
+
+    def __init__(self, widget, clock=time.monotonic):
+        self.widget = widget
+        self.clock = clock
+        self._heap = []
+        self._seq = itertools.count()
+        self._after_id = None
+        self._started_at = None
+        self._paused_at = None
+        self._paused_total = 0.0
+
+    # ======================
+    # TEST CLOCK
+    # ======================
+
+    @property
+    def started(self):
+        return self._started_at is not None
+
+    @property
+    def paused(self):
+        return self._paused_at is not None
+
+    def start_clock(self, elapsed=0.0):
+        """Start the test clock, as if elapsed seconds had already gone by."""
+        self._started_at = self.clock() - elapsed
+        self._paused_at = None
+        self._paused_total = 0.0
+
+    def stop_clock(self):
+        self._started_at = None
+        self._paused_at = None
+
+    def elapsed(self):
+        """Seconds since start_clock(), not counting time spent paused."""
+        if self._started_at is None:
+            return 0.0
+        now = self._paused_at if self._paused_at is not None else self.clock()
+        return now - self._started_at - self._paused_total
+
+    def elapsed_at(self, when):
+        """Test time at the clock reading when, not counting time spent paused."""
+        if self._started_at is None:
+            return 0.0
+        if self._paused_at is not None:
+            when = min(when, self._paused_at)
+        return when - self._started_at - self._paused_total
+
+    def pause(self):
+        if self._paused_at is not None:
+            return
+        self._paused_at = self.clock()
+        self._cancel_wakeup()
+
+    def resume(self):
+        if self._paused_at is None:
+            return
+        paused_for = self.clock() - self._paused_at
+        self._paused_at = None
+        self._paused_total += paused_for
+        for _, _, job in self._heap:
+            job.deadline += paused_for
+        self._heap = [(job.deadline, seq, job) for _, seq, job in self._heap]
+        heapq.heapify(self._heap)
+        self._wake()
+
+    # ======================
+    # JOBS
+    # ======================
+
+    def call_later(self, delay, callback):
+        """Run callback once, delay seconds from now."""
+        return self._add(Job(callback, None, self.clock() + delay))
+
+    def call_every(self, interval, callback, first=None):
+        """
+        Run callback every interval seconds, the first time after first
+        seconds (default: one interval). Missed ticks are skipped, not
+        bunched up.
+        """
+        if first is None:
+            first = interval
+        return self._add(Job(callback, interval, self.clock() + first))
+
+    def cancel(self, job):
+        if job is not None:
+            job.cancelled = True
+
+    def cancel_all(self):
+        for _, _, job in self._heap:
+            job.cancelled = True
+        self._heap = []
+        self._cancel_wakeup()
+
+    def _add(self, job):
+        heapq.heappush(self._heap, (job.deadline, next(self._seq), job))
+        self._wake()
+        return job
+
+    # ======================
+    # WAKEUPS
+    # ======================
+
+    def _cancel_wakeup(self):
+        if self._after_id is not None:
+            self.widget.after_cancel(self._after_id)
+            self._after_id = None
+
+    def _wake(self):
+        """(Re)arm the single after() for the earliest live deadline."""
+        self._cancel_wakeup()
+        while self._heap and self._heap[0][2].cancelled:
+            heapq.heappop(self._heap)
+        if not self._heap or self._paused_at is not None:
+            return
+        delay = self._heap[0][0] - self.clock()
+        self._after_id = self.widget.after(
+            max(0, math.ceil(delay * 1000)), self._run
+        )
+
+    def _run(self):
+        self._after_id = None
+        now = self.clock()
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            _, _, job = heapq.heappop(self._heap)
+            if job.cancelled:
+                continue
+            due.append(job)
+            if job.interval is not None:
+                # Next tick on the original grid, skipping any that were missed
+                missed = math.floor((now - job.deadline) / job.interval)
+                job.deadline += job.interval * (missed + 1)
+                heapq.heappush(self._heap, (job.deadline, next(self._seq), job))
+
+        for job in due:
+            # An earlier callback may have cancelled or paused everything
+            if job.cancelled:
+                continue
+            if self._paused_at is not None:
+                if job.interval is None:
+                    heapq.heappush(self._heap, (job.deadline, next(self._seq), job))
+                continue
+            if job.interval is None:
+                job.cancelled = True
+            job.callback()
+
+        if self._after_id is None:
+            self._wake()
+
+
+class EventClock:
+    """
+    Maps Tk event.time values, in milliseconds on the windowing system's
+    own 32-bit clock, onto clock().
+
+    Delivery only ever adds delay, so the smallest (now - event time) seen
+    so far is taken as the offset between the two clocks. If the gap grows
+    past MAX_EVENT_DELAY, the event clock has jumped, and the offset is
+    taken afresh.
+    """
+
+    WRAP = 1 << 32
+
+    def __init__(self, clock=time.monotonic):
+        self.clock = clock
+        self.reset()
+
+    def reset(self):
+        self._offset = None
+        self._last = None
+        self._wraps = 0
+
+    def __call__(self, event_time):
+        """The clock() reading at which an event stamped event_time happened."""
+        now = self.clock()
+        if not isinstance(event_time, int) or event_time <= 0:
+            # Synthetic events, and some platforms, carry no time
+            return now
+        if self._last is not None and event_time < self._last - self.WRAP // 2:
+            self._wraps += 1
+        self._last = event_time
+        stamped = (event_time + self._wraps * self.WRAP) / 1000
+        offset = now - stamped
+        if (self._offset is None or offset < self._offset
+                or offset - self._offset > MAX_EVENT_DELAY):
+            self._offset = offset
+        return stamped + self._offset
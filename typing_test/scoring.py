@@ -0,0 +1,470 @@
+"""WPM maths and the incremental keystroke scorers."""
+
+from array import array
+
+
+# ============================================================
+# SCORING ENGINE
+# ============================================================
+
+def calculate_wpm(correct_chars: int, elapsed_time: float) -> float:
+    """Words per minute, counting five correct characters as one word."""
+    if elapsed_time <= 0:
+        return 0.0
+    return (correct_chars / 5) / (elapsed_time / 60)
+
+
+def _common_prefix_length(a: str, b: str) -> int:
+    """Return the length of the longest common prefix of two strings."""
+    if b.startswith(a):
+        return len(a)
+    if a.startswith(b):
+        return len(b)
+    limit = min(len(a), len(b))
+    i = 0
+    while i < limit and a[i] == b[i]:
+        i += 1
+    return i
+
+
+class TypingScorer:
+    """
+    Keeps the score of the typed text against the passage up to date from
+    keystroke deltas. An edit rescores only the text from where it starts,
+    so typing at the end scores just the new characters.
+
+    - correct: characters matching the passage at the same position
+    - errors: characters that don't match, including any typed past the end
+    - position: number of characters typed
+    - complete: every passage character typed correctly, with nothing but
+      whitespace after it
+    """
+
+    def __init__(self, sentence: str = ""):
+        self.reset(sentence)
+
+    def reset(self, sentence: str):
+        self.sentence = sentence
+        self.text = ""
+        self.correct = 0
+        self.errors = 0
+        self._overflow_chars = 0
+
+    @property
+    def position(self) -> int:
+        return len(self.text)
+
+    @property
+    def complete(self) -> bool:
+        return (
+            self.correct == len(self.sentence)
+            and self._overflow_chars == 0
+        )
+
+    @property
+    def accuracy(self) -> float:
+        """Percentage of typed characters that were correct."""
+        typed = self.correct + self.errors
+        return 100.0 * self.correct / typed if typed else 0.0
+
+    @property
+    def cursor(self) -> int:
+        """Passage characters the typed text has covered."""
+        return min(len(self.text), len(self.sentence))
+
+    def is_correct(self, index: int) -> bool:
+        """Whether the typed character at index matches the passage."""
+        return (
+            index < len(self.sentence)
+            and index < len(self.text)
+            and self.text[index] == self.sentence[index]
+        )
+
+    def _score(self, start: int, end: int, sign: int):
+        sentence = self.sentence
+        text = self.text
+        for i in range(start, end):
+            if i < len(sentence):
+                if text[i] == sentence[i]:
+                    self.correct += sign
+                else:
+                    self.errors += sign
+            else:
+                self.errors += sign
+                if not text[i].isspace():
+                    self._overflow_chars += sign
+
+    def _replace(self, start: int, removed: int, inserted: str):
+        """Replace text[start:start + removed] with inserted."""
+        old_length = len(self.text)
+        if removed == 0 and start == old_length:
+            # Fast path: typing or pasting at the end
+            self.text += inserted
+            self._score(start, len(self.text), 1)
+        else:
+            # Anything after an edit shifts position, so rescore the tail
+            self._score(start, old_length, -1)
+            self.text = self.text[:start] + inserted + self.text[start + removed:]
+            self._score(start, len(self.text), 1)
+        return start, max(old_length, len(self.text))
+
+    def insert(self, text: str, position: int = None):
+        """Insert typed or pasted text, at the end unless a position is given."""
+        if position is None:
+            position = len(self.text)
+        return self._replace(position, 0, text)
+
+    def backspace(self, count: int = 1):
+        """Remove the last count characters."""
+        count = min(count, len(self.text))
+        return self._replace(len(self.text) - count, count, "")
+
+    def delete(self, position: int, count: int = 1):
+        """Remove count characters starting at position."""
+        return self._replace(position, count, "")
+
+    def extend_sentence(self, more: str):
+        """
+        Append more passage text, rescoring anything already typed past the
+        old end. Returns the (start, end) range whose scoring may have changed.
+        """
+        start = len(self.sentence)
+        self._score(start, len(self.text), -1)
+        self.sentence += more
+        self._score(start, len(self.text), 1)
+        return start, max(start, len(self.text))
+
+    def sync(self, text: str):
+        """
+        Bring the scorer in line with the full contents of the input box and
+        return the (start, end) character range that changed.
+        """
+        start = _common_prefix_length(self.text, text)
+        return self._replace(start, len(self.text) - start, text[start:])
+
+    def tag_runs(self, start: int, end: int):
+        """(tag, run_start, run_end) runs covering [start, end) of the passage."""
+        return compute_tag_runs(self.sentence, self.text, start, end)
+
+
+def compute_tag_runs(sentence: str, typed: str, start: int, end: int):
+    """
+    Work out how to retag the [start, end) range of the sentence for the
+    given typed text.
+
+    Returns a list of (tag, run_start, run_end) covering the range, clipped
+    to the sentence, with adjacent same-state characters merged. An untyped
+    run has tag None.
+    """
+    end = min(end, len(sentence))
+    runs = []
+    typed_end = min(len(typed), end)
+    i = start
+    while i < typed_end:
+        correct = typed[i] == sentence[i]
+        j = i + 1
+        while j < typed_end and (typed[j] == sentence[j]) == correct:
+            j += 1
+        runs.append(("correct" if correct else "incorrect", i, j))
+        i = j
+    if typed_end < end:
+        runs.append((None, max(typed_end, start), end))
+    return runs
+
+
+# ============================================================
+# ALIGNED SCORING
+# ============================================================
+
+# Cells either side of the expected diagonal kept per row
+BAND = 16
+# Rows walked back per keystroke before the alignment is taken as settled
+MAX_LOOKBACK = 4 * BAND
+
+_DIAG, _UP, _LEFT = 0, 1, 2
+_INF = 1 << 30
+_UNTYPED, _CORRECT, _INCORRECT = 0, 1, 2
+_TAGS = (None, "correct", "incorrect")
+
+
+class AlignedScorer:
+    """
+    Scores the typed text by its edit-distance alignment to the passage,
+    so a skipped or doubled character costs one error instead of
+    misaligning everything after it.
+
+    Row j of a banded DP table holds the edit distance from the first j
+    typed characters to each passage prefix near where row j - 1 was
+    cheapest. Typing a character adds a row in O(BAND). The alignment is
+    then traced back from the new row's cheapest cell until it rejoins
+    the previous alignment, usually within a few rows and never more than
+    MAX_LOOKBACK. Backspace drops rows; other edits recompute the rows
+    from the edit onwards.
+
+    Same interface as TypingScorer, plus:
+    - cursor: passage characters the typed text has covered
+    - state of every passage character (untyped, correct or incorrect),
+      kept up to date for tag_runs()
+
+    correct counts typed characters aligned to a matching passage
+    character. errors counts every other typed character: substitutions
+    and extras.
+    """
+
+    def __init__(self, sentence: str = "", band: int = BAND):
+        self.band = band
+        self.reset(sentence)
+
+    def reset(self, sentence: str):
+        self.sentence = sentence
+        self.text = ""
+        self.correct = 0
+        # rows[j] = (lo, distances, backpointers, cheapest column)
+        self._rows = [self._first_row()]
+        # Per typed row j (from 1): column the alignment leaves row j at,
+        # the passage index it is aligned to (-1 for an extra character)
+        # and whether it matches. Index 0 is a sentinel.
+        self._cols = [0]
+        self._aligned = [-1]
+        self._matches = [False]
+        self._state = bytearray(len(sentence))
+
+    @property
+    def position(self) -> int:
+        return len(self.text)
+
+    @property
+    def cursor(self) -> int:
+        return self._rows[-1][3]
+
+    @property
+    def errors(self) -> int:
+        return len(self.text) - self.correct
+
+    @property
+    def complete(self) -> bool:
+        if self.correct != len(self.sentence):
+            return False
+        # Only whitespace may follow the last passage character
+        j = len(self.text)
+        while j > 0 and self._aligned[j] < 0:
+            j -= 1
+        return not self.text[j:].strip()
+
+    @property
+    def accuracy(self) -> float:
+        """Percentage of typed characters that were correct."""
+        return 100.0 * self.correct / len(self.text) if self.text else 0.0
+
+    def is_correct(self, index: int) -> bool:
+        """Whether the typed character at index is aligned to a match."""
+        return 0 <= index < len(self.text) and self._matches[index + 1]
+
+    # ======================
+    # DP ROWS
+    # ======================
+
+    def _first_row(self):
+        hi = min(len(self.sentence), self.band)
+        return (0, array("i", range(hi + 1)), bytes([_LEFT]) * (hi + 1), 0)
+
+    def _next_row(self, prev, ch):
+        """Row for one more typed character ch, from the row before it."""
+        plo, pdist, _, pbest = prev
+        sentence = self.sentence
+        center = pbest + 1
+        lo = max(0, center - self.band)
+        hi = min(len(sentence), center + self.band)
+        plen = len(pdist)
+
+        dist = array("i", bytes(4 * (hi - lo + 1)))
+        back = bytearray(hi - lo + 1)
+        best_col = lo
+        best_cost = _INF
+        best_off = _INF
+        left = _INF
+        for i in range(lo, hi + 1):
+            p = i - plo
+            cost = pdist[p] + 1 if 0 <= p < plen else _INF
+            code = _UP
+            if 0 < p <= plen:
+                diag = pdist[p - 1] + (ch != sentence[i - 1])
+                if diag <= cost:
+                    cost, code = diag, _DIAG
+            if left + 1 < cost:
+                cost, code = left + 1, _LEFT
+            dist[i - lo] = cost
+            back[i - lo] = code
+            left = cost
+            # Cheapest cell, ties going to the one nearest the diagonal
+            off = abs(i - center)
+            if cost < best_cost or (cost == best_cost and off <= best_off):
+                best_col, best_cost, best_off = i, cost, off
+        return lo, dist, back, best_col
+
+    def _add_rows(self, text):
+        rows = self._rows
+        for ch in text:
+            rows.append(self._next_row(rows[-1], ch))
+
+    def _truncate(self, rows):
+        """Keep the first rows typed characters' rows and alignment."""
+        del self._rows[rows + 1:]
+        del self._cols[rows + 1:]
+        del self._aligned[rows + 1:]
+        del self._matches[rows + 1:]
+
+    # ======================
+    # ALIGNMENT
+    # ======================
+
+    def _realign(self, old_cursor, settled):
+        """
+        Trace the alignment back from the last row until it rejoins the
+        old one, and rescore the passage characters it moved over. Rows up
+        to settled keep their old alignment entries. Returns the changed
+        (start, end) range of the passage.
+        """
+        rows = self._rows
+        cols, aligned, matches = self._cols, self._aligned, self._matches
+        m = len(self.text)
+        text, sentence = self.text, self.sentence
+        # New rows have no alignment entries yet
+        extra = m + 1 - len(cols)
+        cols.extend([-1] * extra)
+        aligned.extend([-1] * extra)
+        matches.extend([False] * extra)
+
+        j, i = m, rows[m][3]
+        walked = 0
+        start = None
+        while j > 0:
+            lo, _, back, _ = rows[j]
+            code = back[i - lo]
+            if code == _LEFT:
+                i -= 1
+                continue
+            if j <= settled:
+                if cols[j] == i:
+                    start = i
+                    break
+                walked += 1
+                if walked > MAX_LOOKBACK:
+                    # Settled enough: keep the older alignment from here
+                    start = min(i, cols[j])
+                    break
+            cols[j] = i
+            if code == _DIAG:
+                aligned[j] = i - 1
+                matches[j] = text[j - 1] == sentence[i - 1]
+                i -= 1
+            else:
+                aligned[j] = -1
+                matches[j] = False
+            j -= 1
+        if start is None:
+            start = 0
+
+        new_cursor = rows[m][3]
+        end = max(old_cursor, new_cursor)
+        state = self._state
+        before = state[start:end].count(_CORRECT)
+        # Passage characters passed over are skipped until shown otherwise
+        state[start:new_cursor] = bytes([_INCORRECT]) * max(0, new_cursor - start)
+        state[new_cursor:end] = bytes(max(0, end - new_cursor))
+        for k in range(j + 1, m + 1):
+            a = aligned[k]
+            if a >= 0:
+                state[a] = _CORRECT if matches[k] else _INCORRECT
+        # After a cut-off walk, older rows can still reach into the range
+        k = j
+        while k > 0:
+            a = aligned[k]
+            if 0 <= a < start:
+                break
+            if a >= 0:
+                state[a] = _CORRECT if matches[k] else _INCORRECT
+            k -= 1
+        self.correct += state[start:end].count(_CORRECT) - before
+        return start, end
+
+    def _replace(self, start: int, removed: int, inserted: str):
+        """Replace text[start:start + removed] with inserted."""
+        old_cursor = self.cursor
+        tail = self.text[start + removed:]
+        self.text = self.text[:start] + inserted + tail
+        self._truncate(start)
+        self._add_rows(inserted + tail)
+        return self._realign(old_cursor, start)
+
+    def insert(self, text: str, position: int = None):
+        """Insert typed or pasted text, at the end unless a position is given."""
+        if position is None:
+            position = len(self.text)
+        return self._replace(position, 0, text)
+
+    def backspace(self, count: int = 1):
+        """Remove the last count characters."""
+        count = min(count, len(self.text))
+        return self._replace(len(self.text) - count, count, "")
+
+    def delete(self, position: int, count: int = 1):
+        """Remove count characters starting at position."""
+        return self._replace(position, count, "")
+
+    def extend_sentence(self, more: str):
+        """
+        Append more passage text. Rows whose band was cut short by the old
+        end are recomputed. Returns the (start, end) range whose scoring
+        may have changed.
+        """
+        old_cursor = self.cursor
+        old_length = len(self.sentence)
+        self.sentence += more
+        self._state.extend(bytes(len(more)))
+
+        # First row whose band reached the old end and would now go further
+        first = None
+        for j in range(len(self._rows) - 1, -1, -1):
+            lo, dist, _, _ = self._rows[j]
+            if lo + len(dist) - 1 < old_length:
+                break
+            first = j
+        if first is None:
+            return old_length, old_length
+        if first == 0:
+            self._rows[0] = self._first_row()
+            first = 1
+        self._truncate(first - 1)
+        self._add_rows(self.text[first - 1:])
+        return self._realign(old_cursor, first - 1)
+
+    def sync(self, text: str):
+        """
+        Bring the scorer in line with the full contents of the input box and
+        return the (start, end) range of the passage whose scoring changed.
+        """
+        start = _common_prefix_length(self.text, text)
+        return self._replace(start, len(self.text) - start, text[start:])
+
+    # ======================
+    # TAGS
+    # ======================
+
+    def tag_runs(self, start: int, end: int):
+        """
+        (tag, run_start, run_end) runs covering [start, end) of the passage,
+        as compute_tag_runs() gives for the positional scorer.
+        """
+        end = min(end, len(self.sentence))
+        state = self._state
+        runs = []
+        i = start
+        while i < end:
+            s = state[i]
+            j = i + 1
+            while j < end and state[j] == s:
+                j += 1
+            runs.append((_TAGS[s], i, j))
+            i = j
+        return runs
@@ -0,0 +1,235 @@
+"""
+Session history and the streak data cached from it.
+
+Every finished test is appended to HISTORY_FILE as one fsynced JSON
+line; nothing already in the log is rewritten. The streak fields in DATA_FILE are a cache derived from that log: it is
+replaced atomically, and rebuilt from the log if it is missing, corrupt
+or older than the log.
+
+The app now keeps sessions and streaks in the stats database. The log
+and the DATA_FILE functions (load_data, save_data, record_session,
+rebuild_data) remain as a legacy API for scripts. They are also how
+StatsDatabase.import_legacy() reads an older install.
+"""
+
+import json
+import os
+import secrets
+import tempfile
+from datetime import date, datetime, timedelta
+
+from .timeline import KeystrokeTimeline
+
+DATA_FILE = "streak_data.json"
+HISTORY_FILE = "session_history.jsonl"
+TIMELINE_DIR = "timelines"
+
+
+def _default_data():
+    return {
+        "daily_streak": 0,
+        "last_practice_date": "",
+        "improvement_streak": 0,
+        "personal_best_streak": 0,
+        "best_wpm": 0,
+        "last_wpm": 0,
+    }
+
+
+def _history_size(history_file):
+    try:
+        return os.path.getsize(history_file)
+    except OSError:
+        return 0
+
+
+def atomic_write_bytes(path, blob):
+    """Write blob to path so readers see either the old or new file."""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix=".tmp-", dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(blob)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def atomic_write_json(path, data):
+    """Write data as JSON to path so readers see either the old or new file."""
+    atomic_write_bytes(path, json.dumps(data).encode("utf-8"))
+
+
+# ======================
+# SESSION HISTORY
+# ======================
+
+def make_session(wpm, accuracy, duration, text_source, text_length, when=None,
+                 profile=None, test_duration=None, metrics=None):
+    """
+    Build the record stored for one finished test. duration is the time
+    actually taken; test_duration is the length, in seconds, the test was
+    set to. metrics, such as LiveMetrics.summary(), are stored alongside.
+    """
+    if when is None:
+        when = datetime.now()
+    return {
+        "id": when.strftime("%Y%m%d-%H%M%S-") + secrets.token_hex(3),
+        "timestamp": when.isoformat(timespec="seconds"),
+        "wpm": round(wpm, 2),
+        "accuracy": round(accuracy, 2),
+        "duration": round(duration, 3),
+        "text_source": text_source,
+        "text_length": text_length,
+        "test_duration": test_duration,
+        "profile": profile,
+        **(metrics or {}),
+    }
+
+
+def save_timeline(session, timeline, timeline_dir=None):
+    """
+    Write a test's keystroke timeline next to the history log and point the
+    session record at it.
+    """
+    timeline_dir = timeline_dir or TIMELINE_DIR
+    os.makedirs(timeline_dir, exist_ok=True)
+    name = f"{session['id']}.ktl"
+    atomic_write_bytes(os.path.join(timeline_dir, name), timeline.to_bytes())
+    session["timeline"] = name
+    return session
+
+
+def load_timeline(session, timeline_dir=None):
+    """Return the KeystrokeTimeline recorded for a session, or None."""
+    name = session.get("timeline")
+    if not name:
+        return None
+    path = os.path.join(timeline_dir or TIMELINE_DIR, name)
+    try:
+        return KeystrokeTimeline.load(path)
+    except (OSError, ValueError):
+        return None
+
+
+def append_session(session, history_file=None):
+    """Durably append one session record to the history log."""
+    history_file = history_file or HISTORY_FILE
+    line = (json.dumps(session, separators=(",", ":")) + "\n").encode("utf-8")
+    with open(history_file, "a+b") as f:
+        # Start on a fresh line if a crash left the last one torn
+        if f.seek(0, os.SEEK_END) > 0:
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b"\n":
+                line = b"\n" + line
+        f.write(line)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def iter_sessions(history_file=None):
+    """
+    Yield the session records in the history log, oldest first. A line
+    torn by a crash mid-append is skipped.
+    """
+    history_file = history_file or HISTORY_FILE
+    if not os.path.exists(history_file):
+        return
+    with open(history_file, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                yield json.loads(line)
+            except ValueError:
+                continue
+
+
+def rebuild_data(history_file=None):
+    """Recompute the streak fields from scratch by replaying the history log."""
+    history_file = history_file or HISTORY_FILE
+    data = _default_data()
+    for session in iter_sessions(history_file):
+        when = datetime.fromisoformat(session["timestamp"]).date()
+        update_streaks(data, session["wpm"], today=when)
+    data["history_size"] = _history_size(history_file)
+    return data
+
+
+# ======================
+# LOAD / SAVE DATA
+# ======================
+
+def load_data(data_file=None, history_file=None):
+    data_file = data_file or DATA_FILE
+    history_file = history_file or HISTORY_FILE
+    try:
+        with open(data_file, "r") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        data = None
+
+    history_size = _history_size(history_file)
+    if data is None or (history_size and data.get("history_size") != history_size):
+        if not history_size:
+            return _default_data()
+        data = rebuild_data(history_file)
+        save_data(data, data_file)
+    return data
+
+
+def save_data(data, data_file=None):
+    atomic_write_json(data_file or DATA_FILE, data)
+
+
+def record_session(data, session, data_file=None, history_file=None):
+    """
+    Append a finished session to the history log, then fold it into the
+    cached streak fields and save them.
+    """
+    history_file = history_file or HISTORY_FILE
+    append_session(session, history_file)
+    when = datetime.fromisoformat(session["timestamp"]).date()
+    update_streaks(data, session["wpm"], today=when)
+    data["history_size"] = _history_size(history_file)
+    save_data(data, data_file)
+    return data
+
+
+# ======================
+# UPDATE STREAKS
+# ======================
+
+def update_streaks(data, wpm, today=None):
+    """Fold a finished test's WPM into the streak fields of data, in place."""
+    if today is None:
+        today = datetime.now().date()
+    last_date_str = data.get("last_practice_date", "")
+
+    if last_date_str:
+        last_date = date.fromisoformat(last_date_str)
+        if today == last_date + timedelta(days=1):
+            data["daily_streak"] += 1
+        elif today != last_date:
+            data["daily_streak"] = 1
+    else:
+        data["daily_streak"] = 1
+
+    data["last_practice_date"] = today.strftime("%Y-%m-%d")
+
+    if wpm > data.get("last_wpm", 0):
+        data["improvement_streak"] = data.get("improvement_streak", 0) + 1
+    else:
+        data["improvement_streak"] = 0
+
+    data["last_wpm"] = wpm
+
+    if wpm > data.get("best_wpm", 0):
+        data["best_wpm"] = wpm
+        data["personal_best_streak"] = data.get("personal_best_streak", 0) + 1
+
+    return data
@@ -0,0 +1,90 @@
+"""
+Synthetic typists for benchmarks and load tests.
+
+A SyntheticTypist turns a passage into the stream of keystrokes a person
+would produce: a target speed, occasional wrong characters, some of which
+are noticed and backspaced, and bursty gaps between keys.
+"""
+
+import math
+import random
+import string
+
+_WRONG_KEYS = string.ascii_lowercase + " "
+
+
+class SyntheticTypist:
+    """
+    - wpm: average speed, five characters to a word
+    - error_rate: chance that a keystroke types the wrong character
+    - backspace_rate: chance that a wrong character is noticed and deleted
+    - burstiness: spread of the gaps between keys; 0 types like a metronome
+    """
+
+    def __init__(self, wpm=60, error_rate=0.03, backspace_rate=0.8,
+                 burstiness=0.5, seed=None):
+        self.wpm = wpm
+        self.error_rate = error_rate
+        self.backspace_rate = backspace_rate
+        self.burstiness = burstiness
+        self.rng = random.Random(seed)
+
+    def _gap(self, mean):
+        if self.burstiness <= 0:
+            return mean
+        # Log-normal gaps with the requested mean
+        sigma = self.burstiness
+        return self.rng.lognormvariate(math.log(mean) - sigma * sigma / 2, sigma)
+
+    def keystrokes(self, passage, duration=None):
+        """
+        Yield (elapsed, keysym, char) for typing the passage, where char is
+        the character inserted, or None for BackSpace. Stops at the end of
+        the passage or once duration seconds have passed.
+        """
+        rng = self.rng
+        mean = 60 / (self.wpm * 5)
+        elapsed = 0.0
+        position = 0
+        while position < len(passage):
+            elapsed += self._gap(mean)
+            if duration is not None and elapsed > duration:
+                return
+            expected = passage[position]
+            if rng.random() < self.error_rate:
+                wrong = rng.choice(_WRONG_KEYS)
+                if wrong == expected:
+                    wrong = "x" if expected != "x" else "z"
+                yield elapsed, _keysym(wrong), wrong
+                if rng.random() < self.backspace_rate:
+                    elapsed += self._gap(mean) * 2  # noticing takes a moment
+                    yield elapsed, "BackSpace", None
+                    continue
+            else:
+                yield elapsed, _keysym(expected), expected
+            position += 1
+
+    def snapshots(self, passage, duration=None):
+        """
+        Yield (elapsed, keysym, text) where text is the whole input box
+        content after each keystroke, as the GUI handler would read it.
+        """
+        typed = []
+        for elapsed, keysym, char in self.keystrokes(passage, duration):
+            if char is None:
+                if typed:
+                    typed.pop()
+            else:
+                typed.append(char)
+            yield elapsed, keysym, "".join(typed)
+
+
+def _keysym(char):
+    if char == " ":
+        return "space"
+    if char.isalnum():
+        return char
+    return {
+        ".": "period", ",": "comma", "'": "apostrophe", "-": "minus",
+        ":": "colon", ";": "semicolon",
+    }.get(char, char)
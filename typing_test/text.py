@@ -0,0 +1,394 @@
+"""Word bank, sentence templates and the text sources used by the tests."""
+
+import random
+
+
+# ============================================================
+# WORD BANK — 200+ common English words by category
+# ============================================================
+
+WORD_BANK = {
+    "nouns": [
+        "time", "world", "system", "program", "computer", "network", "data",
+        "project", "team", "design", "problem", "solution", "process",
+        "development", "technology", "software", "hardware", "engineer",
+        "student", "teacher", "market", "company", "product", "service",
+        "quality", "method", "approach", "strategy", "result", "experience",
+        "knowledge", "science", "research", "language", "history", "future",
+        "community", "environment", "industry", "platform", "framework",
+        "database", "server", "browser", "keyboard", "algorithm", "function",
+        "variable", "library", "module", "interface", "feature", "concept",
+        "pattern", "structure", "resource", "challenge", "opportunity",
+        "innovation", "progress", "creativity", "performance", "security",
+        "analysis", "feedback", "document", "application", "machine",
+        "device", "cloud", "energy", "practice", "culture", "leader",
+    ],
+    "verbs": [
+        "build", "create", "develop", "design", "improve", "manage",
+        "analyze", "solve", "learn", "teach", "write", "read", "test",
+        "deploy", "monitor", "optimize", "transform", "integrate",
+        "collaborate", "communicate", "explore", "discover", "implement",
+        "generate", "process", "support", "maintain", "update", "deliver",
+        "achieve", "understand", "consider", "provide", "require", "enable",
+        "produce", "organize", "evaluate", "measure", "enhance", "simplify",
+        "automate", "connect", "share", "protect", "strengthen", "inspire",
+        "accelerate", "establish", "refactor", "compile", "debug", "execute",
+    ],
+    "adjectives": [
+        "effective", "modern", "complex", "simple", "powerful", "reliable",
+        "creative", "innovative", "efficient", "robust", "scalable",
+        "flexible", "secure", "dynamic", "practical", "critical", "global",
+        "digital", "advanced", "essential", "productive", "responsive",
+        "consistent", "sustainable", "intelligent", "comprehensive",
+        "strategic", "technical", "functional", "intuitive", "clean",
+        "stable", "rapid", "elegant", "maintainable", "collaborative",
+        "parallel", "automated", "structured", "modular", "portable",
+    ],
+    "adverbs": [
+        "quickly", "efficiently", "effectively", "carefully", "rapidly",
+        "constantly", "frequently", "consistently", "significantly",
+        "dramatically", "naturally", "automatically", "successfully",
+        "properly", "directly", "easily", "simply", "precisely",
+        "thoroughly", "continuously", "increasingly", "fundamentally",
+        "reliably", "gracefully", "seamlessly", "independently",
+    ],
+    "connectors": [
+        "and", "but", "while", "because", "although", "since", "when",
+        "before", "after", "unless", "however", "therefore", "moreover",
+        "furthermore", "meanwhile", "nevertheless", "consequently",
+        "additionally", "yet", "so", "then", "also", "instead",
+    ],
+    "prepositions": [
+        "in", "on", "with", "for", "from", "about", "through", "across",
+        "between", "within", "beyond", "around", "during", "without",
+        "toward", "against", "among", "beneath", "above", "behind",
+    ],
+    "articles_determiners": [
+        "the", "a", "an", "every", "each", "many", "several", "some",
+        "most", "this", "that", "these", "those", "numerous", "various",
+    ],
+}
+
+# ============================================================
+# SENTENCE TEMPLATES — structural variety
+# ============================================================
+
+SENTENCE_TEMPLATES = [
+    "{det} {adj} {noun} {verb}s {adv}.",
+    "{det} {noun} can {verb} {det} {adj} {noun}.",
+    "{adv}, {det} {adj} {noun} {verb}s {det} {noun}.",
+    "{det} {noun} {verb}s {prep} {det} {adj} {noun}.",
+    "Every {adj} {noun} must {verb} {det} {noun} {adv}.",
+    "{det} {adj} {noun} {verb}s {conn} {det} {noun} {verb}s.",
+    "To {verb} {adv} is to {verb} {det} {adj} {noun}.",
+    "{det} {noun} {verb}s {det} {noun} {prep} {det} {adj} {noun}.",
+    "Many {adj} {noun}s {verb} {adv} {prep} {det} {noun}.",
+    "When {det} {noun} {verb}s, {det} {adj} {noun} {verb}s {adv}.",
+    "{det} {adj} {noun} helps {det} {noun} {verb} {adv}.",
+    "A {adj} {noun} will {verb} {det} {noun} {prep} {det} {noun}.",
+    "{adv}, {det} {noun} can {verb} {conn} {verb} {det} {adj} {noun}.",
+    "The best {noun}s {verb} {det} {adj} {noun} {adv}.",
+    "Without {det} {adj} {noun}, {det} {noun} cannot {verb} {adv}.",
+    "{det} {noun} {adv} {verb}s {det} {adj} {noun} {prep} {det} {noun}.",
+]
+
+
+# ============================================================
+# TEXT GENERATOR
+# ============================================================
+
+# Template placeholder -> WORD_BANK category
+SLOT_CATEGORIES = {
+    "det": "articles_determiners",
+    "adj": "adjectives",
+    "noun": "nouns",
+    "verb": "verbs",
+    "adv": "adverbs",
+    "conn": "connectors",
+    "prep": "prepositions",
+}
+
+# Number of sentences generated for each text length mode
+SENTENCE_COUNTS = {
+    "Short Sentence": (1, 1),
+    "Paragraph": (3, 5),
+    "Long Text": (7, 10),
+}
+
+
+class TextGenerator:
+    """
+    Template sentence generator that works in batches.
+
+    Templates are compiled once into positional format strings, so filling
+    one is a single str.format call with no lookups by category name. A
+    batch draws the words for every sentence in one random.choices call
+    per category. As with template.format(**words), a placeholder used
+    twice in one sentence gets the same word both times.
+
+    Draws are uniform unless a sampler (anything with sample(k, rng)) is
+    set for the templates or for a category.
+    """
+
+    def __init__(self, templates=None, word_bank=None, rng=None):
+        # Anything with choices() and randint(), e.g. the random module
+        self.rng = rng or random.Random()
+        self.slots = list(SLOT_CATEGORIES)
+        self.banks = [
+            (word_bank or WORD_BANK)[SLOT_CATEGORIES[slot]] for slot in self.slots
+        ]
+        self.templates = list(templates or SENTENCE_TEMPLATES)
+        positions = {slot: "{%d}" % i for i, slot in enumerate(self.slots)}
+        self.formats = [template.format_map(positions) for template in self.templates]
+        self.template_sampler = None
+        self.samplers = [None] * len(self.slots)
+
+    def set_sampler(self, category, sampler):
+        """Draw words for a WORD_BANK category, or None for the templates."""
+        if category is None:
+            self.template_sampler = sampler
+            return
+        for i, slot in enumerate(self.slots):
+            if SLOT_CATEGORIES[slot] == category:
+                self.samplers[i] = sampler
+
+    def sentences(self, count: int):
+        """Return a list of count random sentences."""
+        rng = self.rng
+        choices = rng.choices
+        if self.template_sampler is None:
+            formats = choices(self.formats, k=count)
+        else:
+            formats = [self.formats[i] for i in self.template_sampler.sample(count, rng)]
+        columns = [
+            choices(bank, k=count) if sampler is None
+            else [bank[i] for i in sampler.sample(count, rng)]
+            for bank, sampler in zip(self.banks, self.samplers)
+        ]
+        result = []
+        for fmt, words in zip(formats, zip(*columns)):
+            sentence = fmt.format(*words)
+            # Capitalize the first letter
+            result.append(sentence[0].upper() + sentence[1:])
+        return result
+
+    def passages(self, mode: str, count: int = 1):
+        """Return a list of count passages for the given text length mode."""
+        low, high = SENTENCE_COUNTS.get(mode, SENTENCE_COUNTS["Short Sentence"])
+        randint = self.rng.randint
+        sizes = [randint(low, high) for _ in range(count)]
+        sentences = self.sentences(sum(sizes))
+        result = []
+        start = 0
+        for size in sizes:
+            result.append(" ".join(sentences[start:start + size]))
+            start += size
+        return result
+
+
+# Shares the random module's state, so random.seed() still applies
+_generator = TextGenerator(rng=random)
+
+
+def generate_sentence() -> str:
+    """Generate a single random sentence from a template."""
+    return _generator.sentences(1)[0]
+
+
+def generate_text(mode: str) -> str:
+    """
+    Generate random text based on the selected text length mode.
+    - 'Short Sentence': 1 random sentence
+    - 'Paragraph': 3-5 random sentences joined
+    - 'Long Text': 7-10 random sentences joined
+    """
+    return _generator.passages(mode, 1)[0]
+
+
+def generate_passages(mode: str, count: int):
+    """Generate count passages for the given text length mode in one batch."""
+    return _generator.passages(mode, count)
+
+
+# ============================================================
+# STATIC TEXT POOLS — fallback / classic mode
+# ============================================================
+
+STATIC_TEXT_POOLS = {
+    "Short Sentence": [
+        "Technology is the most effective way to change the world.",
+        "Innovation is the ability to see change as an opportunity.",
+        "Artificial Intelligence helps humans solve complex problems.",
+        "Data science is transforming industries across the globe.",
+        "Programming improves logical thinking and creativity.",
+        "The quick brown fox jumps over the lazy dog.",
+        "Every great developer was once a beginner.",
+        "Code is like humor: when you have to explain it, it is bad.",
+        "Simplicity is the soul of efficiency.",
+        "First solve the problem, then write the code.",
+    ],
+    "Paragraph": [
+        (
+            "Technology is reshaping every aspect of modern life. From the way "
+            "we communicate to the way we work, digital tools have become "
+            "indispensable. Embracing change and learning new skills is the key "
+            "to staying relevant in a rapidly evolving landscape. Those who "
+            "adapt will thrive, while those who resist may be left behind."
+        ),
+        (
+            "Open-source software has revolutionized the technology industry by "
+            "allowing developers around the world to collaborate freely. Projects "
+            "like Linux, Python, and Firefox demonstrate that community-driven "
+            "development can produce software that rivals or surpasses proprietary "
+            "alternatives. Contributing to open source is a rewarding experience "
+            "that sharpens skills and builds professional networks."
+        ),
+        (
+            "Cloud computing enables businesses to scale their infrastructure on "
+            "demand without the need for expensive hardware. Services such as "
+            "virtual machines, managed databases, and serverless functions allow "
+            "teams to focus on building products rather than managing servers. "
+            "The pay-as-you-go model makes cutting-edge technology accessible to "
+            "startups and enterprises alike."
+        ),
+    ],
+    "Long Text": [
+        (
+            "The history of computing stretches back centuries, from the abacus "
+            "to Charles Babbage's Analytical Engine. In the twentieth century, "
+            "pioneers like Alan Turing and John von Neumann laid the theoretical "
+            "groundwork for modern computers. The invention of the transistor in "
+            "1947 sparked a revolution that led to integrated circuits, "
+            "microprocessors, and eventually the personal computer. Today, "
+            "billions of interconnected devices form a global network that "
+            "carries virtually all of human knowledge. Machine learning "
+            "algorithms sift through enormous datasets to uncover patterns no "
+            "human could detect alone. Quantum computing promises to solve "
+            "problems that are currently intractable, from drug discovery to "
+            "cryptography. As technology continues to advance at an exponential "
+            "pace, society must grapple with questions of ethics, privacy, and "
+            "equity. Ensuring that the benefits of innovation are shared broadly "
+            "is one of the defining challenges of our time. Education systems "
+            "must evolve to prepare students not just to use technology, but to "
+            "understand and shape it. The future belongs to those who can think "
+            "critically, collaborate effectively, and adapt to change with "
+            "resilience and creativity."
+        ),
+        (
+            "Software engineering is both an art and a science. Writing clean, "
+            "maintainable code requires not only technical skill but also "
+            "empathy for the developers who will read and modify it in the "
+            "future. Version control systems like Git enable teams to work on "
+            "the same codebase without stepping on each other's toes, while "
+            "continuous integration pipelines catch bugs before they reach "
+            "production. Test-driven development encourages programmers to think "
+            "about edge cases early, resulting in more robust software. Code "
+            "reviews foster knowledge sharing and help maintain consistent "
+            "standards across a project. Documentation, often neglected, is "
+            "crucial for onboarding new team members and preserving "
+            "institutional knowledge. Agile methodologies break large projects "
+            "into manageable sprints, allowing teams to deliver value "
+            "incrementally and respond to changing requirements. DevOps "
+            "practices blur the line between development and operations, "
+            "promoting a culture of shared responsibility for reliability and "
+            "performance. Ultimately, great software is not just about "
+            "algorithms and data structures; it is about people working together "
+            "to solve meaningful problems."
+        ),
+    ],
+}
+
+DEFAULT_DURATION = 60
+
+DURATION_OPTIONS = {
+    "15 seconds": 15,
+    "30 seconds": 30,
+    "60 seconds": 60,
+    "120 seconds": 120,
+}
+
+# Streams sentences for the whole test duration instead of a fixed passage
+ENDLESS_MODE = "Endless"
+
+TEXT_LENGTH_OPTIONS = list(STATIC_TEXT_POOLS.keys()) + [ENDLESS_MODE]
+
+# Template text weighted towards the bigrams the user gets wrong
+ADAPTIVE_SOURCE = "Adaptive Practice"
+
+TEXT_SOURCE_OPTIONS = ["Random Generated", "Classic Static", ADAPTIVE_SOURCE]
+
+# Passages from an external corpus file; only offered when one is configured
+CORPUS_SOURCE = "Corpus"
+
+
+# ============================================================
+# TEXT SOURCES
+# ============================================================
+
+def get_test_text(text_source: str, text_length: str, generator=None,
+                  corpus=None) -> str:
+    """
+    Return the test text based on the selected source and length mode.
+    - 'Random Generated': uses the template-based generator
+    - 'Adaptive Practice': uses the given (weighted) generator
+    - 'Corpus': a passage from the given corpus, or generated text without one
+    - 'Classic Static': picks from the static text pools
+    """
+    if text_source == CORPUS_SOURCE:
+        if corpus is not None:
+            return corpus.passage(text_length)
+        return generate_text(text_length)
+    if text_source == ADAPTIVE_SOURCE:
+        return (generator or _generator).passages(text_length, 1)[0]
+    if text_source == "Random Generated":
+        return generate_text(text_length)
+    else:
+        pool = STATIC_TEXT_POOLS.get(
+            text_length, STATIC_TEXT_POOLS["Short Sentence"]
+        )
+        return random.choice(pool)
+
+
+def sentence_stream(text_source: str, batch: int = 16, generator=None,
+                    corpus=None):
+    """
+    Yield sentences forever for the endless mode, generating them a batch
+    at a time as they are consumed.
+    - 'Random Generated': template sentences from the batch generator
+    - 'Adaptive Practice': template sentences from the given generator
+    - 'Corpus': short passages from the given corpus, or generated
+      sentences if it is empty or unreadable
+    - 'Classic Static': the short static sentences, reshuffled each pass
+    """
+    if text_source == CORPUS_SOURCE and corpus is not None:
+        while True:
+            try:
+                passage = corpus.passage("Short Sentence")
+            except (OSError, ValueError):
+                # Same fallback as get_test_text() in the app
+                break
+            yield passage
+        text_source = "Random Generated"
+    if text_source in ("Random Generated", ADAPTIVE_SOURCE):
+        if text_source == "Random Generated" or generator is None:
+            generator = _generator
+        while True:
+            yield from generator.sentences(batch)
+    else:
+        pool = list(STATIC_TEXT_POOLS["Short Sentence"])
+        while True:
+            random.shuffle(pool)
+            yield from pool
+
+
+def extend_text(text: str, stream, min_length: int) -> str:
+    """Return the text to append so text grows to at least min_length chars."""
+    added = []
+    length = len(text)
+    while length < min_length:
+        sentence = next(stream)
+        if length:
+            sentence = " " + sentence
+        added.append(sentence)
+        length += len(sentence)
+    return "".join(added)
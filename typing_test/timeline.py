@@ -0,0 +1,162 @@
+"""
+Per-keystroke timeline of a test, stored column-wise in typed arrays.
+
+Each keystroke costs 15 bytes, so a 120 second run at 150 WPM stays in
+the tens of kilobytes:
+- press time
+- keysym code
+- position
+- outcome
+- dwell (press to release)
+- flight (the previous key's release to this press)
+
+The binary form is a small header, the keysym table and the passage, then
+the same columns written back to back.
+"""
+
+import json
+import struct
+import sys
+from array import array
+
+CORRECT = 1
+INCORRECT = 0
+# Keystrokes that don't type a character, such as BackSpace or Shift
+OTHER = 2
+
+# Dwell of a key whose release wasn't seen, and flight of a keystroke
+# whose predecessor's wasn't. Longer timings are clamped below these.
+NO_DWELL = 0xFFFF
+NO_FLIGHT = -0x8000
+
+_MAGIC = b"KTL1"
+# magic, keystroke count, keysym table size, passage size
+_HEADER = struct.Struct("<4sIII")
+# Columns are always stored little-endian
+_SWAP = sys.byteorder == "big"
+
+
+def _clamp_flight(ms):
+    return min(max(ms, NO_FLIGHT + 1), -NO_FLIGHT - 1)
+
+
+class KeystrokeTimeline:
+    """
+    Append-only record of (time_ms, keysym, position, outcome) keystrokes,
+    plus the passage they were typed against. Each keystroke's dwell and
+    flight are filled in by release() once its key comes back up.
+    """
+
+    __slots__ = (
+        "times", "keys", "positions", "outcomes", "dwells", "flights",
+        "keysyms", "passage", "_codes",
+    )
+
+    def __init__(self, passage=""):
+        self.passage = passage
+        self.times = array("I")      # milliseconds since the test started
+        self.keys = array("H")       # index into keysyms
+        self.positions = array("I")  # cursor position after the keystroke
+        self.outcomes = array("B")   # CORRECT, INCORRECT or OTHER
+        self.dwells = array("H")     # ms the key was held, or NO_DWELL
+        self.flights = array("h")    # ms from the previous release, or NO_FLIGHT
+        self.keysyms = []
+        self._codes = {}
+
+    def __len__(self):
+        return len(self.times)
+
+    def append(self, elapsed, keysym, position, outcome):
+        """
+        Record one keystroke, elapsed being seconds since the test started
+        when the key went down. Returns its index, for release().
+        """
+        code = self._codes.get(keysym)
+        if code is None:
+            code = self._codes[keysym] = len(self.keysyms)
+            self.keysyms.append(keysym)
+        index = len(self.times)
+        pressed = max(0, int(elapsed * 1000))
+        flight = NO_FLIGHT
+        if index and self.dwells[-1] != NO_DWELL:
+            flight = _clamp_flight(pressed - self.times[-1] - self.dwells[-1])
+        self.times.append(pressed)
+        self.keys.append(code)
+        self.positions.append(position)
+        self.outcomes.append(outcome)
+        self.dwells.append(NO_DWELL)
+        self.flights.append(flight)
+        return index
+
+    def release(self, index, elapsed):
+        """Record that keystroke index's key came up, elapsed seconds in."""
+        released = max(0, int(elapsed * 1000))
+        self.dwells[index] = min(max(0, released - self.times[index]), NO_DWELL - 1)
+        if index + 1 < len(self.times):
+            # The next key went down first, so its flight is negative
+            self.flights[index + 1] = _clamp_flight(self.times[index + 1] - released)
+
+    def __iter__(self):
+        """Yield (time_ms, keysym, position, outcome) tuples."""
+        keysyms = self.keysyms
+        for t, k, p, o in zip(self.times, self.keys, self.positions, self.outcomes):
+            yield t, keysyms[k], p, o
+
+    def nbytes(self):
+        return sum(
+            a.itemsize * len(a)
+            for a in self._columns()
+        )
+
+    def _columns(self):
+        return (
+            self.times, self.keys, self.positions, self.outcomes,
+            self.dwells, self.flights,
+        )
+
+    # ======================
+    # SERIALIZATION
+    # ======================
+
+    def to_bytes(self) -> bytes:
+        keysyms = json.dumps(self.keysyms, separators=(",", ":")).encode("utf-8")
+        passage = self.passage.encode("utf-8")
+        columns = []
+        for column in self._columns():
+            if _SWAP:
+                column = array(column.typecode, column)
+                column.byteswap()
+            columns.append(column.tobytes())
+        return b"".join(
+            [_HEADER.pack(_MAGIC, len(self), len(keysyms), len(passage)),
+             keysyms, passage] + columns
+        )
+
+    @classmethod
+    def from_bytes(cls, blob: bytes):
+        if blob[:4] != _MAGIC:
+            raise ValueError("not a keystroke timeline")
+        _, count, table_size, passage_size = _HEADER.unpack_from(blob)
+        offset = _HEADER.size
+        timeline = cls()
+        timeline.keysyms = json.loads(blob[offset:offset + table_size])
+        timeline._codes = {k: i for i, k in enumerate(timeline.keysyms)}
+        offset += table_size
+        timeline.passage = blob[offset:offset + passage_size].decode("utf-8")
+        offset += passage_size
+        for column in timeline._columns():
+            size = column.itemsize * count
+            column.frombytes(blob[offset:offset + size])
+            if _SWAP:
+                column.byteswap()
+            offset += size
+        return timeline
+
+    def save(self, path):
+        with open(path, "wb") as f:
+            f.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            return cls.from_bytes(f.read())
@@ -0,0 +1,123 @@
+"""
+Windowed display of a long passage.
+
+The passage is word-wrapped once into display lines, kept as a list of
+line start offsets. The text widget only ever holds a window of
+VISIBLE_LINES + MARGIN_LINES of them, and the window follows the cursor.
+Inserting, retagging and scrolling then cost the same for a one-line
+sentence as for a long or endless passage.
+"""
+
+import re
+from bisect import bisect_right
+
+# Lines the sentence box shows, and extra lines kept below them
+VISIBLE_LINES = 3
+MARGIN_LINES = 1
+# Lines of already-typed text kept above the cursor's line
+CONTEXT_LINES = 1
+
+# A word and the whitespace after it, where a line may break
+_TOKEN = re.compile(r"\s*\S+\s*|\s+")
+
+
+class PassageViewport:
+    """
+    Maps passage offsets to "line.column" indices of the widget window.
+
+    measure(text) gives the display width of text in the same units as
+    width; it defaults to counting characters.
+    """
+
+    def __init__(self, measure=len, width=60, lines=VISIBLE_LINES + MARGIN_LINES):
+        self.measure = measure
+        self.width = width
+        self.lines = lines
+        self.passage = ""
+        self.line_starts = [0]
+        self.first = 0
+        self._widths = {}
+
+    # ======================
+    # WRAPPING
+    # ======================
+
+    def _measure(self, token):
+        width = self._widths.get(token)
+        if width is None:
+            width = self._widths[token] = self.measure(token)
+        return width
+
+    def _wrap(self, line_index):
+        """Re-wrap the passage from the start of line line_index onwards."""
+        del self.line_starts[line_index + 1:]
+        passage = self.passage
+        line_width = 0
+        for match in _TOKEN.finditer(passage, self.line_starts[-1]):
+            token = match.group()
+            word = token.rstrip()
+            # Trailing spaces may hang past the edge, as in the widget
+            if line_width and line_width + self._measure(word) > self.width:
+                self.line_starts.append(match.start())
+                line_width = 0
+            line_width += self._measure(token)
+
+    def set_passage(self, passage):
+        self.passage = passage
+        self.line_starts = [0]
+        self.first = 0
+        self._wrap(0)
+
+    def extend(self, passage):
+        """Take a longer version of the same passage, re-wrapping only its tail."""
+        self.passage = passage
+        self._wrap(len(self.line_starts) - 1)
+
+    # ======================
+    # WINDOW
+    # ======================
+
+    @property
+    def last(self):
+        """One past the last line in the window."""
+        return min(self.first + self.lines, len(self.line_starts))
+
+    @property
+    def span(self):
+        """Passage offsets [start, end) shown in the window."""
+        return self.line_starts[self.first], self._line_end(self.last - 1)
+
+    def _line_end(self, line):
+        if line + 1 < len(self.line_starts):
+            return self.line_starts[line + 1]
+        return len(self.passage)
+
+    def line_of(self, offset):
+        return bisect_right(self.line_starts, offset) - 1
+
+    def follow(self, position):
+        """Scroll so the cursor's line sits CONTEXT_LINES from the top; True if moved."""
+        line = self.line_of(position)
+        if self.first <= line <= self.first + CONTEXT_LINES:
+            return False
+        first = max(0, line - CONTEXT_LINES)
+        if first == self.first:
+            return False
+        self.first = first
+        return True
+
+    def text(self):
+        """The window's text, one display line per widget line."""
+        lines = (
+            self.passage[self.line_starts[i]:self._line_end(i)]
+            for i in range(self.first, self.last)
+        )
+        # A newline in the passage would add a widget line and shift the rest
+        return "\n".join(line.replace("\n", " ") for line in lines)
+
+    def index(self, offset):
+        """Widget index of a passage offset, clamped to the window."""
+        start, end = self.span
+        offset = min(max(offset, start), end)
+        line = min(self.line_of(offset), self.last - 1)
+        return f"{line - self.first + 1}.{offset - self.line_starts[line]}"